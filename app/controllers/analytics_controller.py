@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from typing import Optional
+from datetime import date
+from app.models.analytics import CohortDashboard, VolumeAnalytics
+from app.models.user import UserPublic
+from app.services.analytics_service import AsyncAnalyticsService
+from app.services.data_version_service import data_versions
+from app.services.etag import etag_matches
+from app.controllers.auth_controller import get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_read_db, utcnow
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/analytics/volume", response_model=VolumeAnalytics)
+async def get_volume_analytics(
+    response: Response,
+    granularity: str = Query("week", pattern="^(day|week|month)$"),
+    user_id: Optional[int] = None,
+    exercise_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserPublic = Depends(get_current_user),
+    analytics_service: AsyncAnalyticsService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    logger.info(f"Volume analytics requested by: {current_user.email}")
+    try:
+        if current_user.role != "trainer":
+            if user_id is not None and user_id != current_user.user_id:
+                raise HTTPException(status_code=403, detail="You can only access your own analytics")
+            user_id = current_user.user_id
+        etag = data_versions.etag("analytics-volume", user_id, granularity, exercise_id, date_from, date_to)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        result = await analytics_service.get_volume(db, granularity, user_id, exercise_id, date_from, date_to)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        return result
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error computing volume analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to compute analytics: {str(e)}")
+
+@router.get("/analytics/cohort", response_model=CohortDashboard)
+async def get_cohort_dashboard(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserPublic = Depends(get_current_user),
+    analytics_service: AsyncAnalyticsService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    if current_user.role != "trainer":
+        raise HTTPException(status_code=403, detail="Only trainers can view the cohort dashboard")
+    logger.info(f"Cohort dashboard requested by: {current_user.email}")
+    try:
+        etag = data_versions.etag("analytics-cohort", None, utcnow().date())
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        result = await analytics_service.get_cohort_dashboard(db)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        return result
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error building cohort dashboard: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to build dashboard: {str(e)}")
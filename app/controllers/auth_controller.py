@@ -2,12 +2,15 @@ from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, EmailStr
 from passlib.context import CryptContext
 from app.models.user import UserPublic, UserInDB
-from app.services.user_service import UserService
+from app.services.user_service import AsyncUserService
+from app.services.token_cache import token_cache
+from app.services.token_version_service import token_versions
+from app.services.password_hasher import create_password_hasher
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncReadSessionLocal, get_async_db, get_async_read_db
 from dotenv import load_dotenv
 import os
 from fastapi.security import OAuth2PasswordBearer
@@ -25,6 +28,7 @@ logger.info("SECRET_KEY loaded successfully")
 
 router = APIRouter()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+password_hasher = create_password_hasher(pwd_context)
 ALGORITHM = "HS256"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -57,8 +61,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> UserPublic:
     logger.info("Verifying token")
     credentials_exception = HTTPException(
@@ -68,6 +72,13 @@ async def get_current_user(
     if not token:
         logger.warning("Token is missing")
         raise credentials_exception
+    if token_versions.needs_refresh():
+        async with AsyncReadSessionLocal() as refresh_db:
+            await refresh_db.run_sync(token_versions.refresh)
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        logger.debug(f"Token cache hit: {cached_user.email}")
+        return cached_user
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -78,29 +89,45 @@ async def get_current_user(
     except JWTError as e:
         logger.error(f"JWT error: {e}")
         raise credentials_exception
-    user = user_service.get_user_by_email(email, db)
-    if user is None:
-        logger.warning(f"User not found: {email}")
+    user_id = payload.get("uid")
+    token_version = payload.get("ver")
+    version_status = token_versions.check(user_id, token_version) if user_id is not None and token_version is not None else None
+    if version_status is False:
+        logger.warning(f"Revoked token for user {user_id}")
         raise credentials_exception
-    logger.info(f"User verified: {user.email}")
-    return UserPublic.from_orm(user)
+    if version_status:
+        current_user = UserPublic(user_id=user_id, name=payload.get("name"), email=email, role=payload.get("role"))
+    else:
+        # Tokens issued before claims were embedded, or users missing from the version table.
+        user = await user_service.get_user_by_email(email, db)
+        if user is None:
+            logger.warning(f"User not found: {email}")
+            raise credentials_exception
+        if token_version is not None and token_version != user.token_version:
+            logger.warning(f"Revoked token for user {user.user_id}")
+            raise credentials_exception
+        token_versions.set(user.user_id, user.token_version)
+        current_user = UserPublic.from_orm(user)
+    logger.info(f"User verified: {current_user.email}")
+    token_cache.set(token, current_user, payload.get("exp"))
+    return current_user
 
 @router.post("/register", response_model=UserPublic)
-def register_user(
+async def register_user(
     data: RegisterRequest,
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Registration attempt: {data.email}")
     try:
-        existing_user = user_service.get_user_by_email(data.email, db)
+        existing_user = await user_service.get_user_by_email(data.email, db)
         if existing_user:
             logger.warning(f"Email already registered: {data.email}")
             raise HTTPException(status_code=400, detail="This email is already registered")
         if data.role not in ["user", "trainer"]:
             logger.warning(f"Invalid role: {data.role}")
             raise HTTPException(status_code=400, detail="Invalid role: must be 'user' or 'trainer'")
-        hashed_password = pwd_context.hash(data.password)
+        hashed_password = await password_hasher.hash(data.password)
         logger.debug("Password hashed")
         new_user = UserInDB(
             name=data.name,
@@ -108,31 +135,53 @@ def register_user(
             password=hashed_password,
             role=data.role
         )
-        created_user = user_service.create_user(new_user, db)
+        created_user = await user_service.create_user(new_user, db)
         logger.info(f"User created: {created_user.email}")
         return created_user
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"User creation error: {e}")
         raise HTTPException(status_code=500, detail=f"User could not be created: {str(e)}")
 
 @router.post("/login", response_model=Token)
-def login_user(
+async def login_user(
     data: LoginRequest,
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Login attempt: {data.email}")
     try:
-        user = user_service.get_user_by_email(data.email, db)
+        user = await user_service.get_user_by_email(data.email, db)
         if not user:
             logger.warning(f"User not found: {data.email}")
             raise HTTPException(status_code=401, detail="Invalid credentials")
-        if not pwd_context.verify(data.password, user.password):
+        if not await password_hasher.verify(data.password, user.password):
             logger.warning(f"Password verification failed for {data.email}")
             raise HTTPException(status_code=401, detail="Invalid credentials")
-        access_token = create_access_token(data={"sub": user.email, "role": user.role})
+        access_token = create_access_token(data={
+            "sub": user.email,
+            "role": user.role,
+            "uid": user.user_id,
+            "name": user.name,
+            "ver": user.token_version
+        })
+        token_versions.set(user.user_id, user.token_version)
         logger.info(f"Token created for {data.email}")
         return {"access_token": access_token, "token_type": "bearer"}
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Login error: {e}")
-        raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
+
+@router.post("/logout")
+async def logout_user(
+    current_user: UserPublic = Depends(get_current_user),
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    logger.info(f"Logout: {current_user.email}")
+    if not await user_service.revoke_tokens(current_user.user_id, db):
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "Logged out successfully"}
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+from app.models.user import UserPublic
+from app.services.event_stream import STREAM_EVENTS, StreamConnection, event_stream_hub
+from app.controllers.auth_controller import get_current_user
+import logging
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = float(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+
+async def stream_events(connection: StreamConnection) -> AsyncIterator[str]:
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            chunk = await connection.next_chunk(HEARTBEAT_SECONDS)
+            # A comment line keeps proxies from closing an idle stream and surfaces dead clients.
+            yield chunk if chunk is not None else ": keep-alive\n\n"
+    finally:
+        event_stream_hub.disconnect(connection)
+
+@router.get("/events")
+async def workout_event_stream(
+    types: Optional[str] = None,
+    user_id: Optional[int] = None,
+    current_user: UserPublic = Depends(get_current_user)
+):
+    logger.info(f"Event stream opened by: {current_user.email}")
+    try:
+        events = frozenset(types.split(",")) if types else STREAM_EVENTS
+        if not events <= STREAM_EVENTS:
+            raise HTTPException(status_code=400, detail=f"types must be among: {', '.join(sorted(STREAM_EVENTS))}")
+        if current_user.role != "trainer":
+            if user_id is not None and user_id != current_user.user_id:
+                raise HTTPException(status_code=403, detail="You can only stream your own events")
+            user_id = current_user.user_id
+        connection = event_stream_hub.connect(user_id, events)
+        return StreamingResponse(
+            stream_events(connection),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error opening event stream: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to open event stream: {str(e)}")
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from app.models.sync import SyncResponse
+from app.models.user import UserPublic
+from app.services.sync_service import AsyncSyncService
+from app.controllers.auth_controller import get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_read_db
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/sync", response_model=SyncResponse)
+async def sync_workout_data(
+    since: Optional[str] = None,
+    user_id: Optional[int] = None,
+    current_user: UserPublic = Depends(get_current_user),
+    sync_service: AsyncSyncService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    logger.info(f"Sync requested by: {current_user.email}")
+    try:
+        if current_user.role != "trainer":
+            if user_id is not None and user_id != current_user.user_id:
+                raise HTTPException(status_code=403, detail="You can only sync your own data")
+            user_id = current_user.user_id
+        return await sync_service.get_changes(db, since, user_id)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error syncing workout data: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to sync: {str(e)}")
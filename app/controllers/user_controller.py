@@ -1,40 +1,48 @@
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
 from app.models.user import UserPublic
-from app.services.user_service import UserService
+from app.services.user_service import AsyncUserService
 from app.controllers.auth_controller import get_current_user
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserPublic)
-async def read_current_user(current_user: UserPublic = Depends(get_current_user)):
-    return current_user
+async def read_current_user(
+    current_user: UserPublic = Depends(get_current_user),
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    # The token's name claim predates any rename, so the profile is read from the database.
+    user = await user_service.get_user_by_id(current_user.user_id, db)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 @router.get("/", response_model=List[UserPublic])
 async def get_users(
     current_user: UserPublic = Depends(get_current_user),
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
 
     if current_user.role != "trainer":
         raise HTTPException(status_code=403, detail="Trainer privileges required")
-    return user_service.get_all_users(db)
+    return await user_service.get_all_users(db)
 
 @router.get("/{user_id}", response_model=UserPublic)
 async def get_user(
     user_id: int,
     current_user: UserPublic = Depends(get_current_user),
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
 
     if current_user.role != "trainer" and current_user.user_id != user_id:
         raise HTTPException(status_code=403, detail="Access denied: you can only access your own data or you must be a trainer")
-    user = user_service.get_user_by_id(user_id, db)
+    user = await user_service.get_user_by_id(user_id, db)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -45,13 +53,13 @@ async def update_user(
     name: str = None,
     email: str = None,
     current_user: UserPublic = Depends(get_current_user),
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
 
     if current_user.role != "trainer" and current_user.user_id != user_id:
         raise HTTPException(status_code=403, detail="Access denied: you can only update your own data")
-    user = user_service.update_user(user_id, db, name, email)
+    user = await user_service.update_user(user_id, db, name, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -60,12 +68,12 @@ async def update_user(
 async def delete_user(
     user_id: int,
     current_user: UserPublic = Depends(get_current_user),
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    user_service: AsyncUserService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
 
     if current_user.role != "trainer" and current_user.user_id != user_id:
         raise HTTPException(status_code=403, detail="Access denied: you can only delete your own account")
-    if not user_service.delete_user(user_id, db):
+    if not await user_service.delete_user(user_id, db):
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User deleted successfully"}
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from typing import List, Optional
+from datetime import date
 from app.models.exercise import Exercise, ExerciseCreate
-from app.models.workout_plan import WorkoutPlan, WorkoutPlanCreate
+from app.models.workout_plan import WorkoutPlan, WorkoutPlanCreate, WorkoutPlanBulkAssign, WorkoutPlanBulkAssignResult
 from app.services.exercise_factory import ExerciseFactory
-from app.services.exercise_service import ExerciseService
-from app.services.workout_plan_service import WorkoutPlanService
-from app.services.user_service import UserService
+from app.services.exercise_service import AsyncExerciseService
+from app.services.etag import etag_matches
+from app.services.pagination import DEFAULT_PAGE_SIZE
+from app.services.data_version_service import data_versions
+from app.services.idempotency_service import AsyncIdempotencyService
+from app.services.workout_plan_service import AsyncWorkoutPlanService
+from app.services.user_service import AsyncUserService
+from app.services.exercise_resolver import ExerciseResolver
 from app.controllers.auth_controller import get_current_user
 from app.models.user import UserPublic
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -21,8 +27,8 @@ router = APIRouter()
 async def create_exercise(
     exercise_data: ExerciseCreate,
     current_user: UserPublic = Depends(get_current_user),
-    exercise_service: ExerciseService = Depends(),
-    db: Session = Depends(get_db)
+    exercise_service: AsyncExerciseService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user.role != "trainer":
         raise HTTPException(status_code=403, detail="Only trainers can create exercises")
@@ -35,7 +41,7 @@ async def create_exercise(
             description=exercise_data.description,
             muscle_group=exercise_data.muscle_group
         )
-        created_exercise = exercise_service.create_exercise(exercise, db)
+        created_exercise = await exercise_service.create_exercise(exercise, db)
         logger.info(f"Exercise created: ID {created_exercise.exercise_id}, Name {created_exercise.name}")
         return created_exercise
     except HTTPException as e:
@@ -47,23 +53,27 @@ async def create_exercise(
 @router.post("/plans", response_model=WorkoutPlan)
 async def create_workout_plan(
     plan_data: WorkoutPlanCreate,
+    idempotency_key: Optional[str] = Header(None),
     current_user: UserPublic = Depends(get_current_user),
-    plan_service: WorkoutPlanService = Depends(),
-    exercise_service: ExerciseService = Depends(),
-    user_service: UserService = Depends(),
-    db: Session = Depends(get_db)
+    plan_service: AsyncWorkoutPlanService = Depends(),
+    resolver: ExerciseResolver = Depends(),
+    user_service: AsyncUserService = Depends(),
+    idempotency: AsyncIdempotencyService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Creating workout plan for user: {current_user.user_id}")
-    try:
+
+    async def create() -> WorkoutPlan:
+        exercises = await resolver.load_async([exercise.exercise_id for exercise in plan_data.exercises], db)
         for exercise in plan_data.exercises:
-            if not exercise_service.get_exercise_by_id(exercise.exercise_id, db):
+            if exercise.exercise_id not in exercises:
                 raise HTTPException(status_code=400, detail=f"Exercise ID {exercise.exercise_id} not found")
 
         target_user_id = plan_data.user_id if plan_data.user_id else current_user.user_id
 
         if current_user.role == "trainer":
             if target_user_id != current_user.user_id:
-                target_user = user_service.get_user_by_id(target_user_id, db)
+                target_user = await user_service.get_user_by_id(target_user_id, db)
                 if not target_user:
                     raise HTTPException(status_code=404, detail="Target user not found")
         else:
@@ -71,44 +81,97 @@ async def create_workout_plan(
                 raise HTTPException(status_code=403, detail="You can only create plans for yourself")
             target_user_id = current_user.user_id
 
-        created_plan = plan_service.create_plan(plan_data, target_user_id, db)
+        created_plan = await plan_service.create_plan(plan_data, target_user_id, db)
         logger.info(f"Plan created: Plan ID {created_plan.plan_id}, User ID {created_plan.user_id}")
         return created_plan
+
+    try:
+        if idempotency_key is not None:
+            return await idempotency.run(
+                db, current_user.user_id, "POST /workout/plans", idempotency_key, plan_data, create
+            )
+        return await create()
     except HTTPException as e:
         raise e
     except Exception as e:
         logger.error(f"Error creating workout plan: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create plan: {str(e)}")
 
+@router.post("/plans/bulk", response_model=WorkoutPlanBulkAssignResult)
+async def assign_workout_plan_bulk(
+    assignment: WorkoutPlanBulkAssign,
+    current_user: UserPublic = Depends(get_current_user),
+    plan_service: AsyncWorkoutPlanService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if current_user.role != "trainer":
+        raise HTTPException(status_code=403, detail="Only trainers can assign plans in bulk")
+    logger.info(f"Assigning plan '{assignment.plan.title}' to {len(assignment.user_ids)} users")
+    try:
+        return await plan_service.assign_plan_bulk(assignment.plan, assignment.user_ids, db)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error assigning workout plan in bulk: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to assign plan: {str(e)}")
+
 @router.get("/exercises", response_model=List[Exercise])
 async def get_exercises(
+    if_none_match: Optional[str] = Header(None),
     current_user: UserPublic = Depends(get_current_user),
-    exercise_service: ExerciseService = Depends(),
-    db: Session = Depends(get_db)
+    exercise_service: AsyncExerciseService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     logger.info(f"{current_user.email} is listing exercises")
     try:
-        exercises = exercise_service.get_all_exercises(db)
-        logger.info(f"Fetched {len(exercises)} exercises")
-        return exercises
+        catalog = await exercise_service.get_catalog(db)
+        headers = {"ETag": catalog.etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, catalog.etag):
+            return Response(status_code=304, headers=headers)
+        logger.info(f"Fetched {catalog.count} exercises")
+        return Response(content=catalog.body, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Error fetching exercises: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch exercises: {str(e)}")
 
 @router.get("/plans", response_model=List[WorkoutPlan])
 async def get_workout_plans(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+    level: Optional[str] = None,
+    active_from: Optional[date] = None,
+    active_to: Optional[date] = None,
+    exercise_id: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: UserPublic = Depends(get_current_user),
-    plan_service: WorkoutPlanService = Depends(),
-    db: Session = Depends(get_db)
+    plan_service: AsyncWorkoutPlanService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     logger.info(f"Plan list requested by: {current_user.email}")
     try:
-        if current_user.role == "trainer":
-            plans = plan_service.get_all_plans(db)
-        else:
-            plans = plan_service.get_plans_by_user(current_user.user_id, db)
+        if current_user.role != "trainer":
+            if user_id is not None and user_id != current_user.user_id:
+                raise HTTPException(status_code=403, detail="You can only access your own plans")
+            user_id = current_user.user_id
+        if cursor and limit is None:
+            limit = DEFAULT_PAGE_SIZE
+        # Without limit or cursor the whole list is returned, as it was before paging existed.
+        etag = data_versions.etag("plans", user_id, limit, cursor, level, active_from, active_to, exercise_id)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        plans, next_cursor = await plan_service.get_plans_page(
+            db, limit, cursor, user_id, level, active_from, active_to, exercise_id
+        )
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         logger.info(f"Fetched {len(plans)} plans")
         return plans
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Error fetching workout plans: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch plans: {str(e)}")
@@ -118,8 +181,8 @@ async def update_exercise(
     exercise_id: int,
     exercise_data: ExerciseCreate,
     current_user: UserPublic = Depends(get_current_user),
-    exercise_service: ExerciseService = Depends(),
-    db: Session = Depends(get_db)
+    exercise_service: AsyncExerciseService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user.role != "trainer":
         raise HTTPException(status_code=403, detail="Only trainers can update exercises")
@@ -132,7 +195,7 @@ async def update_exercise(
             description=exercise_data.description,
             muscle_group=exercise_data.muscle_group
         )
-        updated_exercise = exercise_service.update_exercise(exercise, db)
+        updated_exercise = await exercise_service.update_exercise(exercise, db)
         if not updated_exercise:
             raise HTTPException(status_code=404, detail="Exercise not found")
         logger.info(f"Exercise updated: ID {exercise_id}")
@@ -147,14 +210,14 @@ async def update_exercise(
 async def delete_exercise(
     exercise_id: int,
     current_user: UserPublic = Depends(get_current_user),
-    exercise_service: ExerciseService = Depends(),
-    db: Session = Depends(get_db)
+    exercise_service: AsyncExerciseService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     if current_user.role != "trainer":
         raise HTTPException(status_code=403, detail="Only trainers can delete exercises")
     logger.info(f"Deleting exercise ID: {exercise_id}")
     try:
-        if not exercise_service.delete_exercise(exercise_id, db):
+        if not await exercise_service.delete_exercise(exercise_id, db):
             raise HTTPException(status_code=404, detail="Exercise not found")
         logger.info(f"Exercise deleted: ID {exercise_id}")
         return {"message": "Exercise deleted successfully"}
@@ -169,20 +232,21 @@ async def update_workout_plan(
     plan_id: int,
     plan_data: WorkoutPlanCreate,
     current_user: UserPublic = Depends(get_current_user),
-    plan_service: WorkoutPlanService = Depends(),
-    exercise_service: ExerciseService = Depends(),
-    db: Session = Depends(get_db)
+    plan_service: AsyncWorkoutPlanService = Depends(),
+    resolver: ExerciseResolver = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Updating workout plan ID: {plan_id}")
     try:
-        existing_plan = plan_service.get_plan_by_id(plan_id, db)
+        existing_plan = await plan_service.get_plan_by_id(plan_id, db)
         if not existing_plan:
             raise HTTPException(status_code=404, detail="Plan not found")
         if current_user.role != "trainer" and existing_plan.user_id != current_user.user_id:
             raise HTTPException(status_code=403, detail="You can only update your own plans")
 
+        exercises = await resolver.load_async([exercise.exercise_id for exercise in plan_data.exercises], db)
         for exercise in plan_data.exercises:
-            if not exercise_service.get_exercise_by_id(exercise.exercise_id, db):
+            if exercise.exercise_id not in exercises:
                 raise HTTPException(status_code=400, detail=f"Exercise ID {exercise.exercise_id} not found")
 
         updated_plan = WorkoutPlan(
@@ -195,7 +259,7 @@ async def update_workout_plan(
             end_date=plan_data.end_date,
             owner_name=existing_plan.owner_name
         )
-        updated_plan = plan_service.update_plan(updated_plan, db)
+        updated_plan = await plan_service.update_plan(updated_plan, db)
         logger.info(f"Plan updated: Plan ID {plan_id}")
         return updated_plan
     except HTTPException as e:
@@ -208,18 +272,18 @@ async def update_workout_plan(
 async def delete_workout_plan(
     plan_id: int,
     current_user: UserPublic = Depends(get_current_user),
-    plan_service: WorkoutPlanService = Depends(),
-    db: Session = Depends(get_db)
+    plan_service: AsyncWorkoutPlanService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Deleting workout plan ID: {plan_id}")
     try:
-        existing_plan = plan_service.get_plan_by_id(plan_id, db)
+        existing_plan = await plan_service.get_plan_by_id(plan_id, db)
         if not existing_plan:
             raise HTTPException(status_code=404, detail="Plan not found")
         if current_user.role != "trainer" and existing_plan.user_id != current_user.user_id:
             raise HTTPException(status_code=403, detail="You can only delete your own plans")
 
-        if not plan_service.delete_plan(plan_id, db):
+        if not await plan_service.delete_plan(plan_id, db):
             raise HTTPException(status_code=404, detail="Plan not found")
         logger.info(f"Plan deleted: Plan ID {plan_id}")
         return {"message": "Plan deleted successfully"}
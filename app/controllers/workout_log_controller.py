@@ -1,11 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from app.models.workout_log import WorkoutLog, WorkoutLogCreate
-from app.services.workout_log_service import WorkoutLogService
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
+from datetime import date
+import csv
+import io
+import json
+from app.models.workout_log import WorkoutLog, WorkoutLogCreate, WorkoutLogBulkCreate, WorkoutLogBulkResult
+from app.services.workout_log_service import AsyncWorkoutLogService, WorkoutLogService
+from app.services.data_version_service import data_versions
+from app.services.etag import etag_matches
+from app.services.pagination import DEFAULT_PAGE_SIZE
+from app.services.idempotency_service import AsyncIdempotencyService
 from app.controllers.auth_controller import get_current_user
 from app.models.user import UserPublic
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, get_async_read_db, ReadSessionLocal
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -13,12 +22,37 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = list(WorkoutLog.model_fields)
+
+def stream_log_export(export_format: str, **filters) -> Iterator[str]:
+    # The stream outlives the request's dependencies, so it owns its session.
+    db = ReadSessionLocal()
+    try:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            yield buffer.getvalue()
+        for rows in WorkoutLogService().iter_log_batches(db, EXPORT_BATCH_SIZE, **filters):
+            if export_format == "csv":
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+                writer.writerows(rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(json.dumps(row, default=str) + "\n" for row in rows)
+    finally:
+        db.close()
+
 @router.post("/logs", response_model=WorkoutLog)
 async def create_workout_log(
     log: WorkoutLogCreate,
+    idempotency_key: Optional[str] = Header(None),
     current_user: UserPublic = Depends(get_current_user),
-    log_service: WorkoutLogService = Depends(),
-    db: Session = Depends(get_db)
+    log_service: AsyncWorkoutLogService = Depends(),
+    idempotency: AsyncIdempotencyService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Creating workout log for user: {current_user.user_id}")
     try:
@@ -33,37 +67,117 @@ async def create_workout_log(
             duration=log.duration,
             notes=log.notes
         )
-        created_log = log_service.create_log(new_log, db)
+        if idempotency_key is not None:
+            return await idempotency.run(
+                db, current_user.user_id, "POST /workout/logs", idempotency_key, log,
+                lambda: log_service.create_log(new_log, db, buffered=False)
+            )
+        created_log = await log_service.create_log(new_log, db)
         return created_log
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Error creating workout log: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to create log: {str(e)}")
 
+@router.post("/logs/bulk", response_model=WorkoutLogBulkResult)
+async def create_workout_logs_bulk(
+    payload: WorkoutLogBulkCreate,
+    response: Response,
+    current_user: UserPublic = Depends(get_current_user),
+    log_service: AsyncWorkoutLogService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    logger.info(f"Creating {len(payload.logs)} workout logs ({payload.mode}) for user: {current_user.user_id}")
+    try:
+        new_logs = [WorkoutLog(user_id=current_user.user_id, **log.model_dump()) for log in payload.logs]
+        result = await log_service.create_logs_bulk(new_logs, db, all_or_nothing=payload.mode == "all_or_nothing")
+        if result.failed and payload.mode == "all_or_nothing":
+            response.status_code = 422
+        return result
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Error creating workout logs in bulk: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create logs: {str(e)}")
+
 @router.get("/logs", response_model=List[WorkoutLog])
 async def get_workout_logs(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+    exercise_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: UserPublic = Depends(get_current_user),
-    log_service: WorkoutLogService = Depends(),
-    db: Session = Depends(get_db)
+    log_service: AsyncWorkoutLogService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     logger.info(f"Fetching workout logs for user: {current_user.user_id}")
     try:
-        if current_user.role == "trainer":
-            return log_service.get_all_logs(db)
-        return log_service.get_logs_by_user(current_user.user_id, db)
+        if current_user.role != "trainer":
+            if user_id is not None and user_id != current_user.user_id:
+                raise HTTPException(status_code=403, detail="You can only access your own logs")
+            user_id = current_user.user_id
+        if cursor and limit is None:
+            limit = DEFAULT_PAGE_SIZE
+        # Without limit or cursor the whole list is returned, as it was before paging existed.
+        etag = data_versions.etag("logs", user_id, limit, cursor, exercise_id, date_from, date_to)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        logs, next_cursor = await log_service.get_logs_page(
+            db, limit, cursor, user_id, exercise_id, date_from, date_to
+        )
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return logs
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Error fetching workout logs: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch logs: {str(e)}")
 
+@router.get("/logs/export")
+async def export_workout_logs(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    user_id: Optional[int] = None,
+    exercise_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: UserPublic = Depends(get_current_user)
+):
+    logger.info(f"Exporting workout logs as {export_format} for user: {current_user.user_id}")
+    if current_user.role != "trainer":
+        if user_id is not None and user_id != current_user.user_id:
+            raise HTTPException(status_code=403, detail="You can only export your own logs")
+        user_id = current_user.user_id
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_log_export(
+            export_format,
+            user_id=user_id,
+            exercise_id=exercise_id,
+            date_from=date_from,
+            date_to=date_to
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=workout_logs.{export_format}"}
+    )
+
 @router.get("/logs/{log_id}", response_model=WorkoutLog)
 async def get_workout_log(
     log_id: int,
     current_user: UserPublic = Depends(get_current_user),
-    log_service: WorkoutLogService = Depends(),
-    db: Session = Depends(get_db)
+    log_service: AsyncWorkoutLogService = Depends(),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     logger.info(f"Fetching workout log ID: {log_id}")
     try:
-        log = log_service.get_log_by_id(log_id, db)
+        log = await log_service.get_log_by_id(log_id, db)
         if not log:
             raise HTTPException(status_code=404, detail="Log not found")
         if current_user.role != "trainer" and current_user.user_id != log.user_id:
@@ -78,12 +192,12 @@ async def update_workout_log(
     log_id: int,
     log_data: WorkoutLogCreate,
     current_user: UserPublic = Depends(get_current_user),
-    log_service: WorkoutLogService = Depends(),
-    db: Session = Depends(get_db)
+    log_service: AsyncWorkoutLogService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Updating workout log ID: {log_id}")
     try:
-        log = log_service.get_log_by_id(log_id, db)
+        log = await log_service.get_log_by_id(log_id, db)
         if not log:
             raise HTTPException(status_code=404, detail="Log not found")
         if current_user.role != "trainer" and current_user.user_id != log.user_id:
@@ -101,7 +215,7 @@ async def update_workout_log(
             duration=log_data.duration,
             notes=log_data.notes
         )
-        updated_log = log_service.update_log(updated_log, db)
+        updated_log = await log_service.update_log(updated_log, db)
         return updated_log
     except Exception as e:
         logger.error(f"Error updating workout log: {str(e)}")
@@ -111,17 +225,17 @@ async def update_workout_log(
 async def delete_workout_log(
     log_id: int,
     current_user: UserPublic = Depends(get_current_user),
-    log_service: WorkoutLogService = Depends(),
-    db: Session = Depends(get_db)
+    log_service: AsyncWorkoutLogService = Depends(),
+    db: AsyncSession = Depends(get_async_db)
 ):
     logger.info(f"Deleting workout log ID: {log_id}")
     try:
-        log = log_service.get_log_by_id(log_id, db)
+        log = await log_service.get_log_by_id(log_id, db)
         if not log:
             raise HTTPException(status_code=404, detail="Log not found")
         if current_user.role != "trainer" and current_user.user_id != log.user_id:
             raise HTTPException(status_code=403, detail="You can only delete your own logs")
-        if not log_service.delete_log(log_id, db):
+        if not await log_service.delete_log(log_id, db):
             raise HTTPException(status_code=404, detail="Log not found")
         return {"message": "Workout log deleted successfully"}
     except Exception as e:
@@ -1,10 +1,13 @@
 import logging
-from sqlalchemy import create_engine, Column, Integer, String, Date, ForeignKey, Text
+from sqlalchemy import create_engine, event, func, insert_sentinel, inspect, select, text, Column, Integer, String, Date, DateTime, ForeignKey, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
 import os
+import json
 import pathlib
+from datetime import datetime, timezone
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,14 +21,174 @@ if DATABASE_URL.startswith("sqlite:///"):
     DATABASE_URL = f"sqlite:///{absolute_path}"
 logger.info(f"Database URL: {DATABASE_URL}")
 
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "mysql://": "mysql+aiomysql://",
+}
+
+def to_async_url(url: str) -> str:
+    for sync_prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+logger.info(f"Async database URL: {ASYNC_DATABASE_URL}")
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the single
+# writer; busy_timeout makes a writer wait for the lock instead of failing with
+# "database is locked" (together with write_transaction, see configure_engine).
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB, i.e. 64 MiB
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    "foreign_keys": "ON",  # SQLite ignores REFERENCES clauses unless this is set on each connection
+}
+
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "-1")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+
+def is_sqlite_memory(url: str) -> bool:
+    return url.split("?")[0].rstrip("/") in ("sqlite:", "sqlite+aiosqlite:") or ":memory:" in url or "mode=memory" in url
+
+def engine_options(url: str) -> dict:
+    """Pool arguments for create_engine; in-memory SQLite keeps its single-connection pool."""
+    if url.startswith("sqlite") and is_sqlite_memory(url):
+        return {}
+    return dict(POOL_SETTINGS)
+
+def to_read_only_url(url: str) -> str:
+    """Reopen a SQLite file with mode=ro; other URLs are returned unchanged (point READ_DATABASE_URL at a replica)."""
+    if url.startswith("sqlite") and not is_sqlite_memory(url) and ":///" in url:
+        prefix, path = url.split(":///", 1)
+        return f"{prefix}:///file:{path}?mode=ro&uri=true"
+    return url
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record, pragmas=None):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in (pragmas or SQLITE_PRAGMAS).items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+# Execution option that makes a SQLite write engine open the transaction with BEGIN IMMEDIATE.
+BEGIN_IMMEDIATE = "sqlite_begin_immediate"
+
+def begin_transaction(connection):
+    immediate = connection.get_execution_options().get(BEGIN_IMMEDIATE, False)
+    connection.exec_driver_sql("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+def write_transaction(db):
+    """Start a transaction on the session that holds the SQLite write lock from its first statement.
+
+    Call it at the start of a unit of work that writes (see configure_engine). If the
+    session is still in a transaction that only read, e.g. a controller's ownership
+    check, that transaction is ended first; one with pending changes is left as is.
+    Other databases ignore the option.
+    """
+    if db.in_transaction():
+        if db.new or db.dirty or db.deleted:
+            return
+        db.commit()
+    db.connection(execution_options={BEGIN_IMMEDIATE: True})
+
+def configure_engine(bind, read_only: bool = False):
+    """Register the connect-time pragmas on a sync engine (use async_engine.sync_engine for async ones).
+
+    Read-only connections cannot switch the journal mode; they inherit the WAL mode
+    persisted in the file by the writer.
+
+    On write connections a transaction that reads first and then writes can fail to
+    upgrade to a write with SQLITE_BUSY, without honouring busy_timeout. Units of work
+    that write call ``write_transaction`` so their transaction starts with BEGIN
+    IMMEDIATE and queues on busy_timeout instead; every other transaction uses a plain
+    deferred BEGIN and takes no lock until it writes. The driver's transaction
+    handling is switched off (isolation_level=None) so SQLAlchemy's ``begin`` event
+    emits the BEGIN, as the SQLAlchemy pysqlite documentation recommends.
+    """
+    if bind.dialect.name == "sqlite":
+        pragmas = {name: value for name, value in SQLITE_PRAGMAS.items() if not (read_only and name == "journal_mode")}
+
+        def on_connect(dbapi_connection, record):
+            apply_sqlite_pragmas(dbapi_connection, record, pragmas)
+            if not read_only:
+                dbapi_connection.isolation_level = None
+
+        event.listen(bind, "connect", on_connect)
+        if not read_only:
+            event.listen(bind, "begin", begin_transaction)
+    return bind
+
+def database_settings_report(bind) -> dict:
+    """Effective pool and pragma values, read back from a live connection."""
+    report = {
+        "url": bind.url.render_as_string(hide_password=True),
+        "pool": type(bind.pool).__name__,
+        **engine_options(str(bind.url)),
+    }
+    if bind.dialect.name == "sqlite":
+        with bind.connect() as connection:
+            for name in SQLITE_PRAGMAS:
+                report[name] = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+    return report
+
 try:
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = configure_engine(create_engine(
+        DATABASE_URL, connect_args={"check_same_thread": False}, **engine_options(DATABASE_URL)
+    ))
     logger.info("Database engine created.")
 except Exception as e:
     logger.error(f"Database connection error: {e}")
     raise
 
+try:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+    configure_engine(async_engine.sync_engine)
+    logger.info("Async database engine created.")
+except Exception as e:
+    logger.error(f"Async database connection error: {e}")
+    raise
+
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL") or to_read_only_url(DATABASE_URL)
+ASYNC_READ_DATABASE_URL = os.getenv("ASYNC_READ_DATABASE_URL") or to_async_url(READ_DATABASE_URL)
+
+# Reads get their own pool so list queries never queue behind write transactions.
+# An in-memory database cannot be reopened read-only, so it shares the write engines.
+if READ_DATABASE_URL == DATABASE_URL:
+    read_engine = engine
+    async_read_engine = async_engine
+else:
+    try:
+        read_engine = configure_engine(create_engine(
+            READ_DATABASE_URL,
+            connect_args={"check_same_thread": False} if READ_DATABASE_URL.startswith("sqlite") else {},
+            **engine_options(READ_DATABASE_URL)
+        ), read_only=True)
+        async_read_engine = create_async_engine(ASYNC_READ_DATABASE_URL, **engine_options(ASYNC_READ_DATABASE_URL))
+        configure_engine(async_read_engine.sync_engine, read_only=True)
+        logger.info(f"Read-only database URL: {READ_DATABASE_URL}")
+    except Exception as e:
+        logger.error(f"Read-only database connection error: {e}")
+        raise
+
+def utcnow() -> datetime:
+    """Naive UTC timestamp, the form SQLite stores DateTime columns in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 class UserDB(Base):
@@ -35,6 +198,7 @@ class UserDB(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(String, default="user")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
 class ExerciseDB(Base):
     __tablename__ = "exercises"
@@ -50,9 +214,44 @@ class WorkoutPlanDB(Base):
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
     title = Column(String, nullable=False)
     level = Column(String, default="beginner")
-    exercises = Column(Text)
+    exercises = Column(Text)  # Legacy JSON list; migrate_plan_exercises moves it into plan_exercises
     start_date = Column(Date)
     end_date = Column(Date)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)  # NULL for rows older than delta sync
+    _sentinel = insert_sentinel("_sentinel")  # see WorkoutLogDB._sentinel
+
+    plan_exercises = relationship(
+        "PlanExerciseDB",
+        order_by="PlanExerciseDB.position",
+        cascade="all, delete-orphan",
+        back_populates="plan"
+    )
+
+    __table_args__ = (
+        Index("ix_workout_plans_user_id_plan_id", "user_id", "plan_id"),
+        Index("ix_workout_plans_level_plan_id", "level", "plan_id"),
+        Index("ix_workout_plans_end_date_start_date", "end_date", "start_date"),
+        Index("ix_workout_plans_updated_at", "updated_at"),
+        Index("ix_workout_plans_user_id_updated_at", "user_id", "updated_at"),
+    )
+
+class PlanExerciseDB(Base):
+    __tablename__ = "plan_exercises"
+    plan_exercise_id = Column(Integer, primary_key=True)
+    plan_id = Column(Integer, ForeignKey("workout_plans.plan_id", ondelete="CASCADE"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.exercise_id"), nullable=False)
+    position = Column(Integer, nullable=False)
+    sets = Column(Integer, nullable=False)
+    reps = Column(Integer, nullable=False)
+    rest_seconds = Column(Integer, nullable=False, default=30)
+    exercise_name = Column(String, nullable=True)  # as named when added, like workout_logs.exercise_name
+
+    plan = relationship("WorkoutPlanDB", back_populates="plan_exercises")
+
+    __table_args__ = (
+        Index("ix_plan_exercises_plan_id_position", "plan_id", "position"),
+        Index("ix_plan_exercises_exercise_id", "exercise_id"),
+    )
 
 class WorkoutLogDB(Base):
     __tablename__ = "workout_logs"
@@ -66,14 +265,189 @@ class WorkoutLogDB(Base):
     date = Column(Date, nullable=False)
     duration = Column(Integer, nullable=False)
     notes = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)  # NULL for rows older than delta sync
+    # Client-side ordinal that lets multi-row INSERT ... RETURNING hand IDs back in parameter order.
+    _sentinel = insert_sentinel("_sentinel")
+
+    # Keyset pagination walks (date, log_id) newest first, optionally within one user or exercise.
+    __table_args__ = (
+        Index("ix_workout_logs_date_log_id", "date", "log_id"),
+        Index("ix_workout_logs_user_date_log_id", "user_id", "date", "log_id"),
+        Index("ix_workout_logs_exercise_date_log_id", "exercise_id", "date", "log_id"),
+        Index("ix_workout_logs_updated_at", "updated_at"),
+        Index("ix_workout_logs_user_id_updated_at", "user_id", "updated_at"),
+    )
+
+class WorkoutLogDailyDB(Base):
+    """Totals of workout_logs per user, exercise and day, kept current by LogRollupService."""
+    __tablename__ = "workout_log_daily"
+    user_id = Column(Integer, primary_key=True)
+    exercise_id = Column(Integer, primary_key=True)
+    date = Column(Date, primary_key=True)
+    log_count = Column(Integer, nullable=False, default=0)
+    total_sets = Column(Integer, nullable=False, default=0)
+    total_reps = Column(Integer, nullable=False, default=0)
+    total_volume = Column(Integer, nullable=False, default=0)  # sum of sets × reps
+    total_duration = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_workout_log_daily_user_id_date", "user_id", "date"),
+        Index("ix_workout_log_daily_date", "date"),
+    )
+
+def log_rollup_query():
+    """workout_log_daily recomputed from workout_logs, in column order."""
+    logs = WorkoutLogDB.__table__
+    return select(
+        logs.c.user_id,
+        logs.c.exercise_id,
+        logs.c.date,
+        func.count(),
+        func.sum(logs.c.sets),
+        func.sum(logs.c.reps),
+        func.sum(logs.c.sets * logs.c.reps),
+        func.sum(logs.c.duration),
+    ).group_by(logs.c.user_id, logs.c.exercise_id, logs.c.date)
+
+class SyncTombstoneDB(Base):
+    """A deleted plan or log, kept so delta sync can tell clients to drop it."""
+    __tablename__ = "sync_tombstones"
+    tombstone_id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)  # "log" or "plan"
+    entity_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=utcnow)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+        Index("ix_sync_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
+class IdempotencyKeyDB(Base):
+    """Outcome of a POST sent with an Idempotency-Key; status_code stays NULL while the first request runs."""
+    __tablename__ = "idempotency_keys"
+    idempotency_key_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    endpoint = Column(String, nullable=False)
+    key = Column(String, nullable=False)
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ux_idempotency_keys_user_endpoint_key", "user_id", "endpoint", "key", unique=True),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+class OutboxEventDB(Base):
+    """A domain event written in the same transaction as its row; deleted once the relay has delivered it."""
+    __tablename__ = "outbox"
+    outbox_id = Column(Integer, primary_key=True)
+    event = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    available_at = Column(DateTime, nullable=False, default=utcnow)  # pushed forward while a relay holds the row
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_outbox_available_at_outbox_id", "available_at", "outbox_id"),
+    )
+
+def migrate_schema(bind):
+    """Add columns and indexes introduced after a table was first created; create_all only creates missing tables."""
+    with bind.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=bind.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT '{column.server_default.arg}'"
+                connection.execute(text(ddl))
+                logger.info(f"Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+def migrate_plan_exercises(bind):
+    """Move exercises stored as JSON on workout_plans into plan_exercises rows, one plan at a time, idempotently.
+
+    Legacy plans may list exercises deleted before foreign keys were enforced; they
+    keep those entries, so the move runs with foreign key checks off. Rows written
+    before plan_exercises had exercise_name get the exercise's current name.
+    """
+    with bind.connect() as connection:
+        # PRAGMA foreign_keys is ignored inside a transaction, so it goes to the driver before BEGIN.
+        driver_connection = connection.connection.driver_connection if bind.dialect.name == "sqlite" else None
+        if driver_connection is not None:
+            foreign_keys = driver_connection.execute("PRAGMA foreign_keys").fetchone()[0]
+            driver_connection.execute("PRAGMA foreign_keys=OFF")
+        try:
+            with connection.begin():
+                _move_legacy_plan_exercises(connection)
+        finally:
+            if driver_connection is not None:
+                driver_connection.execute(f"PRAGMA foreign_keys={foreign_keys}")
+
+def _move_legacy_plan_exercises(connection):
+    plans = WorkoutPlanDB.__table__
+    plan_exercises = PlanExerciseDB.__table__
+    exercises = ExerciseDB.__table__
+    legacy_plans = connection.execute(
+        plans.select().with_only_columns(plans.c.plan_id, plans.c.exercises).where(plans.c.exercises.isnot(None))
+    ).all()
+    for plan_id, exercises_json in legacy_plans:
+        rows = [
+            {
+                "plan_id": plan_id,
+                "exercise_id": exercise["exercise_id"],
+                "position": position,
+                "sets": exercise["sets"],
+                "reps": exercise["reps"],
+                "rest_seconds": exercise.get("rest_seconds") or 30,
+                "exercise_name": exercise.get("name"),
+            }
+            for position, exercise in enumerate(json.loads(exercises_json or "[]"))
+        ]
+        connection.execute(plan_exercises.delete().where(plan_exercises.c.plan_id == plan_id))
+        if rows:
+            connection.execute(plan_exercises.insert(), rows)
+        connection.execute(plans.update().where(plans.c.plan_id == plan_id).values(exercises=None))
+    if legacy_plans:
+        logger.info(f"Migrated exercises of {len(legacy_plans)} plans into plan_exercises")
+    connection.execute(plan_exercises.update().where(plan_exercises.c.exercise_name.is_(None)).values(
+        exercise_name=select(exercises.c.name).where(exercises.c.exercise_id == plan_exercises.c.exercise_id).scalar_subquery()
+    ))
+
+def migrate_log_rollup(bind):
+    """Fill workout_log_daily from existing logs the first time it exists next to a non-empty workout_logs."""
+    rollup = WorkoutLogDailyDB.__table__
+    logs = WorkoutLogDB.__table__
+    with bind.begin() as connection:
+        if connection.execute(select(rollup.c.user_id).limit(1)).first() is not None:
+            return
+        if connection.execute(select(logs.c.log_id).limit(1)).first() is None:
+            return
+        connection.execute(rollup.insert().from_select([column.name for column in rollup.columns], log_rollup_query()))
+        logger.info("Built workout_log_daily from existing workout logs")
 
 try:
     Base.metadata.create_all(bind=engine)
+    migrate_schema(engine)
+    migrate_plan_exercises(engine)
+    migrate_log_rollup(engine)
     logger.info("Database tables created or already exist.")
 except Exception as e:
     logger.error(f"Table creation error: {e}")
     raise
 
+logger.info("Database settings: " + ", ".join(f"{name}={value}" for name, value in database_settings_report(engine).items()))
+
 def get_db():
     db = SessionLocal()
     try:
@@ -84,4 +458,39 @@ def get_db():
         raise
     finally:
         db.close()
-        logger.debug("Database session closed.")
\ No newline at end of file
+        logger.debug("Database session closed.")
+
+async def get_async_db():
+    """Session for the Async* service wrappers.
+
+    Each wrapper hands its synchronous service to ``AsyncSession.run_sync``, so the
+    service code is shared with the sync path while the controller awaits the
+    database instead of blocking the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session error: {e}")
+            await db.rollback()
+            raise
+        finally:
+            logger.debug("Async database session closed.")
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        logger.debug("Read-only database session closed.")
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async read-only database session error: {e}")
+            raise
+        finally:
+            logger.debug("Async read-only database session closed.")
@@ -1,7 +1,16 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from app.patterns.api_facade import ApiFacade
+from app.database import SessionLocal
+from app.patterns.event_bus import event_bus
+from app.services.sync_service import SyncService
+from app.services.idempotency_service import idempotency_service
+from app.services.outbox_service import outbox_relay, outbox_service
+from app.services.token_cache import token_cache
+from app.controllers.auth_controller import password_hasher
+from app.services import workout_log_service
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
@@ -9,7 +18,23 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with SessionLocal() as db:
+        SyncService().purge_tombstones(db)
+        idempotency_service.purge_expired(db)
+        outbox_service.purge_dead(db, outbox_relay.max_attempts)
+    await event_bus.start()
+    await outbox_relay.start()
+    yield
+    if workout_log_service.log_write_buffer is not None:
+        await workout_log_service.log_write_buffer.flush()
+    await outbox_relay.stop()
+    await event_bus.stop()
+    logger.info(f"Token cache: {token_cache.stats()}")
+    logger.info(f"Password hasher: {password_hasher.stats()}")
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -23,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*", "Authorization"],
+    expose_headers=["X-Next-Cursor", "ETag", "Idempotent-Replayed"],
 )
 
 api_facade = ApiFacade(app)
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Literal, Optional
+
+class VolumeBucket(BaseModel):
+    period_start: date
+    user_id: int
+    exercise_id: int
+    exercise_name: str
+    log_count: int  # workout logs in the bucket
+    sets: int
+    reps: int
+    volume: int  # sum of sets × reps
+    duration: int
+
+class VolumeAnalytics(BaseModel):
+    granularity: Literal["day", "week", "month"]
+    user_id: Optional[int] = None
+    exercise_id: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    buckets: List[VolumeBucket]
+
+class ClientSummary(BaseModel):
+    user_id: int
+    name: str
+    email: str
+    active_plans: int
+    last_workout_date: Optional[date] = None
+    sessions_7d: int  # days with at least one log
+    sessions_30d: int
+    volume_7d: int  # sum of sets × reps
+    volume_30d: int
+
+class CohortDashboard(BaseModel):
+    as_of: date
+    clients: List[ClientSummary]
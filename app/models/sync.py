@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+from app.models.workout_log import WorkoutLog
+from app.models.workout_plan import WorkoutPlan
+
+class SyncResponse(BaseModel):
+    full: bool
+    logs: List[WorkoutLog]
+    plans: List[WorkoutPlan]
+    deleted_log_ids: List[int]
+    deleted_plan_ids: List[int]
+    next_token: str
@@ -7,6 +7,7 @@ class UserInDB(BaseModel):
     email: str
     password: str
     role: str
+    token_version: int = 0
 
     class Config:
         from_attributes = True
@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
-from typing import Optional
+from typing import List, Literal, Optional
+
+MAX_BULK_LOGS = 500
 
 class WorkoutLogCreate(BaseModel):
     exercise_id: int
@@ -25,4 +27,20 @@ class WorkoutLog(BaseModel):
     notes: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class WorkoutLogBulkCreate(BaseModel):
+    logs: List[WorkoutLogCreate] = Field(..., min_length=1, max_length=MAX_BULK_LOGS)
+    # all_or_nothing: one invalid item rejects the batch; best_effort: valid items are still saved
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+
+class WorkoutLogBulkItemResult(BaseModel):
+    index: int
+    status: Literal["created", "failed", "skipped"]
+    log_id: Optional[int] = None
+    error: Optional[str] = None
+
+class WorkoutLogBulkResult(BaseModel):
+    created: int
+    failed: int
+    results: List[WorkoutLogBulkItemResult]
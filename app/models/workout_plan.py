@@ -1,7 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
 from typing import List, Optional
 
+MAX_BULK_ASSIGN_USERS = 200
+
 class PlanExercise(BaseModel):
     exercise_id: int
     name: Optional[str] = None
@@ -31,4 +33,18 @@ class WorkoutPlan(BaseModel):
     owner_name: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class WorkoutPlanBulkAssign(BaseModel):
+    plan: WorkoutPlanCreate
+    user_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ASSIGN_USERS)
+
+class PlanAssignment(BaseModel):
+    user_id: int
+    plan_id: int
+
+class WorkoutPlanBulkAssignResult(BaseModel):
+    title: str
+    plans_created: int
+    logs_created: int
+    assignments: List[PlanAssignment]
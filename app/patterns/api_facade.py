@@ -1,5 +1,5 @@
 from fastapi import FastAPI
-from app.controllers import user_controller, workout_controller, auth_controller, workout_log_controller
+from app.controllers import user_controller, workout_controller, auth_controller, workout_log_controller, sync_controller, event_stream_controller, analytics_controller
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -15,4 +15,7 @@ class ApiFacade:
         self.app.include_router(user_controller.router, prefix="/user", tags=["User"])
         self.app.include_router(workout_controller.router, prefix="/workout", tags=["Workout"])
         self.app.include_router(workout_log_controller.router, prefix="/workout", tags=["WorkoutLog"])
+        self.app.include_router(sync_controller.router, prefix="/workout", tags=["Sync"])
+        self.app.include_router(event_stream_controller.router, prefix="/workout", tags=["Events"])
+        self.app.include_router(analytics_controller.router, prefix="/workout", tags=["Analytics"])
         logger.info("Controllers registered successfully")
\ No newline at end of file
@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+from app.patterns.observers import Observer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BACKPRESSURE_POLICIES = (DROP_OLDEST, DROP_NEWEST)
+
+
+class Event(NamedTuple):
+    name: str
+    data: dict
+    published_at: float
+
+
+class Subscription:
+    """One observer's bounded buffer and counters on the bus."""
+
+    def __init__(self, observer: Observer, max_batch: int, max_queue: int, policy: str, threaded: bool):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Invalid backpressure policy: {policy}")
+        self.observer = observer
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.policy = policy
+        self.threaded = threaded
+        self.queue: Deque[Event] = deque()
+        self.ready: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+        self.in_flight = 0
+        self.delivered = 0
+        self.batches = 0
+        self.dropped = 0
+        self.delayed = 0
+        self.failed = 0
+
+    def offer(self, event: Event):
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            self.queue.popleft()
+        self.queue.append(event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "observer": type(self.observer).__name__,
+            "queued": len(self.queue),
+            "delivered": self.delivered,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "delayed": self.delayed,
+            "failed": self.failed,
+        }
+
+
+class AsyncEventBus(Observer):
+    """Application-wide replacement for EventManager that keeps observers off the request path.
+
+    ``publish`` (also available as ``notify``) only appends to a bounded queue. A
+    dispatcher task started with ``start`` fans events out to one bounded buffer per
+    observer, and a worker per observer hands them over in batches of up to
+    ``max_batch`` through ``Observer.update_batch``, in a thread unless the observer
+    was subscribed with ``threaded=False``. A full queue or buffer drops the oldest
+    (or, with ``drop_newest``, the incoming) event and counts it; events delivered
+    more than ``delay_threshold_ms`` after publishing are counted as delayed. Until
+    the bus is started, events are delivered inline like EventManager did.
+
+    The bus is itself an Observer, so the outbox relay can feed it durable events.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        max_batch: int = 100,
+        delay_threshold_ms: float = 1000.0,
+        policy: str = DROP_OLDEST,
+    ):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Invalid backpressure policy: {policy}")
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.delay_threshold = delay_threshold_ms / 1000
+        self.policy = policy
+        self.subscriptions: List[Subscription] = []
+        self.published = 0
+        self.dropped = 0
+        self._queue: Deque[Event] = deque()
+        self._lock = threading.Lock()
+        self._idle = True
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def subscribe(
+        self,
+        observer: Observer,
+        max_batch: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        policy: Optional[str] = None,
+        threaded: bool = True,
+    ) -> Subscription:
+        subscription = Subscription(
+            observer, max_batch or self.max_batch, max_queue or self.max_queue, policy or self.policy, threaded
+        )
+        self.subscriptions = self.subscriptions + [subscription]
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._start_worker, subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+        if subscription.task is not None:
+            self._loop.call_soon_threadsafe(subscription.task.cancel)
+
+    def publish(self, event: str, data: dict) -> bool:
+        """Queue an event; returns False if it was dropped because the bus is full."""
+        item = Event(event, data, time.monotonic())
+        if self._loop is None:
+            self.published += 1
+            for subscription in self.subscriptions:
+                self._deliver(subscription, [item])
+            return True
+
+        with self._lock:
+            accepted = True
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    accepted = False
+                else:
+                    self._queue.popleft()
+            if accepted:
+                self._queue.append(item)
+                self.published += 1
+            wake, self._idle = self._idle, False
+        if wake:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return accepted
+
+    notify = publish
+
+    def update(self, event: str, data: dict):
+        self.publish(event, data)
+
+    def update_batch(self, events: List[Tuple[str, dict]]):
+        for event, data in events:
+            self.publish(event, data)
+
+    async def start(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._idle = True
+        self._dispatcher = self._loop.create_task(self._dispatch())
+        for subscription in self.subscriptions:
+            self._start_worker(subscription)
+        logger.info(f"Event bus started with {len(self.subscriptions)} observers")
+
+    async def stop(self, timeout: float = 5.0):
+        """Deliver what is queued (for up to ``timeout`` seconds), then stop the background tasks."""
+        if self._loop is None:
+            return
+        deadline = self._loop.time() + timeout
+        while self._loop.time() < deadline and (
+            self._queue or any(s.queue or s.in_flight for s in self.subscriptions)
+        ):
+            self._wakeup.set()
+            await asyncio.sleep(0.01)
+
+        tasks = [self._dispatcher] + [s.task for s in self.subscriptions if s.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        with self._lock:
+            self.dropped += len(self._queue)
+            self._queue.clear()
+        for subscription in self.subscriptions:
+            subscription.dropped += len(subscription.queue)
+            subscription.queue.clear()
+            subscription.task = None
+        self._loop = None
+        logger.info(f"Event bus stopped: {self.stats()}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "dropped": self.dropped,
+            "queued": len(self._queue),
+            "observers": [subscription.stats() for subscription in self.subscriptions],
+        }
+
+    def _start_worker(self, subscription: Subscription):
+        if subscription not in self.subscriptions or subscription.task is not None:
+            return
+        subscription.ready = asyncio.Event()
+        subscription.task = self._loop.create_task(self._run(subscription))
+
+    async def _dispatch(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                events, self._queue = self._queue, deque()
+                self._idle = True
+            if not events:
+                continue
+            for subscription in self.subscriptions:
+                for event in events:
+                    subscription.offer(event)
+                if subscription.ready is not None:
+                    subscription.ready.set()
+
+    async def _run(self, subscription: Subscription):
+        while True:
+            await subscription.ready.wait()
+            subscription.ready.clear()
+            while subscription.queue:
+                size = min(subscription.max_batch, len(subscription.queue))
+                batch = [subscription.queue.popleft() for _ in range(size)]
+                subscription.in_flight = size
+                try:
+                    if subscription.threaded:
+                        await asyncio.to_thread(self._deliver, subscription, batch)
+                    else:
+                        self._deliver(subscription, batch)
+                finally:
+                    subscription.in_flight = 0
+
+    def _deliver(self, subscription: Subscription, batch: List[Event]):
+        now = time.monotonic()
+        subscription.delayed += sum(1 for event in batch if now - event.published_at > self.delay_threshold)
+        try:
+            subscription.observer.update_batch([(event.name, event.data) for event in batch])
+            subscription.delivered += len(batch)
+            subscription.batches += 1
+        except Exception as e:
+            subscription.failed += len(batch)
+            logger.error(f"{type(subscription.observer).__name__} failed on {len(batch)} events: {str(e)}")
+
+
+event_bus = AsyncEventBus(
+    max_queue=int(os.getenv("EVENT_BUS_MAX_QUEUE", "10000")),
+    max_batch=int(os.getenv("EVENT_BUS_MAX_BATCH", "100")),
+    delay_threshold_ms=float(os.getenv("EVENT_BUS_DELAY_THRESHOLD_MS", "1000")),
+    policy=os.getenv("EVENT_BUS_POLICY", DROP_OLDEST),
+)
@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import List, Tuple
 
 class Observer(ABC):
     @abstractmethod
     def update(self, event: str, data: dict):
         pass
 
+    def update_batch(self, events: List[Tuple[str, dict]]):
+        """Called by the event bus with several events at once; override to handle them together."""
+        for event, data in events:
+            self.update(event, data)
+
 class EventManager:
     def __init__(self):
         self.observers = []
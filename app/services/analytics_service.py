@@ -0,0 +1,182 @@
+import os
+import logging
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import Date, case, cast, distinct, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import ExerciseDB, UserDB, WorkoutLogDailyDB, WorkoutPlanDB, utcnow
+from app.models.analytics import ClientSummary, CohortDashboard, VolumeAnalytics, VolumeBucket
+from app.services.cache import TTLCache
+from app.services.data_version_service import data_versions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("day", "week", "month")
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "15"))
+
+
+def period_start(column, granularity: str, dialect_name: str):
+    """SQL expression for the first day of the day/week (Monday)/month containing ``column``."""
+    if granularity == "day":
+        return column
+    if dialect_name == "postgresql":
+        return cast(func.date_trunc(granularity, column), Date)
+    if dialect_name == "sqlite":
+        if granularity == "week":
+            return func.date(column, "weekday 0", "-6 days", type_=Date)
+        return func.date(column, "start of month", type_=Date)
+    if dialect_name in ("mysql", "mariadb"):
+        if granularity == "week":
+            return func.subdate(column, func.weekday(column), type_=Date)
+        return cast(func.date_format(column, "%Y-%m-01"), Date)
+    raise NotImplementedError(f"{granularity} analytics buckets are not implemented for {dialect_name}")
+
+
+class AnalyticsService:
+    """Training volume summed from the workout_log_daily rollup; results are cached per user and data version."""
+
+    def __init__(self, cache: Optional[TTLCache] = None):
+        self.cache = cache if cache is not None else analytics_cache
+
+    def get_volume(
+        self,
+        db: Session,
+        granularity: str = "week",
+        user_id: Optional[int] = None,
+        exercise_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> VolumeAnalytics:
+        if granularity not in GRANULARITIES:
+            raise HTTPException(status_code=400, detail=f"granularity must be one of: {', '.join(GRANULARITIES)}")
+        # Read the version before querying: a write that lands meanwhile bumps it, so this
+        # result can never be served for the newer version.
+        key = ("volume", data_versions.version(user_id), granularity, user_id, exercise_id, date_from, date_to)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        daily = WorkoutLogDailyDB
+        period = period_start(daily.date, granularity, db.get_bind().dialect.name).label("period_start")
+        query = db.query(
+            period,
+            daily.user_id,
+            daily.exercise_id,
+            ExerciseDB.name,
+            func.sum(daily.log_count),
+            func.sum(daily.total_sets),
+            func.sum(daily.total_reps),
+            func.sum(daily.total_volume),
+            func.sum(daily.total_duration),
+        ).outerjoin(ExerciseDB, ExerciseDB.exercise_id == daily.exercise_id)
+        if user_id is not None:
+            query = query.filter(daily.user_id == user_id)
+        if exercise_id is not None:
+            query = query.filter(daily.exercise_id == exercise_id)
+        if date_from is not None:
+            query = query.filter(daily.date >= date_from)
+        if date_to is not None:
+            query = query.filter(daily.date <= date_to)
+        rows = query.group_by(period, daily.user_id, daily.exercise_id, ExerciseDB.name).order_by(
+            period, daily.user_id, daily.exercise_id
+        ).all()
+
+        result = VolumeAnalytics(
+            granularity=granularity,
+            user_id=user_id,
+            exercise_id=exercise_id,
+            date_from=date_from,
+            date_to=date_to,
+            buckets=[
+                VolumeBucket(
+                    period_start=row[0], user_id=row[1], exercise_id=row[2], exercise_name=row[3] or f"Exercise {row[2]}",
+                    log_count=row[4], sets=row[5], reps=row[6], volume=row[7], duration=row[8]
+                ) for row in rows
+            ],
+        )
+        self.cache.set(key, result)
+        logger.info(f"Volume analytics computed: {len(rows)} buckets, granularity {granularity}, user {user_id}")
+        return result
+
+    def get_cohort_dashboard(self, db: Session) -> CohortDashboard:
+        """One row per client (role "user"): active plans, last workout, and 7/30-day sessions and volume.
+
+        Two grouped subqueries, over workout_log_daily and over currently active
+        plans, are joined to users in a single statement. Windows end today (UTC).
+        """
+        today = utcnow().date()
+        key = ("dashboard", data_versions.version(), today)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        daily = WorkoutLogDailyDB
+        week_start, month_start = today - timedelta(days=6), today - timedelta(days=29)
+        in_week = (daily.date >= week_start) & (daily.date <= today)
+        in_month = (daily.date >= month_start) & (daily.date <= today)
+        activity = select(
+            daily.user_id,
+            func.max(daily.date).label("last_workout_date"),
+            func.count(distinct(case((in_week, daily.date)))).label("sessions_7d"),
+            func.count(distinct(case((in_month, daily.date)))).label("sessions_30d"),
+            func.sum(case((in_week, daily.total_volume), else_=0)).label("volume_7d"),
+            func.sum(case((in_month, daily.total_volume), else_=0)).label("volume_30d"),
+        ).group_by(daily.user_id).subquery()
+        plans = select(
+            WorkoutPlanDB.user_id,
+            func.count().label("active_plans"),
+        ).where(WorkoutPlanDB.start_date <= today, WorkoutPlanDB.end_date >= today).group_by(WorkoutPlanDB.user_id).subquery()
+
+        rows = db.query(
+            UserDB.user_id,
+            UserDB.name,
+            UserDB.email,
+            func.coalesce(plans.c.active_plans, 0),
+            activity.c.last_workout_date,
+            func.coalesce(activity.c.sessions_7d, 0),
+            func.coalesce(activity.c.sessions_30d, 0),
+            func.coalesce(activity.c.volume_7d, 0),
+            func.coalesce(activity.c.volume_30d, 0),
+        ).outerjoin(activity, activity.c.user_id == UserDB.user_id).outerjoin(
+            plans, plans.c.user_id == UserDB.user_id
+        ).filter(UserDB.role == "user").order_by(UserDB.user_id).all()
+
+        result = CohortDashboard(as_of=today, clients=[
+            ClientSummary(
+                user_id=row[0], name=row[1], email=row[2], active_plans=row[3], last_workout_date=row[4],
+                sessions_7d=row[5], sessions_30d=row[6], volume_7d=row[7], volume_30d=row[8]
+            ) for row in rows
+        ])
+        self.cache.set(key, result, ttl_seconds=DASHBOARD_CACHE_TTL_SECONDS)
+        logger.info(f"Cohort dashboard computed for {len(rows)} clients")
+        return result
+
+
+class AsyncAnalyticsService:
+    def __init__(self):
+        self.service = AnalyticsService()
+
+    async def get_volume(
+        self,
+        db: AsyncSession,
+        granularity: str = "week",
+        user_id: Optional[int] = None,
+        exercise_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> VolumeAnalytics:
+        return await db.run_sync(
+            lambda session: self.service.get_volume(session, granularity, user_id, exercise_id, date_from, date_to)
+        )
+
+    async def get_cohort_dashboard(self, db: AsyncSession) -> CohortDashboard:
+        return await db.run_sync(lambda session: self.service.get_cohort_dashboard(session))
+
+
+analytics_cache = TTLCache(
+    max_size=int(os.getenv("ANALYTICS_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "30")),
+)
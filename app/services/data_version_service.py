@@ -0,0 +1,51 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+
+class DataVersionRegistry:
+    """Per-user change counters for plans and logs, used to build list ETags without SQL.
+
+    Services call ``bump`` after committing a plan or log change; every bump also
+    advances the global counter trainers' unfiltered lists are keyed on.
+    ``bump_all`` covers changes that show up in everybody's lists, such as a
+    renamed exercise. Counters live in this process only: the ETag carries a
+    per-process epoch so other workers never match it, and a time window of
+    ``window_seconds`` bounds how long a write made by another worker can be
+    answered with 304.
+    """
+
+    def __init__(self, window_seconds: float = 30.0):
+        self.window_seconds = window_seconds
+        self.epoch = uuid.uuid4().hex[:8]
+        self._generation = 0
+        self._global_version = 0
+        self._user_versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *user_ids: int):
+        with self._lock:
+            self._global_version += 1
+            for user_id in set(user_ids):
+                self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+
+    def bump_all(self):
+        with self._lock:
+            self._generation += 1
+
+    def version(self, user_id: Optional[int] = None) -> str:
+        """The user's version, or the global one when user_id is None."""
+        with self._lock:
+            counter = self._global_version if user_id is None else self._user_versions.get(user_id, 0)
+            return f"{self._generation}.{counter}"
+
+    def etag(self, resource: str, user_id: Optional[int], *params: Any) -> str:
+        window = int(time.time() // self.window_seconds) if self.window_seconds > 0 else 0
+        digest = hashlib.sha1(repr((resource, user_id, params)).encode()).hexdigest()[:12]
+        return f'W/"{self.epoch}-{self.version(user_id)}-{window}-{digest}"'
+
+
+data_versions = DataVersionRegistry(window_seconds=float(os.getenv("DATA_VERSION_WINDOW_SECONDS", "30")))
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from app.patterns.event_bus import event_bus
+from app.patterns.observers import Observer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STREAM_EVENTS = frozenset({"log_created", "plan_created"})
+
+
+class StreamConnection:
+    """One open stream: a bounded buffer of encoded frames that drops the oldest when the client lags."""
+
+    def __init__(self, user_id: Optional[int], events: FrozenSet[str], buffer_size: int):
+        self.user_id = user_id
+        self.events = events
+        self.loop = asyncio.get_running_loop()
+        self.frames: Deque[str] = deque(maxlen=buffer_size)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, frame: str):
+        if len(self.frames) == self.frames.maxlen:
+            self.dropped += 1
+        self.frames.append(frame)
+
+    async def next_chunk(self, timeout: float) -> Optional[str]:
+        """Everything buffered as one chunk, or None if nothing arrived within ``timeout`` seconds."""
+        if not self.frames:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        chunk = "".join(self.frames)
+        self.frames.clear()
+        return chunk
+
+
+class EventStreamHub(Observer):
+    """Fans events from a single event bus subscription out to every open stream.
+
+    Each event is encoded as a Server-Sent Events frame once and the same string
+    is queued on every matching connection, so an idle dashboard costs its buffer
+    and nothing else. Users only receive events about themselves; trainers get all
+    of them or one user's.
+    """
+
+    def __init__(self, buffer_size: int = 256, max_connections: int = 5000):
+        self.buffer_size = buffer_size
+        self.max_connections = max_connections
+        self.connections: Set[StreamConnection] = set()
+        self.sequence = 0
+
+    def connect(self, user_id: Optional[int], events: FrozenSet[str] = STREAM_EVENTS) -> StreamConnection:
+        if len(self.connections) >= self.max_connections:
+            raise HTTPException(status_code=503, detail="Too many open event streams", headers={"Retry-After": "5"})
+        connection = StreamConnection(user_id, events, self.buffer_size)
+        self.connections.add(connection)
+        return connection
+
+    def disconnect(self, connection: StreamConnection):
+        self.connections.discard(connection)
+        if connection.dropped:
+            logger.info(f"Event stream closed after dropping {connection.dropped} events for a slow client")
+
+    def update(self, event: str, data: dict):
+        self.update_batch([(event, data)])
+
+    def update_batch(self, events: List[Tuple[str, dict]]):
+        frames = []
+        for event, data in events:
+            if event not in STREAM_EVENTS:
+                continue
+            self.sequence += 1
+            frame = f"id: {self.sequence}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+            frames.append((event, data.get("user_id"), frame))
+        if not frames:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        for connection in list(self.connections):
+            matched = False
+            for event, user_id, frame in frames:
+                if event in connection.events and connection.user_id in (None, user_id):
+                    connection.offer(frame)
+                    matched = True
+            if matched:
+                if connection.loop is running_loop:
+                    connection.ready.set()
+                else:
+                    connection.loop.call_soon_threadsafe(connection.ready.set)
+
+    def stats(self) -> Dict[str, int]:
+        return {"connections": len(self.connections), "events": self.sequence}
+
+
+event_stream_hub = EventStreamHub(
+    buffer_size=int(os.getenv("EVENT_STREAM_BUFFER_SIZE", "256")),
+    max_connections=int(os.getenv("EVENT_STREAM_MAX_CONNECTIONS", "5000")),
+)
+# Runs on the event loop: it only appends shared strings to per-connection buffers.
+event_bus.subscribe(event_stream_hub, threaded=False)
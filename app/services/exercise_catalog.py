@@ -0,0 +1,71 @@
+import hashlib
+import os
+import threading
+import time
+import logging
+from typing import List, NamedTuple, Optional
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.models.exercise import Exercise
+from app.database import ExerciseDB
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+exercise_list_adapter = TypeAdapter(List[Exercise])
+
+
+class CatalogSnapshot(NamedTuple):
+    version: int
+    etag: str
+    body: bytes
+    count: int
+
+
+class ExerciseCatalogCache:
+    """Process-wide copy of GET /workout/exercises, kept as ready-to-send JSON bytes.
+
+    Every create/update/delete of an exercise calls ``invalidate``, which bumps the
+    version; a load that raced with a write is discarded instead of cached. The
+    ETag is a hash of the body, so it is stable across processes, and ``ttl_seconds``
+    bounds how long a change made by another process can stay invisible.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._loaded_at >= self.ttl_seconds:
+                return None
+            return self._snapshot
+
+    def load(self, db: Session) -> CatalogSnapshot:
+        with self._lock:
+            version = self._version
+        exercises = [Exercise.from_orm(exercise) for exercise in db.query(ExerciseDB).order_by(ExerciseDB.exercise_id)]
+        body = exercise_list_adapter.dump_json(exercises)
+        snapshot = CatalogSnapshot(
+            version=version,
+            etag=f'"{hashlib.sha1(body).hexdigest()[:20]}"',
+            body=body,
+            count=len(exercises),
+        )
+        with self._lock:
+            if self._version == version:
+                self._snapshot = snapshot
+                self._loaded_at = time.monotonic()
+        logger.info(f"Exercise catalog loaded: {snapshot.count} exercises, version {version}")
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+
+exercise_catalog = ExerciseCatalogCache(ttl_seconds=float(os.getenv("EXERCISE_CATALOG_TTL_SECONDS", "300")))
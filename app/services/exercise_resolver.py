@@ -0,0 +1,45 @@
+import logging
+from typing import Dict, Iterable, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.exercise import Exercise
+from app.database import ExerciseDB
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ExerciseResolver:
+    """Request-scoped identity map of exercises.
+
+    Injected with ``Depends()``, so FastAPI hands the same instance to the controller
+    and to every service of one request. IDs are batch-loaded with a single ``IN``
+    query the first time they are seen; later lookups, including misses, are served
+    from memory.
+    """
+
+    def __init__(self):
+        self._exercises: Dict[int, Optional[Exercise]] = {}
+
+    def load(self, exercise_ids: Iterable[int], db: Session) -> Dict[int, Exercise]:
+        exercise_ids = list(exercise_ids)
+        missing_ids = {exercise_id for exercise_id in exercise_ids if exercise_id not in self._exercises}
+        if missing_ids:
+            db_exercises = db.query(ExerciseDB).filter(ExerciseDB.exercise_id.in_(missing_ids)).all()
+            for db_exercise in db_exercises:
+                self._exercises[db_exercise.exercise_id] = Exercise.from_orm(db_exercise)
+            for exercise_id in missing_ids:
+                self._exercises.setdefault(exercise_id, None)
+            logger.debug(f"Resolved {len(db_exercises)} of {len(missing_ids)} exercises")
+        return {
+            exercise_id: self._exercises[exercise_id]
+            for exercise_id in exercise_ids
+            if self._exercises[exercise_id] is not None
+        }
+
+    def get(self, exercise_id: int, db: Session) -> Optional[Exercise]:
+        return self.load([exercise_id], db).get(exercise_id)
+
+    async def load_async(self, exercise_ids: Iterable[int], db: AsyncSession) -> Dict[int, Exercise]:
+        exercise_ids = list(exercise_ids)
+        return await db.run_sync(lambda session: self.load(exercise_ids, session))
@@ -1,9 +1,12 @@
 import logging
 from typing import List, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.models.exercise import Exercise
-from app.database import ExerciseDB
+from app.database import ExerciseDB, write_transaction
+from app.services.exercise_catalog import exercise_catalog, CatalogSnapshot
+from app.services.data_version_service import data_versions
 from fastapi import HTTPException
 
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +26,7 @@ class ExerciseService:
         )
 
     def create_exercise(self, exercise: Exercise, db: Session) -> Exercise:
+        write_transaction(db)
         logger.info(f"Creating exercise: {exercise.name}")
         try:
             db_exercise = ExerciseDB(
@@ -34,6 +38,7 @@ class ExerciseService:
             db.add(db_exercise)
             db.commit()
             db.refresh(db_exercise)
+            exercise_catalog.invalidate()
             logger.info(f"Exercise successfully created: {db_exercise.name}, ID: {db_exercise.exercise_id}")
             return Exercise.from_orm(db_exercise)
         except IntegrityError as e:
@@ -49,7 +54,12 @@ class ExerciseService:
         db_exercises = db.query(ExerciseDB).all()
         return [Exercise.from_orm(exercise) for exercise in db_exercises]
 
+    def get_catalog(self, db: Session) -> CatalogSnapshot:
+        """The serialized exercise list, from the process-wide cache when it is current."""
+        return exercise_catalog.current() or exercise_catalog.load(db)
+
     def update_exercise(self, exercise: Exercise, db: Session) -> Optional[Exercise]:
+        write_transaction(db)
         db_exercise = db.query(ExerciseDB).filter(ExerciseDB.exercise_id == exercise.exercise_id).first()
         if not db_exercise:
             return None
@@ -61,13 +71,46 @@ class ExerciseService:
 
         db.commit()
         db.refresh(db_exercise)
+        exercise_catalog.invalidate()
+        data_versions.bump_all()  # analytics show current exercise names; plans and logs keep theirs
         return Exercise.from_orm(db_exercise)
 
     def delete_exercise(self, exercise_id: int, db: Session) -> bool:
+        write_transaction(db)
         db_exercise = db.query(ExerciseDB).filter(ExerciseDB.exercise_id == exercise_id).first()
         if not db_exercise:
             return False
 
         db.delete(db_exercise)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Foreign keys from plan_exercises and workout_logs: plans and history keep their exercises.
+            db.rollback()
+            logger.warning(f"Exercise {exercise_id} is still used by plans or logs")
+            raise HTTPException(status_code=409, detail="Exercise is still used by workout plans or logs")
+        exercise_catalog.invalidate()
         return True
+
+class AsyncExerciseService:
+    def __init__(self):
+        self.service = ExerciseService()
+
+    async def get_exercise_by_id(self, exercise_id: int, db: AsyncSession) -> Optional[Exercise]:
+        return await db.run_sync(lambda session: self.service.get_exercise_by_id(exercise_id, session))
+
+    async def create_exercise(self, exercise: Exercise, db: AsyncSession) -> Exercise:
+        return await db.run_sync(lambda session: self.service.create_exercise(exercise, session))
+
+    async def get_all_exercises(self, db: AsyncSession) -> List[Exercise]:
+        return await db.run_sync(lambda session: self.service.get_all_exercises(session))
+
+    async def get_catalog(self, db: AsyncSession) -> CatalogSnapshot:
+        # A cached catalog is returned without checking out a connection.
+        return exercise_catalog.current() or await db.run_sync(lambda session: self.service.get_catalog(session))
+
+    async def update_exercise(self, exercise: Exercise, db: AsyncSession) -> Optional[Exercise]:
+        return await db.run_sync(lambda session: self.service.update_exercise(exercise, session))
+
+    async def delete_exercise(self, exercise_id: int, db: AsyncSession) -> bool:
+        return await db.run_sync(lambda session: self.service.delete_exercise(exercise_id, session))
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, NamedTuple, Optional, Union
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import IdempotencyKeyDB, utcnow, write_transaction
+from app.services.cache import TTLCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+# Errors that may go away on retry; their key is released instead of storing the error.
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429}
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code: int
+    body: str
+
+
+class IdempotencyService:
+    """Remembers the response of each POST sent with an Idempotency-Key for ``ttl_seconds``.
+
+    The first request claims the key by inserting a pending row (the unique index
+    picks a single winner); once its handler returns, ``complete`` stores the
+    response on that row and retries get it back. Completed responses are also kept
+    in an in-memory cache so a retry storm does not hit the table. A pending row
+    older than ``lock_seconds`` is treated as abandoned by a crashed request and may
+    be claimed again.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, lock_seconds: int = 60, cache_size: int = 4096):
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.cache = TTLCache(max_size=cache_size, ttl_seconds=ttl_seconds)
+
+    def reserve(self, db: Session, user_id: int, endpoint: str, key: str, request_hash: str) -> Optional[StoredResponse]:
+        """Claim the key and return None, or return the stored response of an earlier request."""
+        stored = self.cache.get((user_id, endpoint, key))
+        if stored:
+            self._check_request(stored.request_hash, request_hash)
+            return stored
+
+        now = utcnow()
+        if self._insert(db, user_id, endpoint, key, request_hash, now):
+            return None
+
+        row = self._find(db, user_id, endpoint, key)
+        if row is None or row.expires_at <= now:
+            self._claim(db, user_id, endpoint, key, row, request_hash, now)
+            return None
+        self._check_request(row.request_hash, request_hash)
+        if row.status_code is None:
+            if row.created_at <= now - timedelta(seconds=self.lock_seconds):
+                self._claim(db, user_id, endpoint, key, row, request_hash, now)
+                return None
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+
+        stored = StoredResponse(row.request_hash, row.status_code, row.response_body)
+        self.cache.set((user_id, endpoint, key), stored, ttl_seconds=(row.expires_at - now).total_seconds())
+        return stored
+
+    def bind(self, db: Session):
+        """Start noting whether the handler running on this session commits."""
+        db.info["idempotency_committed"] = False
+        event.listen(db, "after_commit", _note_commit)
+
+    def unbind(self, db: Session) -> bool:
+        """Stop noting commits; returns True if the handler committed anything."""
+        event.remove(db, "after_commit", _note_commit)
+        return db.info.pop("idempotency_committed", False)
+
+    def complete(self, db: Session, user_id: int, endpoint: str, key: str, status_code: int, body: str):
+        write_transaction(db)
+        row = self._find(db, user_id, endpoint, key)
+        if row is None:
+            return
+        row.status_code = status_code
+        row.response_body = body
+        db.commit()
+        stored = StoredResponse(row.request_hash, status_code, body)
+        self.cache.set((user_id, endpoint, key), stored, ttl_seconds=(row.expires_at - utcnow()).total_seconds())
+
+    def release(self, db: Session, user_id: int, endpoint: str, key: str):
+        """Forget a pending key whose request failed, so a retry runs again."""
+        write_transaction(db)
+        db.query(IdempotencyKeyDB).filter(
+            IdempotencyKeyDB.user_id == user_id,
+            IdempotencyKeyDB.endpoint == endpoint,
+            IdempotencyKeyDB.key == key,
+            IdempotencyKeyDB.status_code.is_(None),
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def purge_expired(self, db: Session) -> int:
+        write_transaction(db)
+        purged = db.query(IdempotencyKeyDB).filter(IdempotencyKeyDB.expires_at <= utcnow()).delete(synchronize_session=False)
+        db.commit()
+        if purged:
+            logger.info(f"Purged {purged} expired idempotency keys")
+        return purged
+
+    def _find(self, db: Session, user_id: int, endpoint: str, key: str) -> Optional[IdempotencyKeyDB]:
+        return db.query(IdempotencyKeyDB).filter(
+            IdempotencyKeyDB.user_id == user_id,
+            IdempotencyKeyDB.endpoint == endpoint,
+            IdempotencyKeyDB.key == key,
+        ).first()
+
+    def _insert(self, db: Session, user_id: int, endpoint: str, key: str, request_hash: str, now: datetime) -> bool:
+        write_transaction(db)
+        try:
+            db.add(IdempotencyKeyDB(
+                user_id=user_id, endpoint=endpoint, key=key, request_hash=request_hash,
+                created_at=now, expires_at=now + timedelta(seconds=self.ttl_seconds)
+            ))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+
+    def _claim(
+        self, db: Session, user_id: int, endpoint: str, key: str,
+        row: Optional[IdempotencyKeyDB], request_hash: str, now: datetime
+    ):
+        if row is None:
+            # The row expired and was purged since the insert failed: reserve the key afresh.
+            claimed = self._insert(db, user_id, endpoint, key, request_hash, now)
+        else:
+            # Compare-and-set on created_at so only one of several concurrent retries wins.
+            row_id, created_at = row.idempotency_key_id, row.created_at
+            write_transaction(db)
+            claimed = db.query(IdempotencyKeyDB).filter(
+                IdempotencyKeyDB.idempotency_key_id == row_id,
+                IdempotencyKeyDB.created_at == created_at,
+            ).update({
+                IdempotencyKeyDB.request_hash: request_hash,
+                IdempotencyKeyDB.status_code: None,
+                IdempotencyKeyDB.response_body: None,
+                IdempotencyKeyDB.created_at: now,
+                IdempotencyKeyDB.expires_at: now + timedelta(seconds=self.ttl_seconds),
+            }, synchronize_session=False)
+            db.commit()
+        if not claimed:
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+
+    def _check_request(self, stored_hash: str, request_hash: str):
+        if stored_hash != request_hash:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+
+
+class AsyncIdempotencyService:
+    """Wraps a POST handler so a request repeated with the same Idempotency-Key replays the first response."""
+
+    def __init__(self):
+        self.service = idempotency_service
+
+    async def run(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        endpoint: str,
+        key: str,
+        payload: BaseModel,
+        operation: Callable[[], Awaitable[BaseModel]],
+    ) -> Union[BaseModel, Response]:
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_IDEMPOTENCY_KEY_LENGTH} characters")
+        request_hash = hashlib.sha256(f"{endpoint}\n{payload.model_dump_json()}".encode()).hexdigest()
+
+        stored = await db.run_sync(lambda session: self.service.reserve(session, user_id, endpoint, key, request_hash))
+        if stored:
+            logger.info(f"Replaying stored response for Idempotency-Key {key} on {endpoint}")
+            return Response(
+                content=stored.body,
+                status_code=stored.status_code,
+                media_type="application/json",
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+        self.service.bind(db.sync_session)
+        try:
+            result = await operation()
+        except HTTPException as e:
+            committed = self.service.unbind(db.sync_session)
+            if e.status_code < 500 and e.status_code not in RETRYABLE_STATUS_CODES:
+                # A rejected request is rejected again on retry, so the error is replayed like a success.
+                body = json.dumps({"detail": e.detail})
+                await self._finish(db, user_id, endpoint, key, lambda session: self.service.complete(
+                    session, user_id, endpoint, key, e.status_code, body
+                ))
+            elif not committed:
+                await self._finish(db, user_id, endpoint, key, lambda session: self.service.release(session, user_id, endpoint, key))
+            raise
+        except BaseException:
+            if not self.service.unbind(db.sync_session):
+                await self._finish(db, user_id, endpoint, key, lambda session: self.service.release(session, user_id, endpoint, key))
+            raise
+        self.service.unbind(db.sync_session)
+        await self._finish(db, user_id, endpoint, key, lambda session: self.service.complete(
+            session, user_id, endpoint, key, 200, result.model_dump_json()
+        ))
+        return result
+
+    async def _finish(self, db: AsyncSession, user_id: int, endpoint: str, key: str, fn: Callable[[Session], None]):
+        # The handler's outcome stands even if the key cannot be updated; it then expires after lock_seconds.
+        try:
+            await db.run_sync(fn)
+        except Exception as e:
+            logger.error(f"Could not update Idempotency-Key {key} on {endpoint} for user {user_id}: {str(e)}")
+
+idempotency_service = IdempotencyService(
+    ttl_seconds=int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+    lock_seconds=int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60")),
+    cache_size=int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "4096")),
+)
+
+
+def _note_commit(session: Session):
+    session.info["idempotency_committed"] = True
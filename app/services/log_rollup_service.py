@@ -0,0 +1,139 @@
+import argparse
+import logging
+import sys
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, WorkoutLogDailyDB, log_rollup_query, write_transaction
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+ROLLUP_KEY = ("user_id", "exercise_id", "date")
+ROLLUP_TOTALS = ("log_count", "total_sets", "total_reps", "total_volume", "total_duration")
+
+
+class LogFigures(NamedTuple):
+    """The fields of a workout log that feed the daily rollup."""
+    user_id: int
+    exercise_id: int
+    date: date
+    sets: int
+    reps: int
+    duration: int
+
+
+class LogRollupService:
+    """Keeps workout_log_daily in step with workout_logs inside the caller's transaction.
+
+    Changes are folded into one delta per (user, exercise, day) and applied with a
+    single upsert that adds to the stored totals; days whose count drops to zero
+    are deleted. Dialects without ON CONFLICT / ON DUPLICATE KEY UPDATE read the
+    existing days and update or insert them in the same transaction instead.
+    ``rebuild`` and ``verify`` recompute everything from workout_logs.
+    """
+
+    def snapshot(self, log: Any) -> LogFigures:
+        return LogFigures(log.user_id, log.exercise_id, log.date, log.sets, log.reps, log.duration)
+
+    def apply(self, db: Session, added: Iterable[Any] = (), removed: Iterable[Any] = ()):
+        deltas: Dict[Tuple[int, int, date], List[int]] = {}
+        for logs, sign in ((added, 1), (removed, -1)):
+            for log in logs:
+                totals = deltas.setdefault((log.user_id, log.exercise_id, log.date), [0, 0, 0, 0, 0])
+                for position, value in enumerate((1, log.sets, log.reps, log.sets * log.reps, log.duration)):
+                    totals[position] += sign * value
+        deltas = {key: totals for key, totals in deltas.items() if any(totals)}
+        if not deltas:
+            return
+
+        dialect = db.get_bind().dialect.name
+        table = WorkoutLogDailyDB.__table__
+        rows = [dict(zip(ROLLUP_KEY + ROLLUP_TOTALS, key + tuple(totals))) for key, totals in deltas.items()]
+        if dialect in UPSERT_DIALECTS:
+            statement = UPSERT_DIALECTS[dialect](table)
+            statement = statement.on_conflict_do_update(
+                index_elements=list(ROLLUP_KEY),
+                set_={name: table.c[name] + statement.excluded[name] for name in ROLLUP_TOTALS},
+            )
+            db.execute(statement, rows)
+        elif dialect == "mysql":
+            statement = mysql.insert(table)
+            statement = statement.on_duplicate_key_update(
+                {name: table.c[name] + statement.inserted[name] for name in ROLLUP_TOTALS}
+            )
+            db.execute(statement, rows)
+        else:
+            self._merge(db, deltas, rows)
+        emptied = [key for key, totals in deltas.items() if totals[0] < 0]
+        if emptied:
+            db.execute(delete(WorkoutLogDailyDB).where(
+                tuple_(WorkoutLogDailyDB.user_id, WorkoutLogDailyDB.exercise_id, WorkoutLogDailyDB.date).in_(emptied),
+                WorkoutLogDailyDB.log_count <= 0,
+            ))
+
+    def _merge(self, db: Session, deltas: Dict[Tuple[int, int, date], List[int]], rows: List[Dict[str, Any]]):
+        """Portable upsert: add to the days that exist, insert the rest."""
+        key_columns = tuple_(WorkoutLogDailyDB.user_id, WorkoutLogDailyDB.exercise_id, WorkoutLogDailyDB.date)
+        existing = {
+            tuple(key) for key in db.execute(
+                select(WorkoutLogDailyDB.user_id, WorkoutLogDailyDB.exercise_id, WorkoutLogDailyDB.date)
+                .where(key_columns.in_(list(deltas)))
+            )
+        }
+        table = WorkoutLogDailyDB.__table__
+        for key in existing:
+            db.execute(
+                update(table)
+                .where(*(table.c[name] == value for name, value in zip(ROLLUP_KEY, key)))
+                .values({name: table.c[name] + change for name, change in zip(ROLLUP_TOTALS, deltas[key])})
+            )
+        fresh = [row for key, row in zip(deltas, rows) if key not in existing]
+        if fresh:
+            db.execute(insert(table), fresh)
+
+    def rebuild(self, db: Session) -> int:
+        """Recompute the whole table from workout_logs in one transaction; returns the number of rows."""
+        write_transaction(db)
+        table = WorkoutLogDailyDB.__table__
+        db.execute(delete(WorkoutLogDailyDB))
+        db.execute(insert(WorkoutLogDailyDB).from_select([column.name for column in table.columns], log_rollup_query()))
+        db.commit()
+        rows = db.query(WorkoutLogDailyDB).count()
+        logger.info(f"Rebuilt workout_log_daily: {rows} rows")
+        return rows
+
+    def verify(self, db: Session) -> List[Tuple[Tuple[int, int, date], tuple, tuple]]:
+        """Compare the table with a fresh aggregation; returns (key, stored, expected) for every difference."""
+        table = WorkoutLogDailyDB.__table__
+        stored = {tuple(row[:3]): tuple(row[3:]) for row in db.execute(select(*table.columns))}
+        expected = {tuple(row[:3]): tuple(row[3:]) for row in db.execute(log_rollup_query())}
+        return [
+            (key, stored.get(key), expected.get(key))
+            for key in sorted(stored.keys() | expected.keys())
+            if stored.get(key) != expected.get(key)
+        ]
+
+
+log_rollup = LogRollupService()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild or verify the workout_log_daily rollup table.")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args(argv)
+    with SessionLocal() as db:
+        if args.command == "rebuild":
+            log_rollup.rebuild(db)
+        mismatches = log_rollup.verify(db)
+    for key, stored, expected in mismatches[:20]:
+        print(f"{key}: stored {stored}, expected {expected}")
+    print(f"workout_log_daily: {len(mismatches)} mismatched rows")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
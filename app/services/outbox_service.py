@@ -0,0 +1,222 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from app.database import OutboxEventDB, SessionLocal, utcnow, write_transaction
+from app.patterns.event_bus import event_bus
+from app.patterns.observers import Observer, TrainerNotifier
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """Reads and writes the outbox table.
+
+    ``add`` only collects events on the session; they are inserted with one
+    statement just before that session commits, so they land in the same
+    transaction as the domain rows and vanish with them on rollback.
+    """
+
+    def add(self, db: Session, event_name: str, payloads: List[Dict[str, Any]]):
+        db.info.setdefault("outbox", []).extend((event_name, payload) for payload in payloads)
+
+    def write_pending(self, db: Session) -> int:
+        pending = db.info.pop("outbox", None)
+        if not pending:
+            return 0
+        now = utcnow()
+        db.execute(insert(OutboxEventDB), [
+            {"event": event_name, "payload": json.dumps(payload, default=str), "created_at": now, "available_at": now}
+            for event_name, payload in pending
+        ])
+        db.info["outbox_written"] = True
+        return len(pending)
+
+    def claim(self, db: Session, limit: int, lease_seconds: float, max_attempts: int) -> List[OutboxEventDB]:
+        """Lease up to ``limit`` due events, oldest first, so other relays skip them until the lease expires."""
+        now = utcnow()
+        outbox_ids = [
+            outbox_id for (outbox_id,) in db.query(OutboxEventDB.outbox_id).filter(
+                OutboxEventDB.available_at <= now,
+                OutboxEventDB.attempts < max_attempts,
+            ).order_by(OutboxEventDB.outbox_id).limit(limit)
+        ]
+        if not outbox_ids:
+            return []
+        # Polling for due events takes no lock; leasing them does.
+        write_transaction(db)
+        leased_until = now + timedelta(seconds=lease_seconds)
+        db.query(OutboxEventDB).filter(
+            OutboxEventDB.outbox_id.in_(outbox_ids),
+            OutboxEventDB.available_at <= now,
+        ).update({
+            OutboxEventDB.available_at: leased_until,
+            OutboxEventDB.attempts: OutboxEventDB.attempts + 1,
+        }, synchronize_session=False)
+        db.commit()
+        return db.query(OutboxEventDB).filter(
+            OutboxEventDB.outbox_id.in_(outbox_ids),
+            OutboxEventDB.available_at == leased_until,
+        ).order_by(OutboxEventDB.outbox_id).all()
+
+    def complete(self, db: Session, outbox_ids: List[int]):
+        write_transaction(db)
+        db.query(OutboxEventDB).filter(OutboxEventDB.outbox_id.in_(outbox_ids)).delete(synchronize_session=False)
+        db.commit()
+
+    def purge_dead(self, db: Session, max_attempts: int) -> int:
+        """Delete events that used up their attempts (and whose last lease ran out); the relay logged each one."""
+        write_transaction(db)
+        purged = db.query(OutboxEventDB).filter(
+            OutboxEventDB.attempts >= max_attempts,
+            OutboxEventDB.available_at <= utcnow(),
+        ).delete(synchronize_session=False)
+        db.commit()
+        if purged:
+            logger.warning(f"Purged {purged} undeliverable outbox events")
+        return purged
+
+
+class OutboxRelay:
+    """Background task that drains the outbox in batches to its observers, at least once.
+
+    An event is deleted only after every observer accepted its batch; if one
+    raises, the batch is delivered again (to all observers) once its lease of
+    ``lease_seconds`` runs out, up to ``max_attempts`` times. An event that fails
+    its last attempt is logged with its payload, counted as dead and left for
+    ``OutboxService.purge_dead`` at the next startup. Commits that wrote events
+    wake the relay immediately; ``poll_interval_ms`` covers events written by
+    other processes.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 100,
+        poll_interval_ms: float = 1000.0,
+        lease_seconds: float = 30.0,
+        max_attempts: int = 10,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval_ms / 1000
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.service = OutboxService()
+        self.observers: List[Observer] = []
+        self.delivered = 0
+        self.failed = 0
+        self.dead = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, observer: Observer):
+        self.observers.append(observer)
+
+    def relay_once(self) -> int:
+        """Deliver one batch; returns how many events were claimed."""
+        with self.session_factory() as db:
+            rows = self.service.claim(db, self.batch_size, self.lease_seconds, self.max_attempts)
+            if not rows:
+                return 0
+            events = [(row.event, json.loads(row.payload)) for row in rows]
+            delivered = True
+            for observer in self.observers:
+                try:
+                    observer.update_batch(events)
+                except Exception as e:
+                    delivered = False
+                    logger.error(f"{type(observer).__name__} failed on {len(events)} outbox events: {str(e)}")
+            if not delivered:
+                self.failed += len(rows)
+                for row in rows:
+                    if row.attempts >= self.max_attempts:
+                        self.dead += 1
+                        logger.error(
+                            f"Giving up on outbox event {row.outbox_id} ({row.event}) after {row.attempts} attempts: {row.payload}"
+                        )
+                return len(rows)
+            self.service.complete(db, [row.outbox_id for row in rows])
+            self.delivered += len(rows)
+            return len(rows)
+
+    def wake(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0):
+        """Deliver what is due (for up to ``timeout`` seconds), then stop the background task."""
+        if self._loop is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        deadline = self._loop.time() + timeout
+        try:
+            while self._loop.time() < deadline and await asyncio.to_thread(self.relay_once):
+                pass
+        except Exception as e:
+            logger.error(f"Outbox drain failed: {str(e)}")
+        self._loop = None
+        logger.info(f"Outbox relay stopped: {self.stats()}")
+
+    def stats(self) -> Dict[str, int]:
+        return {"delivered": self.delivered, "failed": self.failed, "dead": self.dead}
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await asyncio.to_thread(self.relay_once)
+            except Exception as e:
+                logger.error(f"Outbox relay error: {str(e)}")
+                claimed = 0
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+outbox_service = OutboxService()
+outbox_relay = OutboxRelay(
+    batch_size=int(os.getenv("OUTBOX_BATCH_SIZE", "100")),
+    poll_interval_ms=float(os.getenv("OUTBOX_POLL_INTERVAL_MS", "1000")),
+    lease_seconds=float(os.getenv("OUTBOX_LEASE_SECONDS", "30")),
+    max_attempts=int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10")),
+)
+# The relay's only observer is the event bus, which just queues events, so one slow or
+# failing consumer cannot make the relay redeliver a batch to every other one (e.g. to
+# event streams). Consumers on the bus, the trainer notifier included, get each committed
+# event at least once from the relay and then best effort, under the bus's backpressure policy.
+outbox_relay.subscribe(event_bus)
+event_bus.subscribe(TrainerNotifier())
+
+
+@event.listens_for(Session, "before_commit")
+def _write_outbox(session: Session):
+    outbox_service.write_pending(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_relay(session: Session):
+    if session.info.pop("outbox_written", False):
+        outbox_relay.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_outbox(session: Session):
+    session.info.pop("outbox", None)
+    session.info.pop("outbox_written", None)
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from fastapi import HTTPException
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """Runs CryptContext hash/verify calls on a dedicated, size-limited thread pool.
+
+    At most ``max_workers + max_queue`` operations may be in flight; anything beyond
+    that is rejected immediately with a 503 so a login spike cannot pile up work
+    that starves the rest of the API.
+    """
+
+    def __init__(self, context, max_workers: int = 2, max_queue: int = 32):
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._hash_time_total = 0.0
+        self._hash_time_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(lambda: self.context.hash(password))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(lambda: self.context.verify(password, hashed_password))
+
+    async def _run(self, operation: Callable[[], Any]) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                logger.warning(f"Password hasher saturated ({self._pending} pending), rejecting request")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Authentication service is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        submitted_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            try:
+                return operation()
+            finally:
+                finished_at = time.perf_counter()
+                self._record(started_at - submitted_at, finished_at - started_at)
+
+        future = self.executor.submit(job)
+        # Fires once the job has finished or, if the caller went away while it was
+        # still queued, once it was cancelled, so the slot is never lost.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                self._cancelled += 1
+
+    def _record(self, queue_wait: float, hash_time: float):
+        with self._lock:
+            self._completed += 1
+            self._queue_wait_total += queue_wait
+            self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+            self._hash_time_total += hash_time
+            self._hash_time_max = max(self._hash_time_max, hash_time)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "cancelled": self._cancelled,
+                "queue_wait_avg_ms": self._queue_wait_total / completed * 1000,
+                "queue_wait_max_ms": self._queue_wait_max * 1000,
+                "hash_time_avg_ms": self._hash_time_total / completed * 1000,
+                "hash_time_max_ms": self._hash_time_max * 1000,
+            }
+
+
+def create_password_hasher(context) -> PasswordHasher:
+    return PasswordHasher(
+        context,
+        max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+        max_queue=int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32")),
+    )
@@ -0,0 +1,106 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from app.models.sync import SyncResponse
+from app.models.workout_log import WorkoutLog
+from app.database import WorkoutLogDB, WorkoutPlanDB, UserDB, SyncTombstoneDB, utcnow, write_transaction
+from app.services.workout_plan_service import WorkoutPlanService, PLAN_EXERCISES_LOADER
+from app.services.pagination import encode_cursor, decode_cursor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Rows are re-sent if they changed this long before the token, so a transaction that
+# committed after the previous sync read but carries an earlier timestamp is not missed.
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+# Tombstones older than this are purged; a token older than that gets a full snapshot.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+class SyncService:
+    def get_changes(self, db: Session, since: Optional[str] = None, user_id: Optional[int] = None) -> SyncResponse:
+        """Plans and logs changed or deleted after the ``since`` token, or everything when a full sync is needed.
+
+        Clients upsert by ID, so rows sent twice because of the overlap window are harmless.
+        """
+        synced_at = utcnow()
+        changed_after: Optional[datetime] = None
+        if since:
+            try:
+                changed_after = datetime.fromisoformat(decode_cursor(since, 1)[0])
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid sync token")
+            if changed_after < synced_at - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+                logger.info(f"Sync token from {changed_after} is past tombstone retention, sending a full snapshot")
+                changed_after = None
+        full = changed_after is None
+
+        log_query = db.query(WorkoutLogDB)
+        plan_query = (
+            db.query(WorkoutPlanDB, UserDB.name.label("owner_name"))
+            .outerjoin(UserDB, WorkoutPlanDB.user_id == UserDB.user_id)
+            .options(PLAN_EXERCISES_LOADER)
+        )
+        if user_id is not None:
+            log_query = log_query.filter(WorkoutLogDB.user_id == user_id)
+            plan_query = plan_query.filter(WorkoutPlanDB.user_id == user_id)
+
+        deleted_log_ids, deleted_plan_ids = [], []
+        if not full:
+            changed_after -= timedelta(seconds=SYNC_OVERLAP_SECONDS)
+            log_query = log_query.filter(WorkoutLogDB.updated_at > changed_after)
+            plan_query = plan_query.filter(WorkoutPlanDB.updated_at > changed_after)
+            tombstone_query = db.query(SyncTombstoneDB.entity, SyncTombstoneDB.entity_id).filter(
+                SyncTombstoneDB.deleted_at > changed_after
+            )
+            if user_id is not None:
+                tombstone_query = tombstone_query.filter(SyncTombstoneDB.user_id == user_id)
+            for entity, entity_id in tombstone_query:
+                (deleted_log_ids if entity == "log" else deleted_plan_ids).append(entity_id)
+
+        plan_service = WorkoutPlanService()
+        logs = [WorkoutLog.from_orm(db_log) for db_log in log_query.order_by(WorkoutLogDB.log_id)]
+        plans = [
+            plan_service.to_workout_plan(db_plan, owner_name)
+            for db_plan, owner_name in plan_query.order_by(WorkoutPlanDB.plan_id)
+        ]
+        # SQLite may hand a deleted row's ID to the next insert; a row that exists now
+        # was written after its tombstone, so the tombstone must not reach the client.
+        live_log_ids = {log.log_id for log in logs}
+        live_plan_ids = {plan.plan_id for plan in plans}
+        response = SyncResponse(
+            full=full,
+            logs=logs,
+            plans=plans,
+            deleted_log_ids=sorted(set(deleted_log_ids) - live_log_ids),
+            deleted_plan_ids=sorted(set(deleted_plan_ids) - live_plan_ids),
+            next_token=encode_cursor(synced_at),
+        )
+        logger.info(
+            f"Sync for user {user_id}: {len(response.logs)} logs, {len(response.plans)} plans, "
+            f"{len(response.deleted_log_ids) + len(response.deleted_plan_ids)} deletions (full={full})"
+        )
+        return response
+
+    def purge_tombstones(self, db: Session) -> int:
+        write_transaction(db)
+        horizon = utcnow() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+        purged = db.query(SyncTombstoneDB).filter(SyncTombstoneDB.deleted_at < horizon).delete(synchronize_session=False)
+        db.commit()
+        if purged:
+            logger.info(f"Purged {purged} sync tombstones older than {horizon}")
+        return purged
+
+class AsyncSyncService:
+    def __init__(self):
+        self.service = SyncService()
+
+    async def get_changes(self, db: AsyncSession, since: Optional[str] = None, user_id: Optional[int] = None) -> SyncResponse:
+        return await db.run_sync(lambda session: self.service.get_changes(session, since, user_id))
+
+    async def purge_tombstones(self, db: AsyncSession) -> int:
+        return await db.run_sync(lambda session: self.service.purge_tombstones(session))
@@ -0,0 +1,44 @@
+import os
+import time
+import logging
+from typing import Dict, Optional
+from app.models.user import UserPublic
+from app.services.cache import TTLCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TokenCache:
+    """Maps verified access tokens to the user they authenticate.
+
+    Entries never outlive the token's own ``exp`` claim and are dropped as soon as
+    the user behind them is updated or deleted.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def get(self, token: str) -> Optional[UserPublic]:
+        return self._cache.get(token)
+
+    def set(self, token: str, user: UserPublic, expires_at: Optional[float] = None):
+        ttl_seconds = expires_at - time.time() if expires_at else None
+        self._cache.set(token, user, ttl_seconds)
+
+    def invalidate_user(self, user_id: int):
+        removed = self._cache.discard_where(lambda token, user: user.user_id == user_id)
+        if removed:
+            logger.info(f"Invalidated {removed} cached token(s) for user {user_id}")
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+
+token_cache = TokenCache(
+    max_size=int(os.getenv("TOKEN_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60")),
+)
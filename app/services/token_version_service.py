@@ -0,0 +1,74 @@
+import os
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from app.database import UserDB
+from app.services.token_cache import token_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TokenVersionRegistry:
+    """In-memory copy of ``users.token_version`` used to authenticate self-contained JWTs.
+
+    A token is accepted without SQL when its ``ver`` claim matches the version held
+    here. The table is reloaded from the database every ``refresh_seconds``, which
+    bounds how long a logout, role change or deletion made by another process can
+    go unnoticed; changes made in this process are applied immediately.
+    """
+
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self._versions: Dict[int, int] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def needs_refresh(self) -> bool:
+        """Return True to exactly one caller once the table is older than refresh_seconds."""
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_seconds:
+                return False
+            self._refreshed_at = now
+            return True
+
+    def refresh(self, db: Session):
+        rows = db.query(UserDB.user_id, UserDB.token_version).all()
+        versions = {user_id: token_version or 0 for user_id, token_version in rows}
+        with self._lock:
+            previous = self._versions
+            self._versions = versions
+            self._refreshed_at = time.monotonic()
+        for user_id, version in previous.items():
+            if versions.get(user_id) != version:
+                token_cache.invalidate_user(user_id)
+        logger.info(f"Token version table refreshed: {len(versions)} users")
+
+    def check(self, user_id: int, version: int) -> Optional[bool]:
+        """True/False when the user is known, None when the database has to be asked.
+
+        A token newer than the table was minted after another process bumped the
+        version, so it is checked against the database rather than rejected.
+        """
+        current = self._versions.get(user_id)
+        if current is None or version > current:
+            return None
+        return current == version
+
+    def set(self, user_id: int, version: int):
+        with self._lock:
+            previous = self._versions.get(user_id)
+            self._versions[user_id] = version
+        if previous is not None and previous != version:
+            token_cache.invalidate_user(user_id)
+
+    def discard(self, user_id: int):
+        with self._lock:
+            self._versions.pop(user_id, None)
+        token_cache.invalidate_user(user_id)
+
+
+token_versions = TokenVersionRegistry(refresh_seconds=float(os.getenv("TOKEN_VERSION_REFRESH_SECONDS", "30")))
@@ -1,19 +1,27 @@
 import logging
 from typing import List, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import UserInDB, UserPublic
-from app.database import UserDB
-from app.patterns.observers import EventManager, TrainerNotifier
+from app.database import (
+    PlanExerciseDB, SyncTombstoneDB, UserDB, WorkoutLogDB, WorkoutLogDailyDB, WorkoutPlanDB, write_transaction
+)
+from app.services.outbox_service import outbox_service
+from app.services.token_cache import token_cache
+from app.services.token_version_service import token_versions
+from app.services.data_version_service import data_versions
+from app.services.workout_plan_service import WorkoutPlanService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class UserService:
     def __init__(self):
-        self.event_manager = EventManager()
-        self.event_manager.subscribe(TrainerNotifier())
+        self.outbox = outbox_service
 
     def create_user(self, user: UserInDB, db: Session) -> UserPublic:
+        write_transaction(db)
         logger.info(f"Creating user: {user.email}")
         if user.role not in ["user", "trainer"]:
             logger.warning(f"Invalid role: {user.role}")
@@ -25,12 +33,14 @@ class UserService:
 
             db_user = UserDB(**user_data)
             db.add(db_user)
+            db.flush()
+            self.outbox.add(db, "user_created", [{"user_id": db_user.user_id, "email": db_user.email}])
             logger.debug("User added to database (before commit).")
             db.commit()
             logger.info(f"Commit successful: {user.email}")
             db.refresh(db_user)
+            data_versions.bump(db_user.user_id)  # the trainers' cohort dashboard lists every user
             logger.info(f"User saved to database: {db_user.email}")
-            self.event_manager.notify("user_created", {"email": db_user.email})
             return UserPublic.from_orm(db_user)
         except Exception as e:
             logger.error(f"Error creating user: {e}")
@@ -51,7 +61,8 @@ class UserService:
             name=db_user.name,
             email=db_user.email,
             password=db_user.password_hash,
-            role=db_user.role
+            role=db_user.role,
+            token_version=db_user.token_version or 0
         )
 
     def get_all_users(self, db: Session) -> List[UserPublic]:
@@ -59,21 +70,91 @@ class UserService:
         return [UserPublic.from_orm(user) for user in db_users]
 
     def update_user(self, user_id: int, db: Session, name: Optional[str] = None, email: Optional[str] = None) -> Optional[UserPublic]:
+        write_transaction(db)
         db_user = db.query(UserDB).filter(UserDB.user_id == user_id).first()
         if not db_user:
             return None
         if name:
             db_user.name = name
-        if email:
+        email_changed = bool(email) and email != db_user.email
+        if email_changed:
             db_user.email = email
+            # Tokens are issued for the old address (their ``sub``), so they stop working.
+            db_user.token_version = (db_user.token_version or 0) + 1
+        if name:
+            WorkoutPlanService().touch_plans(db, user_id=user_id)
         db.commit()
         db.refresh(db_user)
+        if email_changed:
+            token_versions.set(user_id, db_user.token_version)
+        token_cache.invalidate_user(user_id)
+        data_versions.bump(user_id)  # plans show the owner's name
         return UserPublic.from_orm(db_user)
 
+    def revoke_tokens(self, user_id: int, db: Session) -> bool:
+        write_transaction(db)
+        db_user = db.query(UserDB).filter(UserDB.user_id == user_id).first()
+        if not db_user:
+            return False
+        db_user.token_version = (db_user.token_version or 0) + 1
+        db.commit()
+        token_versions.set(user_id, db_user.token_version)
+        token_cache.invalidate_user(user_id)
+        logger.info(f"Tokens revoked for user {user_id}")
+        return True
+
     def delete_user(self, user_id: int, db: Session) -> bool:
+        write_transaction(db)
         db_user = db.query(UserDB).filter(UserDB.user_id == user_id).first()
         if not db_user:
             return False
+        self._delete_owned_rows(user_id, db)
         db.delete(db_user)
         db.commit()
+        token_versions.discard(user_id)
+        token_cache.invalidate_user(user_id)
+        data_versions.bump(user_id)
         return True
+
+    def _delete_owned_rows(self, user_id: int, db: Session):
+        """Delete the user's logs, their rollup and the user's plans, leaving sync tombstones; no commit.
+
+        Foreign keys from workout_logs and workout_plans would otherwise block deleting the user.
+        """
+        log_ids = [log_id for (log_id,) in db.query(WorkoutLogDB.log_id).filter(WorkoutLogDB.user_id == user_id)]
+        plan_ids = [plan_id for (plan_id,) in db.query(WorkoutPlanDB.plan_id).filter(WorkoutPlanDB.user_id == user_id)]
+        db.query(WorkoutLogDailyDB).filter(WorkoutLogDailyDB.user_id == user_id).delete(synchronize_session=False)
+        db.query(WorkoutLogDB).filter(WorkoutLogDB.user_id == user_id).delete(synchronize_session=False)
+        if plan_ids:
+            db.query(PlanExerciseDB).filter(PlanExerciseDB.plan_id.in_(plan_ids)).delete(synchronize_session=False)
+            db.query(WorkoutPlanDB).filter(WorkoutPlanDB.plan_id.in_(plan_ids)).delete(synchronize_session=False)
+        tombstones = [("log", log_id) for log_id in log_ids] + [("plan", plan_id) for plan_id in plan_ids]
+        if tombstones:
+            db.execute(insert(SyncTombstoneDB), [
+                {"entity": entity, "entity_id": entity_id, "user_id": user_id} for entity, entity_id in tombstones
+            ])
+
+class AsyncUserService:
+    def __init__(self):
+        self.service = UserService()
+
+    async def create_user(self, user: UserInDB, db: AsyncSession) -> UserPublic:
+        return await db.run_sync(lambda session: self.service.create_user(user, session))
+
+    async def get_user_by_id(self, user_id: int, db: AsyncSession) -> Optional[UserPublic]:
+        return await db.run_sync(lambda session: self.service.get_user_by_id(user_id, session))
+
+    async def get_user_by_email(self, email: str, db: AsyncSession) -> Optional[UserInDB]:
+        return await db.run_sync(lambda session: self.service.get_user_by_email(email, session))
+
+    async def get_all_users(self, db: AsyncSession) -> List[UserPublic]:
+        return await db.run_sync(lambda session: self.service.get_all_users(session))
+
+    async def update_user(self, user_id: int, db: AsyncSession, name: Optional[str] = None, email: Optional[str] = None) -> Optional[UserPublic]:
+        return await db.run_sync(lambda session: self.service.update_user(user_id, session, name, email))
+
+    async def revoke_tokens(self, user_id: int, db: AsyncSession) -> bool:
+        return await db.run_sync(lambda session: self.service.revoke_tokens(user_id, session))
+
+    async def delete_user(self, user_id: int, db: AsyncSession) -> bool:
+        return await db.run_sync(lambda session: self.service.delete_user(user_id, session))
@@ -1,17 +1,31 @@
-from typing import List, Optional
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import os
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
-from app.models.workout_log import WorkoutLog, WorkoutLogCreate
-from app.database import WorkoutLogDB, ExerciseDB
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, Depends
+from app.models.workout_log import WorkoutLog, WorkoutLogBulkItemResult, WorkoutLogBulkResult
+from app.database import WorkoutLogDB, SyncTombstoneDB, AsyncSessionLocal, write_transaction
+from app.services.exercise_resolver import ExerciseResolver
+from app.services.data_version_service import data_versions
+from app.services.outbox_service import outbox_service
+from app.services.log_rollup_service import log_rollup
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.write_buffer import GroupCommitBuffer
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class WorkoutLogService:
+    def __init__(self, resolver: Optional[ExerciseResolver] = None):
+        self.resolver = resolver or ExerciseResolver()
+
     def create_log(self, log: WorkoutLog, db: Session) -> WorkoutLog:
+        write_transaction(db)
         try:
-            db_exercise = db.query(ExerciseDB).filter(ExerciseDB.exercise_id == log.exercise_id).first()
+            db_exercise = self.resolver.get(log.exercise_id, db)
             if not db_exercise:
                 logger.error(f"Exercise ID {log.exercise_id} not found")
                 raise HTTPException(status_code=400, detail=f"Exercise ID {log.exercise_id} not found")
@@ -20,34 +34,12 @@ class WorkoutLogService:
                 logger.warning(f"Exercise name mismatch: provided '{log.exercise_name}', expected '{db_exercise.name}'")
                 log.exercise_name = db_exercise.name
 
-            db_log = WorkoutLogDB(
-                user_id=log.user_id,
-                exercise_id=log.exercise_id,
-                exercise_name=log.exercise_name,
-                exercise_description=log.exercise_description,
-                sets=log.sets,
-                reps=log.reps,
-                date=log.date,
-                duration=log.duration,
-                notes=log.notes
-            )
-            db.add(db_log)
+            created_log = self.add_logs([log], db)[0]
             db.commit()
-            db.refresh(db_log)
+            data_versions.bump(created_log.user_id)
 
-            logger.info(f"Workout log created: Log ID {db_log.log_id}")
-            return WorkoutLog(
-                log_id=db_log.log_id,
-                user_id=db_log.user_id,
-                exercise_id=db_log.exercise_id,
-                exercise_name=db_log.exercise_name,
-                exercise_description=db_log.exercise_description,
-                sets=db_log.sets,
-                reps=db_log.reps,
-                date=db_log.date,
-                duration=db_log.duration,
-                notes=db_log.notes
-            )
+            logger.info(f"Workout log created: Log ID {created_log.log_id}")
+            return created_log
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -55,6 +47,86 @@ class WorkoutLogService:
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Error creating log: {str(e)}")
 
+    def create_logs_bulk(self, logs: List[WorkoutLog], db: Session, all_or_nothing: bool = True) -> WorkoutLogBulkResult:
+        """Validate every item with one exercise query and insert the valid ones in one transaction.
+
+        With all_or_nothing a single invalid item means nothing is written and the
+        valid items are reported as skipped.
+        """
+        write_transaction(db)
+        try:
+            db_exercises = self.resolver.load({log.exercise_id for log in logs}, db)
+            results: List[Optional[WorkoutLogBulkItemResult]] = [None] * len(logs)
+            valid = []
+            for index, log in enumerate(logs):
+                db_exercise = db_exercises.get(log.exercise_id)
+                if not db_exercise:
+                    results[index] = WorkoutLogBulkItemResult(
+                        index=index, status="failed", error=f"Exercise ID {log.exercise_id} not found"
+                    )
+                    continue
+                if log.exercise_name != db_exercise.name:
+                    log = log.model_copy(update={"exercise_name": db_exercise.name})
+                valid.append((index, log))
+
+            if valid and not (all_or_nothing and len(valid) < len(logs)):
+                created_logs = self.add_logs([log for _, log in valid], db)
+                db.commit()
+                data_versions.bump(*{log.user_id for log in created_logs})
+                for (index, _), created_log in zip(valid, created_logs):
+                    results[index] = WorkoutLogBulkItemResult(index=index, status="created", log_id=created_log.log_id)
+            else:
+                for index, _ in valid:
+                    results[index] = WorkoutLogBulkItemResult(index=index, status="skipped")
+
+            created = sum(result.status == "created" for result in results)
+            logger.info(f"Bulk log insert: {created} created, {len(logs) - len(valid)} failed of {len(logs)}")
+            return WorkoutLogBulkResult(created=created, failed=len(logs) - len(valid), results=results)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Error creating logs in bulk: {str(e)}")
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Error creating logs: {str(e)}")
+
+    def create_logs_grouped(self, logs: List[WorkoutLog], db: Session) -> List[Union[WorkoutLog, HTTPException]]:
+        """Group-commit path: independent callers' logs share one lookup, one insert and one commit.
+
+        Returns the created log or the error for each item. If the shared transaction
+        fails as a whole, items are retried one by one so only the offending one fails.
+        """
+        try:
+            result = self.create_logs_bulk(logs, db, all_or_nothing=False)
+        except HTTPException:
+            outcomes = []
+            for log in logs:
+                try:
+                    outcomes.append(self.create_log(log, db))
+                except HTTPException as e:
+                    outcomes.append(e)
+            return outcomes
+
+        outcomes = []
+        for log, item in zip(logs, result.results):
+            if item.status == "created":
+                exercise_name = self.resolver.get(log.exercise_id, db).name
+                outcomes.append(log.model_copy(update={"log_id": item.log_id, "exercise_name": exercise_name}))
+            else:
+                outcomes.append(HTTPException(status_code=400, detail=item.error))
+        return outcomes
+
+    def add_logs(self, logs: List[WorkoutLog], db: Session) -> List[WorkoutLog]:
+        """Insert already validated logs, their daily rollup and log_created events without committing; returns them with their IDs."""
+        if not logs:
+            return []
+        rows = [log.model_dump(exclude={"log_id"}) for log in logs]
+        result = db.execute(insert(WorkoutLogDB).returning(WorkoutLogDB.log_id, sort_by_parameter_order=True), rows)
+        log_ids = result.scalars().all()
+        created_logs = [log.model_copy(update={"log_id": log_id}) for log, log_id in zip(logs, log_ids)]
+        log_rollup.apply(db, added=created_logs)
+        outbox_service.add(db, "log_created", [log.model_dump(mode="json") for log in created_logs])
+        return created_logs
+
     def get_log_by_id(self, log_id: int, db: Session) -> Optional[WorkoutLog]:
         try:
             db_log = db.query(WorkoutLogDB).filter(WorkoutLogDB.log_id == log_id).first()
@@ -123,14 +195,88 @@ class WorkoutLogService:
             logger.error(f"Error fetching all logs: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error fetching all logs: {str(e)}")
 
+    def filter_logs(
+        self,
+        query,
+        user_id: Optional[int] = None,
+        exercise_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ):
+        if user_id is not None:
+            query = query.filter(WorkoutLogDB.user_id == user_id)
+        if exercise_id is not None:
+            query = query.filter(WorkoutLogDB.exercise_id == exercise_id)
+        if date_from is not None:
+            query = query.filter(WorkoutLogDB.date >= date_from)
+        if date_to is not None:
+            query = query.filter(WorkoutLogDB.date <= date_to)
+        return query
+
+    def get_logs_page(
+        self,
+        db: Session,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        user_id: Optional[int] = None,
+        exercise_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Tuple[List[WorkoutLog], Optional[str]]:
+        """Newest-first page of logs keyed on (date, log_id); returns the logs and the cursor of the next page.
+
+        Without a ``limit`` every matching log is returned and there is no next page.
+        """
+        try:
+            query = self.filter_logs(db.query(WorkoutLogDB), user_id, exercise_id, date_from, date_to)
+            if cursor:
+                cursor_date, cursor_log_id = decode_cursor(cursor, 2)
+                try:
+                    cursor_key = (date.fromisoformat(cursor_date), int(cursor_log_id))
+                except (TypeError, ValueError):
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+                query = query.filter(tuple_(WorkoutLogDB.date, WorkoutLogDB.log_id) < cursor_key)
+            query = query.order_by(WorkoutLogDB.date.desc(), WorkoutLogDB.log_id.desc())
+            db_logs = query.limit(limit + 1).all() if limit is not None else query.all()
+            next_cursor = None
+            if limit is not None and len(db_logs) > limit:
+                db_logs = db_logs[:limit]
+                next_cursor = encode_cursor(db_logs[-1].date, db_logs[-1].log_id)
+            logs = [WorkoutLog.from_orm(log) for log in db_logs]
+            logger.info(f"Fetched page of {len(logs)} logs")
+            return logs, next_cursor
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Error fetching log page: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error fetching logs: {str(e)}")
+
+    def iter_log_batches(
+        self,
+        db: Session,
+        batch_size: int = 1000,
+        user_id: Optional[int] = None,
+        exercise_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Iterator[List[Dict]]:
+        """Stream matching logs in log_id order as plain row dicts, holding at most one batch in memory."""
+        columns = [WorkoutLogDB.__table__.c[name] for name in WorkoutLog.model_fields]
+        statement = self.filter_logs(
+            select(*columns), user_id, exercise_id, date_from, date_to
+        ).order_by(WorkoutLogDB.log_id).execution_options(yield_per=batch_size)
+        for rows in db.execute(statement).mappings().partitions():
+            yield [dict(row) for row in rows]
+
     def update_log(self, log: WorkoutLog, db: Session) -> WorkoutLog:
+        write_transaction(db)
         try:
             db_log = db.query(WorkoutLogDB).filter(WorkoutLogDB.log_id == log.log_id).first()
             if not db_log:
                 logger.error(f"Log ID {log.log_id} not found")
                 raise HTTPException(status_code=404, detail="Log not found")
 
-            db_exercise = db.query(ExerciseDB).filter(ExerciseDB.exercise_id == log.exercise_id).first()
+            db_exercise = self.resolver.get(log.exercise_id, db)
             if not db_exercise:
                 logger.error(f"Exercise ID {log.exercise_id} not found")
                 raise HTTPException(status_code=400, detail=f"Exercise ID {log.exercise_id} not found")
@@ -139,6 +285,7 @@ class WorkoutLogService:
                 logger.warning(f"Exercise name mismatch: provided '{log.exercise_name}', expected '{db_exercise.name}'")
                 log.exercise_name = db_exercise.name
 
+            previous = log_rollup.snapshot(db_log)
             db_log.exercise_id = log.exercise_id
             db_log.exercise_name = log.exercise_name
             db_log.exercise_description = log.exercise_description
@@ -147,9 +294,11 @@ class WorkoutLogService:
             db_log.date = log.date
             db_log.duration = log.duration
             db_log.notes = log.notes
+            log_rollup.apply(db, added=[db_log], removed=[previous])
 
             db.commit()
             db.refresh(db_log)
+            data_versions.bump(db_log.user_id)
 
             logger.info(f"Workout log updated: Log ID {db_log.log_id}")
             return WorkoutLog(
@@ -172,16 +321,77 @@ class WorkoutLogService:
             raise HTTPException(status_code=500, detail=f"Error updating log: {str(e)}")
 
     def delete_log(self, log_id: int, db: Session) -> bool:
+        write_transaction(db)
         try:
             db_log = db.query(WorkoutLogDB).filter(WorkoutLogDB.log_id == log_id).first()
             if not db_log:
                 logger.error(f"Log ID {log_id} not found")
                 return False
+            user_id = db_log.user_id
+            log_rollup.apply(db, removed=[db_log])
             db.delete(db_log)
+            db.add(SyncTombstoneDB(entity="log", entity_id=log_id, user_id=user_id))
             db.commit()
+            data_versions.bump(user_id)
             logger.info(f"Workout log deleted: Log ID {log_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting log {log_id}: {str(e)}")
             db.rollback()
-            raise HTTPException(status_code=500, detail=f"Error deleting log: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Error deleting log: {str(e)}")
+
+# Optional group commit for POST /workout/logs: concurrent creations share one transaction.
+log_write_buffer: Optional[GroupCommitBuffer] = None
+if os.getenv("LOG_WRITE_BUFFER_ENABLED", "false").lower() in ("1", "true", "yes"):
+    log_write_buffer = GroupCommitBuffer(
+        lambda logs, db: WorkoutLogService().create_logs_grouped(logs, db),
+        AsyncSessionLocal,
+        max_batch=int(os.getenv("LOG_WRITE_BUFFER_MAX_BATCH", "64")),
+        max_delay_ms=float(os.getenv("LOG_WRITE_BUFFER_MAX_DELAY_MS", "5")),
+    )
+
+class AsyncWorkoutLogService:
+    def __init__(self, resolver: ExerciseResolver = Depends()):
+        self.service = WorkoutLogService(resolver)
+        self.write_buffer = log_write_buffer
+
+    async def create_log(self, log: WorkoutLog, db: AsyncSession, buffered: bool = True) -> WorkoutLog:
+        """``buffered=False`` writes on ``db`` itself, e.g. so the Idempotency-Key wrapper sees whether the log was committed."""
+        if buffered and self.write_buffer is not None:
+            if db.in_transaction():
+                # The buffer commits on its own session; this one must not hold the write lock meanwhile.
+                await db.commit()
+            return await self.write_buffer.submit(log)
+        return await db.run_sync(lambda session: self.service.create_log(log, session))
+
+    async def create_logs_bulk(self, logs: List[WorkoutLog], db: AsyncSession, all_or_nothing: bool = True) -> WorkoutLogBulkResult:
+        return await db.run_sync(lambda session: self.service.create_logs_bulk(logs, session, all_or_nothing))
+
+    async def get_log_by_id(self, log_id: int, db: AsyncSession) -> Optional[WorkoutLog]:
+        return await db.run_sync(lambda session: self.service.get_log_by_id(log_id, session))
+
+    async def get_logs_by_user(self, user_id: int, db: AsyncSession) -> List[WorkoutLog]:
+        return await db.run_sync(lambda session: self.service.get_logs_by_user(user_id, session))
+
+    async def get_all_logs(self, db: AsyncSession) -> List[WorkoutLog]:
+        return await db.run_sync(lambda session: self.service.get_all_logs(session))
+
+    async def get_logs_page(
+        self,
+        db: AsyncSession,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        user_id: Optional[int] = None,
+        exercise_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None
+    ) -> Tuple[List[WorkoutLog], Optional[str]]:
+        return await db.run_sync(
+            lambda session: self.service.get_logs_page(session, limit, cursor, user_id, exercise_id, date_from, date_to)
+        )
+
+    async def update_log(self, log: WorkoutLog, db: AsyncSession) -> WorkoutLog:
+        return await db.run_sync(lambda session: self.service.update_log(log, session))
+
+    async def delete_log(self, log_id: int, db: AsyncSession) -> bool:
+        return await db.run_sync(lambda session: self.service.delete_log(log_id, session))
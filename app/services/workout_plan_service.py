@@ -1,104 +1,227 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import join
-from fastapi import HTTPException
-from app.models.workout_plan import WorkoutPlan, WorkoutPlanCreate, PlanExercise
-from app.models.workout_log import WorkoutLog, WorkoutLogCreate
-from app.database import WorkoutPlanDB, ExerciseDB, UserDB
+from datetime import date
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, delete
+from fastapi import HTTPException, Depends
+from app.models.workout_plan import WorkoutPlan, WorkoutPlanCreate, PlanExercise, PlanAssignment, WorkoutPlanBulkAssignResult
+from app.models.workout_log import WorkoutLog
+from app.database import WorkoutPlanDB, PlanExerciseDB, UserDB, SyncTombstoneDB, utcnow, write_transaction
 from app.services.workout_log_service import WorkoutLogService
-import json
+from app.services.exercise_resolver import ExerciseResolver
+from app.services.data_version_service import data_versions
+from app.services.outbox_service import outbox_service
+from app.services.pagination import encode_cursor, decode_cursor
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Plans are always read together with their ordered exercises.
+PLAN_EXERCISES_LOADER = selectinload(WorkoutPlanDB.plan_exercises)
+
 class WorkoutPlanService:
-    def create_plan(self, plan: WorkoutPlanCreate, user_id: int, db: Session) -> WorkoutPlan:
-        try:
+    def __init__(self, resolver: Optional[ExerciseResolver] = None):
+        self.resolver = resolver or ExerciseResolver()
 
-            exercises_with_names = []
-            for exercise in plan.exercises:
-                db_exercise = db.query(ExerciseDB).filter(ExerciseDB.exercise_id == exercise.exercise_id).first()
-                if not db_exercise:
-                    logger.error(f"Exercise ID {exercise.exercise_id} not found")
-                    raise HTTPException(status_code=400, detail=f"Exercise ID {exercise.exercise_id} not found")
-                exercises_with_names.append({
-                    "exercise_id": exercise.exercise_id,
-                    "name": db_exercise.name,
-                    "sets": exercise.sets,
-                    "reps": exercise.reps,
-                    "rest_seconds": exercise.rest_seconds or 30
-                })
+    def _resolve_exercises(self, exercises: List[PlanExercise], db: Session) -> List[PlanExercise]:
+        """Validate the plan's exercises in one lookup and return them named, in plan order."""
+        db_exercises = self.resolver.load([exercise.exercise_id for exercise in exercises], db)
+        resolved = []
+        for exercise in exercises:
+            db_exercise = db_exercises.get(exercise.exercise_id)
+            if not db_exercise:
+                logger.error(f"Exercise ID {exercise.exercise_id} not found")
+                raise HTTPException(status_code=400, detail=f"Exercise ID {exercise.exercise_id} not found")
+            resolved.append(PlanExercise(
+                exercise_id=exercise.exercise_id,
+                name=db_exercise.name,
+                sets=exercise.sets,
+                reps=exercise.reps,
+                rest_seconds=exercise.rest_seconds or 30
+            ))
+        return resolved
 
+    def _insert_plan_exercises(self, plan_ids: List[int], exercises: List[PlanExercise], db: Session):
+        """Write the exercise rows of one or more plans in plan order with a single executemany; no commit."""
+        rows = [
+            {
+                "plan_id": plan_id,
+                "exercise_id": exercise.exercise_id,
+                "position": position,
+                "sets": exercise.sets,
+                "reps": exercise.reps,
+                "rest_seconds": exercise.rest_seconds,
+                "exercise_name": exercise.name
+            } for plan_id in plan_ids for position, exercise in enumerate(exercises)
+        ]
+        if rows:
+            db.execute(insert(PlanExerciseDB), rows)
 
-            final_user_id = plan.user_id if plan.user_id else user_id
+    def _auto_logs(self, plan: WorkoutPlanCreate, user_id: int, db: Session) -> List[WorkoutLog]:
+        db_exercises = self.resolver.load([exercise.exercise_id for exercise in plan.exercises], db)
+        return [
+            WorkoutLog(
+                user_id=user_id,
+                exercise_id=exercise.exercise_id,
+                exercise_name=db_exercises[exercise.exercise_id].name,
+                exercise_description=db_exercises[exercise.exercise_id].description,
+                sets=exercise.sets,
+                reps=exercise.reps,
+                date=plan.start_date,
+                duration=30,
+                notes=f"Auto-generated log for plan: {plan.title}"
+            ) for exercise in plan.exercises
+        ]
+
+    def _plan_created_payload(self, plan: WorkoutPlanCreate, plan_id: int, user_id: int) -> dict:
+        return {
+            "plan_id": plan_id,
+            "user_id": user_id,
+            "title": plan.title,
+            "level": plan.level,
+            "start_date": plan.start_date.isoformat(),
+            "end_date": plan.end_date.isoformat(),
+        }
 
+    def create_plan(self, plan: WorkoutPlanCreate, user_id: int, db: Session) -> WorkoutPlan:
+        write_transaction(db)
+        try:
+            plan_exercises = self._resolve_exercises(plan.exercises, db)
+
+            final_user_id = plan.user_id if plan.user_id else user_id
+            owner_name = db.query(UserDB.name).filter(UserDB.user_id == final_user_id).scalar()
+            if owner_name is None:
+                logger.error(f"User ID {final_user_id} not found")
+                raise HTTPException(status_code=404, detail=f"User ID {final_user_id} not found")
 
             db_plan = WorkoutPlanDB(
                 user_id=final_user_id,
                 title=plan.title,
                 level=plan.level,
-                exercises=json.dumps(exercises_with_names),
                 start_date=plan.start_date,
                 end_date=plan.end_date
             )
             db.add(db_plan)
-            db.commit()
-            db.refresh(db_plan)
-
-
-            log_service = WorkoutLogService()
-            for exercise in plan.exercises:
-                db_exercise = db.query(ExerciseDB).filter(ExerciseDB.exercise_id == exercise.exercise_id).first()
-                new_log = WorkoutLog(
-                    user_id=final_user_id,
-                    exercise_id=exercise.exercise_id,
-                    exercise_name=db_exercise.name,
-                    exercise_description=db_exercise.description,
-                    sets=exercise.sets,
-                    reps=exercise.reps,
-                    date=plan.start_date,
-                    duration=30,
-                    notes=f"Auto-generated log for plan: {plan.title}"
-                )
-                created_log = log_service.create_log(new_log, db)
-                logger.info(f"Auto-generated workout log: Log ID {created_log.log_id}, Exercise ID {exercise.exercise_id}, Plan ID {db_plan.plan_id}")
-
-
-            db_user = db.query(UserDB).filter(UserDB.user_id == db_plan.user_id).first()
-            owner_name = db_user.name if db_user else "Unknown User"
-
-            logger.info(f"Plan created: Plan ID {db_plan.plan_id}, User ID {db_plan.user_id}")
-            return WorkoutPlan(
+            db.flush()
+            self._insert_plan_exercises([db_plan.plan_id], plan_exercises, db)
+
+            # The plan and its auto-generated logs are written in one transaction.
+            created_logs = WorkoutLogService(self.resolver).add_logs(self._auto_logs(plan, final_user_id, db), db)
+
+            created_plan = WorkoutPlan(
                 plan_id=db_plan.plan_id,
-                user_id=db_plan.user_id,
-                title=db_plan.title,
-                level=db_plan.level,
-                exercises=[
-                    PlanExercise(
-                        exercise_id=ex["exercise_id"],
-                        name=ex["name"],
-                        sets=ex["sets"],
-                        reps=ex["reps"],
-                        rest_seconds=ex["rest_seconds"]
-                    ) for ex in json.loads(db_plan.exercises)
-                ],
-                start_date=db_plan.start_date,
-                end_date=db_plan.end_date,
+                user_id=final_user_id,
+                title=plan.title,
+                level=plan.level,
+                exercises=plan_exercises,
+                start_date=plan.start_date,
+                end_date=plan.end_date,
                 owner_name=owner_name
             )
+            outbox_service.add(db, "plan_created", [self._plan_created_payload(plan, db_plan.plan_id, final_user_id)])
+            db.commit()
+            data_versions.bump(final_user_id)
+
+            for created_log in created_logs:
+                logger.info(f"Auto-generated workout log: Log ID {created_log.log_id}, Exercise ID {created_log.exercise_id}, Plan ID {created_plan.plan_id}")
+            logger.info(f"Plan created: Plan ID {created_plan.plan_id}, User ID {created_plan.user_id}")
+            return created_plan
         except HTTPException as e:
+            db.rollback()
             raise e
         except Exception as e:
             logger.error(f"Error creating plan: {str(e)}")
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Error creating plan: {str(e)}")
 
+    def assign_plan_bulk(self, plan: WorkoutPlanCreate, user_ids: List[int], db: Session) -> WorkoutPlanBulkAssignResult:
+        """Create one copy of a plan, with its auto-generated logs, for each user in a single transaction."""
+        write_transaction(db)
+        try:
+            user_ids = list(dict.fromkeys(user_ids))
+            plan_exercises = self._resolve_exercises(plan.exercises, db)
+            known_user_ids = {
+                user_id for (user_id,) in db.query(UserDB.user_id).filter(UserDB.user_id.in_(user_ids))
+            }
+            missing_user_ids = [user_id for user_id in user_ids if user_id not in known_user_ids]
+            if missing_user_ids:
+                logger.error(f"Users not found: {missing_user_ids}")
+                raise HTTPException(status_code=404, detail=f"Users not found: {missing_user_ids}")
+
+            result = db.execute(insert(WorkoutPlanDB).returning(WorkoutPlanDB.plan_id, sort_by_parameter_order=True), [
+                {
+                    "user_id": user_id,
+                    "title": plan.title,
+                    "level": plan.level,
+                    "start_date": plan.start_date,
+                    "end_date": plan.end_date
+                } for user_id in user_ids
+            ])
+            plan_ids = result.scalars().all()
+            self._insert_plan_exercises(plan_ids, plan_exercises, db)
+            auto_logs = [log for user_id in user_ids for log in self._auto_logs(plan, user_id, db)]
+            created_logs = WorkoutLogService(self.resolver).add_logs(auto_logs, db)
+            outbox_service.add(db, "plan_created", [
+                self._plan_created_payload(plan, plan_id, user_id) for user_id, plan_id in zip(user_ids, plan_ids)
+            ])
+            db.commit()
+            data_versions.bump(*user_ids)
+
+            logger.info(f"Plan '{plan.title}' assigned to {len(user_ids)} users with {len(created_logs)} auto-generated logs")
+            return WorkoutPlanBulkAssignResult(
+                title=plan.title,
+                plans_created=len(plan_ids),
+                logs_created=len(created_logs),
+                assignments=[
+                    PlanAssignment(user_id=user_id, plan_id=plan_id) for user_id, plan_id in zip(user_ids, plan_ids)
+                ]
+            )
+        except HTTPException as e:
+            db.rollback()
+            raise e
+        except Exception as e:
+            logger.error(f"Error assigning plan in bulk: {str(e)}")
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Error assigning plan: {str(e)}")
+
+    def touch_plans(self, db: Session, user_id: Optional[int] = None, exercise_id: Optional[int] = None):
+        """Mark plans whose rendered owner or exercise names changed so delta sync re-sends them; no commit."""
+        query = db.query(WorkoutPlanDB)
+        if user_id is not None:
+            query = query.filter(WorkoutPlanDB.user_id == user_id)
+        if exercise_id is not None:
+            query = query.filter(WorkoutPlanDB.plan_id.in_(
+                select(PlanExerciseDB.plan_id).where(PlanExerciseDB.exercise_id == exercise_id)
+            ))
+        query.update({WorkoutPlanDB.updated_at: utcnow()}, synchronize_session=False)
+
+    def to_workout_plan(self, db_plan: WorkoutPlanDB, owner_name: Optional[str]) -> WorkoutPlan:
+        return WorkoutPlan(
+            plan_id=db_plan.plan_id,
+            user_id=db_plan.user_id,
+            title=db_plan.title,
+            level=db_plan.level,
+            exercises=[
+                PlanExercise(
+                    exercise_id=plan_exercise.exercise_id,
+                    name=plan_exercise.exercise_name or "Unknown Exercise",
+                    sets=plan_exercise.sets,
+                    reps=plan_exercise.reps,
+                    rest_seconds=plan_exercise.rest_seconds
+                ) for plan_exercise in db_plan.plan_exercises
+            ],
+            start_date=db_plan.start_date,
+            end_date=db_plan.end_date,
+            owner_name=owner_name or "Unknown User"
+        )
+
     def get_plan_by_id(self, plan_id: int, db: Session) -> Optional[WorkoutPlan]:
         try:
             db_plan = (
                 db.query(WorkoutPlanDB, UserDB.name.label("owner_name"))
                 .join(UserDB, WorkoutPlanDB.user_id == UserDB.user_id)
+                .options(PLAN_EXERCISES_LOADER)
                 .filter(WorkoutPlanDB.plan_id == plan_id)
                 .first()
             )
@@ -106,25 +229,7 @@ class WorkoutPlanService:
                 logger.info(f"Plan ID {plan_id} not found")
                 return None
             db_plan, owner_name = db_plan
-            exercises = json.loads(db_plan.exercises) if db_plan.exercises else []
-            return WorkoutPlan(
-                plan_id=db_plan.plan_id,
-                user_id=db_plan.user_id,
-                title=db_plan.title,
-                level=db_plan.level,
-                exercises=[
-                    PlanExercise(
-                        exercise_id=ex["exercise_id"],
-                        name=ex.get("name", "Unknown Exercise"),
-                        sets=ex["sets"],
-                        reps=ex["reps"],
-                        rest_seconds=ex.get("rest_seconds", 30)
-                    ) for ex in exercises
-                ],
-                start_date=db_plan.start_date,
-                end_date=db_plan.end_date,
-                owner_name=owner_name or "Unknown User"
-            )
+            return self.to_workout_plan(db_plan, owner_name)
         except Exception as e:
             logger.error(f"Error fetching plan {plan_id}: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error fetching plan: {str(e)}")
@@ -134,32 +239,11 @@ class WorkoutPlanService:
             db_plans = (
                 db.query(WorkoutPlanDB, UserDB.name.label("owner_name"))
                 .join(UserDB, WorkoutPlanDB.user_id == UserDB.user_id)
+                .options(PLAN_EXERCISES_LOADER)
                 .filter(WorkoutPlanDB.user_id == user_id)
                 .all()
             )
-            plans = []
-            for db_plan, owner_name in db_plans:
-                exercises = json.loads(db_plan.exercises) if db_plan.exercises else []
-                plans.append(
-                    WorkoutPlan(
-                        plan_id=db_plan.plan_id,
-                        user_id=db_plan.user_id,
-                        title=db_plan.title,
-                        level=db_plan.level,
-                        exercises=[
-                            PlanExercise(
-                                exercise_id=ex["exercise_id"],
-                                name=ex.get("name", "Unknown Exercise"),
-                                sets=ex["sets"],
-                                reps=ex["reps"],
-                                rest_seconds=ex.get("rest_seconds", 30)
-                            ) for ex in exercises
-                        ],
-                        start_date=db_plan.start_date,
-                        end_date=db_plan.end_date,
-                        owner_name=owner_name or "Unknown User"
-                    )
-                )
+            plans = [self.to_workout_plan(db_plan, owner_name) for db_plan, owner_name in db_plans]
             logger.info(f"Fetched {len(plans)} plans for user {user_id}")
             return plans
         except Exception as e:
@@ -171,90 +255,103 @@ class WorkoutPlanService:
             db_plans = (
                 db.query(WorkoutPlanDB, UserDB.name.label("owner_name"))
                 .join(UserDB, WorkoutPlanDB.user_id == UserDB.user_id)
+                .options(PLAN_EXERCISES_LOADER)
                 .all()
             )
-            plans = []
-            for db_plan, owner_name in db_plans:
-                exercises = json.loads(db_plan.exercises) if db_plan.exercises else []
-                plans.append(
-                    WorkoutPlan(
-                        plan_id=db_plan.plan_id,
-                        user_id=db_plan.user_id,
-                        title=db_plan.title,
-                        level=db_plan.level,
-                        exercises=[
-                            PlanExercise(
-                                exercise_id=ex["exercise_id"],
-                                name=ex.get("name", "Unknown Exercise"),
-                                sets=ex["sets"],
-                                reps=ex["reps"],
-                                rest_seconds=ex.get("rest_seconds", 30)
-                            ) for ex in exercises
-                        ],
-                        start_date=db_plan.start_date,
-                        end_date=db_plan.end_date,
-                        owner_name=owner_name or "Unknown User"
-                    )
-                )
+            plans = [self.to_workout_plan(db_plan, owner_name) for db_plan, owner_name in db_plans]
             logger.info(f"Fetched {len(plans)} plans")
             return plans
         except Exception as e:
             logger.error(f"Error fetching all plans: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error fetching all plans: {str(e)}")
 
+    def get_plans_page(
+        self,
+        db: Session,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        user_id: Optional[int] = None,
+        level: Optional[str] = None,
+        active_from: Optional[date] = None,
+        active_to: Optional[date] = None,
+        exercise_id: Optional[int] = None
+    ) -> Tuple[List[WorkoutPlan], Optional[str]]:
+        """Newest-first page of plans keyed on plan_id; active_from/active_to keep plans overlapping that window.
+
+        Without a ``limit`` every matching plan is returned and there is no next page.
+        """
+        try:
+            query = (
+                db.query(WorkoutPlanDB, UserDB.name.label("owner_name"))
+                .join(UserDB, WorkoutPlanDB.user_id == UserDB.user_id)
+                .options(PLAN_EXERCISES_LOADER)
+            )
+            if user_id is not None:
+                query = query.filter(WorkoutPlanDB.user_id == user_id)
+            if level is not None:
+                query = query.filter(WorkoutPlanDB.level == level)
+            if active_from is not None:
+                query = query.filter(WorkoutPlanDB.end_date >= active_from)
+            if active_to is not None:
+                query = query.filter(WorkoutPlanDB.start_date <= active_to)
+            if exercise_id is not None:
+                query = query.filter(WorkoutPlanDB.plan_id.in_(
+                    select(PlanExerciseDB.plan_id).where(PlanExerciseDB.exercise_id == exercise_id)
+                ))
+            if cursor:
+                (cursor_plan_id,) = decode_cursor(cursor, 1)
+                if not isinstance(cursor_plan_id, int):
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+                query = query.filter(WorkoutPlanDB.plan_id < cursor_plan_id)
+            query = query.order_by(WorkoutPlanDB.plan_id.desc())
+            db_plans = query.limit(limit + 1).all() if limit is not None else query.all()
+            next_cursor = None
+            if limit is not None and len(db_plans) > limit:
+                db_plans = db_plans[:limit]
+                next_cursor = encode_cursor(db_plans[-1][0].plan_id)
+            plans = [self.to_workout_plan(db_plan, owner_name) for db_plan, owner_name in db_plans]
+            logger.info(f"Fetched page of {len(plans)} plans")
+            return plans, next_cursor
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Error fetching plan page: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error fetching plans: {str(e)}")
+
     def update_plan(self, plan: WorkoutPlan, db: Session) -> WorkoutPlan:
+        write_transaction(db)
         try:
             db_plan = db.query(WorkoutPlanDB).filter(WorkoutPlanDB.plan_id == plan.plan_id).first()
             if not db_plan:
                 logger.error(f"Plan ID {plan.plan_id} not found")
                 raise HTTPException(status_code=404, detail="Plan not found")
 
-            exercises_with_names = []
-            for exercise in plan.exercises:
-                db_exercise = db.query(ExerciseDB).filter(ExerciseDB.exercise_id == exercise.exercise_id).first()
-                if not db_exercise:
-                    logger.error(f"Exercise ID {exercise.exercise_id} not found")
-                    raise HTTPException(status_code=400, detail=f"Exercise ID {exercise.exercise_id} not found")
-                exercises_with_names.append({
-                    "exercise_id": exercise.exercise_id,
-                    "name": db_exercise.name,
-                    "sets": exercise.sets,
-                    "reps": exercise.reps,
-                    "rest_seconds": exercise.rest_seconds or 30
-                })
+            plan_exercises = self._resolve_exercises(plan.exercises, db)
 
             db_plan.title = plan.title
             db_plan.level = plan.level
-            db_plan.exercises = json.dumps(exercises_with_names)
             db_plan.start_date = plan.start_date
             db_plan.end_date = plan.end_date
+            db_plan.updated_at = utcnow()  # also when only plan_exercises changed
+            db.execute(delete(PlanExerciseDB).where(PlanExerciseDB.plan_id == db_plan.plan_id))
+            self._insert_plan_exercises([db_plan.plan_id], plan_exercises, db)
 
-            db.commit()
-            db.refresh(db_plan)
-
-            db_user = db.query(UserDB).filter(UserDB.user_id == db_plan.user_id).first()
-            owner_name = db_user.name if db_user else "Unknown User"
-
-            exercises = json.loads(db_plan.exercises) if db_plan.exercises else []
-            logger.info(f"Plan updated: Plan ID {db_plan.plan_id}")
-            return WorkoutPlan(
+            owner_name = db.query(UserDB.name).filter(UserDB.user_id == db_plan.user_id).scalar() or "Unknown User"
+            updated_plan = WorkoutPlan(
                 plan_id=db_plan.plan_id,
                 user_id=db_plan.user_id,
-                title=db_plan.title,
-                level=db_plan.level,
-                exercises=[
-                    PlanExercise(
-                        exercise_id=ex["exercise_id"],
-                        name=ex.get("name", "Unknown Exercise"),
-                        sets=ex["sets"],
-                        reps=ex["reps"],
-                        rest_seconds=ex.get("rest_seconds", 30)
-                    ) for ex in exercises
-                ],
-                start_date=db_plan.start_date,
-                end_date=db_plan.end_date,
+                title=plan.title,
+                level=plan.level,
+                exercises=plan_exercises,
+                start_date=plan.start_date,
+                end_date=plan.end_date,
                 owner_name=owner_name
             )
+            db.commit()
+            data_versions.bump(updated_plan.user_id)
+
+            logger.info(f"Plan updated: Plan ID {updated_plan.plan_id}")
+            return updated_plan
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -263,16 +360,62 @@ class WorkoutPlanService:
             raise HTTPException(status_code=500, detail=f"Error updating plan: {str(e)}")
 
     def delete_plan(self, plan_id: int, db: Session) -> bool:
+        write_transaction(db)
         try:
             db_plan = db.query(WorkoutPlanDB).filter(WorkoutPlanDB.plan_id == plan_id).first()
             if not db_plan:
                 logger.error(f"Plan ID {plan_id} not found")
                 return False
+            user_id = db_plan.user_id
             db.delete(db_plan)
+            db.add(SyncTombstoneDB(entity="plan", entity_id=plan_id, user_id=user_id))
             db.commit()
+            data_versions.bump(user_id)
             logger.info(f"Plan deleted: Plan ID {plan_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting plan {plan_id}: {str(e)}")
             db.rollback()
-            raise HTTPException(status_code=500, detail=f"Error deleting plan: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Error deleting plan: {str(e)}")
+
+class AsyncWorkoutPlanService:
+    def __init__(self, resolver: ExerciseResolver = Depends()):
+        self.service = WorkoutPlanService(resolver)
+
+    async def create_plan(self, plan: WorkoutPlanCreate, user_id: int, db: AsyncSession) -> WorkoutPlan:
+        return await db.run_sync(lambda session: self.service.create_plan(plan, user_id, session))
+
+    async def get_plan_by_id(self, plan_id: int, db: AsyncSession) -> Optional[WorkoutPlan]:
+        return await db.run_sync(lambda session: self.service.get_plan_by_id(plan_id, session))
+
+    async def get_plans_by_user(self, user_id: int, db: AsyncSession) -> List[WorkoutPlan]:
+        return await db.run_sync(lambda session: self.service.get_plans_by_user(user_id, session))
+
+    async def get_all_plans(self, db: AsyncSession) -> List[WorkoutPlan]:
+        return await db.run_sync(lambda session: self.service.get_all_plans(session))
+
+    async def get_plans_page(
+        self,
+        db: AsyncSession,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        user_id: Optional[int] = None,
+        level: Optional[str] = None,
+        active_from: Optional[date] = None,
+        active_to: Optional[date] = None,
+        exercise_id: Optional[int] = None
+    ) -> Tuple[List[WorkoutPlan], Optional[str]]:
+        return await db.run_sync(
+            lambda session: self.service.get_plans_page(
+                session, limit, cursor, user_id, level, active_from, active_to, exercise_id
+            )
+        )
+
+    async def assign_plan_bulk(self, plan: WorkoutPlanCreate, user_ids: List[int], db: AsyncSession) -> WorkoutPlanBulkAssignResult:
+        return await db.run_sync(lambda session: self.service.assign_plan_bulk(plan, user_ids, session))
+
+    async def update_plan(self, plan: WorkoutPlan, db: AsyncSession) -> WorkoutPlan:
+        return await db.run_sync(lambda session: self.service.update_plan(plan, session))
+
+    async def delete_plan(self, plan_id: int, db: AsyncSession) -> bool:
+        return await db.run_sync(lambda session: self.service.delete_plan(plan_id, session))
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitBuffer:
+    """Coalesces concurrent single-row writes into one transaction (group commit).
+
+    ``submit`` queues an item and waits for its own outcome. A single background
+    task collects items for up to ``max_delay_ms`` (or until ``max_batch`` are
+    queued), hands the batch to ``write_batch`` on a fresh session, and resolves
+    each caller with the matching result or exception. While a batch commits, new
+    items pile up for the next one, so under load one fsync covers many writes.
+    ``write_batch`` must return one outcome per item, in order: a value, or an
+    exception instance to raise in that caller.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Any], Session], List[Any]],
+        session_factory: Callable,
+        max_batch: int = 64,
+        max_delay_ms: float = 5.0,
+    ):
+        self.write_batch = write_batch
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._runner: Optional[asyncio.Task] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if self._runner is None or self._runner.done():
+            self._batch_full = asyncio.Event()
+            self._runner = loop.create_task(self._drain())
+        elif len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+        return await future
+
+    async def flush(self):
+        """Wait until everything submitted so far has been written."""
+        if self._runner is not None and not self._runner.done():
+            await self._runner
+
+    async def _drain(self):
+        while self._pending:
+            if len(self._pending) < self.max_batch:
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            items = [item for item, _ in batch]
+            try:
+                async with self.session_factory() as db:
+                    outcomes = await db.run_sync(lambda session: self.write_batch(items, session))
+            except Exception as e:
+                logger.error(f"Group commit of {len(batch)} items failed: {str(e)}")
+                outcomes = [e] * len(batch)
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), outcome in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if isinstance(outcome, BaseException):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,83 @@
+"""Compare per-request commits with group commit for POST /workout/logs style writes.
+
+Runs concurrent AsyncWorkoutLogService.create_log calls against a throwaway SQLite
+file (WAL, synchronous=NORMAL, as configured by app.database) and reports logs/sec
+and commits/sec with and without the GroupCommitBuffer.
+
+    python -m benchmarks.log_write_buffer --clients 64 --logs-per-client 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/benchmark.db"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, ExerciseDB, UserDB  # noqa: E402
+from app.models.workout_log import WorkoutLog  # noqa: E402
+from app.services.exercise_resolver import ExerciseResolver  # noqa: E402
+from app.services.workout_log_service import AsyncWorkoutLogService, WorkoutLogService  # noqa: E402
+from app.services.write_buffer import GroupCommitBuffer  # noqa: E402
+
+
+def seed():
+    with SessionLocal() as db:
+        db.merge(UserDB(user_id=1, name="Bench", email="bench@example.com", password_hash="x", role="user"))
+        db.merge(ExerciseDB(exercise_id=1, name="Squat", description="d", muscle_group="legs", exercise_type="strength"))
+        db.commit()
+
+
+async def run(clients: int, logs_per_client: int, buffer: GroupCommitBuffer = None):
+    commits = []
+    listener = lambda connection: commits.append(1)  # noqa: E731
+    event.listen(async_engine.sync_engine, "commit", listener)
+
+    async def client():
+        for _ in range(logs_per_client):
+            service = AsyncWorkoutLogService(ExerciseResolver())
+            service.write_buffer = buffer
+            async with AsyncSessionLocal() as db:
+                await service.create_log(WorkoutLog(
+                    user_id=1, exercise_id=1, exercise_name="Squat", sets=3, reps=10,
+                    date=date(2025, 1, 1), duration=30
+                ), db)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    event.remove(async_engine.sync_engine, "commit", listener)
+    total = clients * logs_per_client
+    return total / elapsed, len(commits) / elapsed, len(commits), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--logs-per-client", type=int, default=20)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    seed()
+
+    modes = [
+        ("per-request commit", None),
+        (f"group commit ({args.max_batch} / {args.max_delay_ms}ms)", GroupCommitBuffer(
+            lambda logs, db: WorkoutLogService().create_logs_grouped(logs, db),
+            AsyncSessionLocal, max_batch=args.max_batch, max_delay_ms=args.max_delay_ms,
+        )),
+    ]
+    print(f"{args.clients} concurrent clients x {args.logs_per_client} logs")
+    print(f"{'mode':<32} {'logs/sec':>10} {'commits/sec':>12} {'commits':>8} {'seconds':>8}")
+    for name, buffer in modes:
+        logs_per_sec, commits_per_sec, commits, elapsed = asyncio.run(run(args.clients, args.logs_per_client, buffer))
+        print(f"{name:<32} {logs_per_sec:>10.0f} {commits_per_sec:>12.0f} {commits:>8} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,13 @@ const Home = ({ userRole, setIsAuthenticated, setUserRole }) => {
   }, [navigate, setIsAuthenticated, setUserRole]);
 
   const handleLogout = () => {
+    const token = localStorage.getItem('access_token');
+    if (token) {
+      fetch(`${process.env.REACT_APP_API_URL}/auth/logout`, {
+        method: 'POST',
+        headers: { Authorization: `Bearer ${token}` },
+      }).catch(() => {});
+    }
     localStorage.removeItem('access_token');
     localStorage.removeItem('user_email');
     setIsAuthenticated(false);
@@ -107,6 +107,45 @@ const WorkoutLogs = ({ userRole, setIsAuthenticated, setUserRole }) => {
     fetchExercises();
   }, [token, setIsAuthenticated, setUserRole, navigate]);
 
+  // New logs are pushed over /workout/events instead of re-fetching the whole list.
+  useEffect(() => {
+    if (!token) return;
+    const controller = new AbortController();
+
+    const followEvents = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const response = await fetch(`${process.env.REACT_APP_API_URL}/workout/events?types=log_created`, {
+            headers: { Authorization: `Bearer ${token}` },
+            signal: controller.signal,
+          });
+          if (!response.ok) return;
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = '';
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            const frames = buffer.split('\n\n');
+            buffer = frames.pop();
+            frames.forEach((frame) => {
+              const data = frame.split('\n').find((line) => line.startsWith('data: '));
+              if (!data) return;
+              const log = JSON.parse(data.slice(6));
+              setLogs((prev) => (prev.some((l) => l.log_id === log.log_id) ? prev : [log, ...prev]));
+            });
+          }
+        } catch (err) {
+          if (controller.signal.aborted) return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 5000));
+      }
+    };
+
+    followEvents();
+    return () => controller.abort();
+  }, [token]);
+
   const handleCreate = async (e) => {
     e.preventDefault();
     setLoading(true);
@@ -144,7 +183,7 @@ const WorkoutLogs = ({ userRole, setIsAuthenticated, setUserRole }) => {
       }
       if (response.ok) {
         const newLogData = await response.json();
-        setLogs([...logs, newLogData]);
+        setLogs((prev) => (prev.some((l) => l.log_id === newLogData.log_id) ? prev : [newLogData, ...prev]));
         setNewLog({
           exercise_id: '',
           sets: 3,
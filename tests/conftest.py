@@ -1,8 +1,21 @@
+from datetime import date
+from typing import Union
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 from app.main import app
+from app.controllers import auth_controller
+from app.controllers.auth_controller import create_access_token
 from unittest.mock import Mock
-from app.database import SessionLocal
+from app.database import (
+    Base, ExerciseDB, SessionLocal, UserDB, configure_engine, get_async_db, get_async_read_db, to_async_url
+)
+from app.models.workout_log import WorkoutLog
+from app.services.token_cache import token_cache
+from app.services.token_version_service import token_versions
 
 @pytest.fixture
 def client():
@@ -10,4 +23,104 @@ def client():
 
 @pytest.fixture
 def db_session():
-    return Mock(spec=SessionLocal)
\ No newline at end of file
+    session = Mock(spec=SessionLocal)
+    # Write methods open their transaction through write_transaction first.
+    session.in_transaction = Mock(return_value=False)
+    session.connection = Mock()
+    return session
+
+def seed_rows():
+    return [
+        UserDB(user_id=1, name="One", email="one@example.com", password_hash="x", role="user"),
+        UserDB(user_id=2, name="Two", email="two@example.com", password_hash="x", role="user"),
+        ExerciseDB(exercise_id=1, name="Squat", description="d", muscle_group="legs", exercise_type="strength"),
+        ExerciseDB(exercise_id=2, name="Row", description="d", muscle_group="back", exercise_type="strength"),
+    ]
+
+def make_log(
+    user_id: int = 1, day: Union[int, date] = 1, exercise_id: int = 1,
+    sets: int = 3, reps: int = 10, duration: int = 30, exercise_name: str = "Squat"
+) -> WorkoutLog:
+    """A log for the seeded users and exercises; an int ``day`` is that day of January 2025."""
+    return WorkoutLog(
+        user_id=user_id, exercise_id=exercise_id, exercise_name=exercise_name, sets=sets, reps=reps,
+        date=date(2025, 1, day) if isinstance(day, int) else day, duration=duration
+    )
+
+@pytest.fixture
+def sqlite_engine():
+    """A private in-memory database with the full schema."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(sqlite_engine):
+    return sessionmaker(bind=sqlite_engine)
+
+@pytest.fixture
+def seeded(session_factory):
+    """Users 1 and 2 and exercises 1 (Squat) and 2 (Row)."""
+    with session_factory() as db:
+        db.add_all(seed_rows())
+        db.commit()
+
+@pytest.fixture
+def empty_db(session_factory):
+    with session_factory() as db:
+        yield db
+
+@pytest.fixture
+def db(seeded, empty_db):
+    return empty_db
+
+@pytest.fixture
+def configured_db(tmp_path):
+    """Seeded session on a database file set up like the app's engine, foreign keys enforced."""
+    url = f"sqlite:///{tmp_path / 'configured.db'}"
+    engine = configure_engine(create_engine(url, connect_args={"check_same_thread": False}))
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(seed_rows())
+        db.commit()
+        yield db
+    engine.dispose()
+
+@pytest.fixture
+def async_session_factory(tmp_path):
+    """Seeded AsyncSession factory; file-backed so it works in whichever event loop the test runs."""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(seed_rows())
+        db.commit()
+    engine.dispose()
+    async_engine = create_async_engine(to_async_url(url), poolclass=NullPool)
+    configure_engine(async_engine.sync_engine)
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture
+def api(tmp_path, async_session_factory, monkeypatch):
+    """TestClient whose request sessions and token checks use the async_session_factory database."""
+    async def session():
+        async with async_session_factory() as db:
+            yield db
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with sessionmaker(bind=engine)() as db:
+        token_versions.refresh(db)
+    engine.dispose()
+    token_cache.clear()
+    monkeypatch.setattr(auth_controller, "AsyncReadSessionLocal", async_session_factory)
+    app.dependency_overrides[get_async_db] = session
+    app.dependency_overrides[get_async_read_db] = session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def user_headers():
+    """Bearer token of seeded user 1 (One)."""
+    token = create_access_token({"sub": "one@example.com", "role": "user", "uid": 1, "name": "One", "ver": 0})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+from app.database import UserDB, WorkoutLogDailyDB
+from app.services.analytics_service import AnalyticsService, period_start
+from app.services.cache import TTLCache
+from app.services.workout_log_service import WorkoutLogService
+from tests.conftest import make_log
+
+
+def test_volume_groups_by_week_user_and_exercise(db):
+    WorkoutLogService().add_logs([
+        make_log(user_id=1, exercise_id=1, day=date(2025, 3, 3), sets=3, reps=10),   # Monday
+        make_log(user_id=1, exercise_id=1, day=date(2025, 3, 9), sets=4, reps=8),    # Sunday of the same week
+        make_log(user_id=1, exercise_id=2, day=date(2025, 3, 9), sets=2, reps=12, duration=20),
+        make_log(user_id=1, exercise_id=1, day=date(2025, 3, 10), sets=5, reps=5),   # next Monday
+        make_log(user_id=2, exercise_id=1, day=date(2025, 3, 4), sets=1, reps=1),
+    ], db)
+    db.commit()
+
+    result = AnalyticsService(TTLCache()).get_volume(db, "week", user_id=1)
+
+    assert [(b.period_start, b.exercise_id, b.exercise_name, b.log_count, b.sets, b.reps, b.volume, b.duration)
+            for b in result.buckets] == [
+        (date(2025, 3, 3), 1, "Squat", 2, 7, 18, 62, 60),
+        (date(2025, 3, 3), 2, "Row", 1, 2, 12, 24, 20),
+        (date(2025, 3, 10), 1, "Squat", 1, 5, 5, 25, 30),
+    ]
+
+
+def test_volume_by_month_and_day_with_filters(db):
+    WorkoutLogService().add_logs([
+        make_log(user_id=1, exercise_id=1, day=date(2025, 1, 31), sets=3, reps=10),
+        make_log(user_id=2, exercise_id=1, day=date(2025, 1, 15), sets=2, reps=10),
+        make_log(user_id=1, exercise_id=1, day=date(2025, 2, 1), sets=3, reps=10),
+        make_log(user_id=1, exercise_id=2, day=date(2025, 2, 1), sets=3, reps=10),
+    ], db)
+    db.commit()
+    service = AnalyticsService(TTLCache())
+
+    months = service.get_volume(db, "month", exercise_id=1)
+    assert [(b.period_start, b.user_id, b.volume) for b in months.buckets] == [
+        (date(2025, 1, 1), 1, 30), (date(2025, 1, 1), 2, 20), (date(2025, 2, 1), 1, 30)
+    ]
+    days = service.get_volume(db, "day", user_id=1, date_from=date(2025, 2, 1))
+    assert [(b.period_start, b.exercise_id) for b in days.buckets] == [(date(2025, 2, 1), 1), (date(2025, 2, 1), 2)]
+
+
+def test_volume_is_cached_until_the_users_data_changes(db):
+    WorkoutLogService().add_logs([make_log(user_id=1, exercise_id=1, day=date(2025, 1, 6), sets=3, reps=10)], db)
+    db.commit()
+    service = AnalyticsService(TTLCache())
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    first = service.get_volume(db, "week", user_id=1)
+    second = service.get_volume(db, "week", user_id=1)
+    assert second is first and len(statements) == 1
+
+    WorkoutLogService().create_log(make_log(user_id=1, exercise_id=1, day=date(2025, 1, 7), sets=1, reps=10), db)
+    statements.clear()
+    third = service.get_volume(db, "week", user_id=1)
+    assert third.buckets[0].volume == 40 and len(statements) == 1
+
+
+def test_a_year_of_history_is_aggregated_in_sql(db):
+    start = date(2024, 1, 1)
+    WorkoutLogService().add_logs([
+        make_log(user_id=1, exercise_id=exercise_id, day=start + timedelta(days=day), sets=3, reps=10)
+        for day in range(365) for exercise_id in (1, 2)
+    ], db)
+    db.commit()
+
+    result = AnalyticsService(TTLCache()).get_volume(db, "week", user_id=1)
+
+    assert sum(b.log_count for b in result.buckets) == 730
+    assert sum(b.volume for b in result.buckets) == 730 * 30
+    assert len({b.period_start for b in result.buckets}) == 53
+
+
+def test_cohort_dashboard_summarises_each_client(db):
+    from app.database import WorkoutPlanDB, utcnow
+
+    db.add(UserDB(user_id=3, name="Coach", email="coach@example.com", password_hash="x", role="trainer"))
+    today = utcnow().date()
+    db.add_all([
+        WorkoutPlanDB(user_id=1, title="Now", start_date=today - timedelta(days=3), end_date=today + timedelta(days=3)),
+        WorkoutPlanDB(user_id=1, title="Old", start_date=today - timedelta(days=90), end_date=today - timedelta(days=60)),
+    ])
+    WorkoutLogService().add_logs([
+        make_log(user_id=1, exercise_id=1, day=today, sets=3, reps=10),
+        make_log(user_id=1, exercise_id=2, day=today, sets=2, reps=10),
+        make_log(user_id=1, exercise_id=1, day=today - timedelta(days=6), sets=1, reps=10),
+        make_log(user_id=1, exercise_id=1, day=today - timedelta(days=20), sets=1, reps=5),
+        make_log(user_id=1, exercise_id=1, day=today - timedelta(days=45), sets=1, reps=5),
+    ], db)
+    db.commit()
+    service = AnalyticsService(TTLCache())
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    dashboard = service.get_cohort_dashboard(db)
+
+    assert dashboard.as_of == today
+    assert [(c.user_id, c.active_plans, c.last_workout_date, c.sessions_7d, c.sessions_30d, c.volume_7d, c.volume_30d)
+            for c in dashboard.clients] == [
+        (1, 1, today, 2, 3, 60, 65),
+        (2, 0, None, 0, 0, 0, 0),
+    ]
+    assert len(statements) == 1
+    assert service.get_cohort_dashboard(db) is dashboard and len(statements) == 1
+
+
+def test_period_start_is_built_per_dialect():
+    day = WorkoutLogDailyDB.date
+    week = period_start(day, "week", "mysql").compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True})
+    month = period_start(day, "month", "mysql").compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True})
+    assert str(week) == "subdate(workout_log_daily.date, weekday(workout_log_daily.date))"
+    assert "date_format(workout_log_daily.date, '%%Y-%%m-01')" in str(month)
+    assert period_start(day, "day", "oracle") is day
+
+    with pytest.raises(NotImplementedError):
+        period_start(day, "week", "oracle")
@@ -0,0 +1,30 @@
+from datetime import date
+from app.services.data_version_service import DataVersionRegistry
+
+
+def test_bump_changes_user_and_global_etags_only():
+    registry = DataVersionRegistry(window_seconds=0)
+    user_etag = registry.etag("logs", 1, 100, None)
+    other_etag = registry.etag("logs", 2, 100, None)
+    global_etag = registry.etag("logs", None, 100, None)
+
+    registry.bump(1)
+
+    assert registry.etag("logs", 1, 100, None) != user_etag
+    assert registry.etag("logs", 2, 100, None) == other_etag
+    assert registry.etag("logs", None, 100, None) != global_etag
+    assert user_etag.startswith('W/"')
+
+
+def test_etag_depends_on_query_parameters_and_generation():
+    registry = DataVersionRegistry(window_seconds=0)
+    etag = registry.etag("plans", 1, 100, None, date(2025, 1, 1))
+    assert registry.etag("plans", 1, 100, None, date(2025, 1, 2)) != etag
+    assert registry.etag("logs", 1, 100, None, date(2025, 1, 1)) != etag
+
+    registry.bump_all()
+    assert registry.etag("plans", 1, 100, None, date(2025, 1, 1)) != etag
+
+
+def test_etags_differ_between_processes():
+    assert DataVersionRegistry(window_seconds=0).etag("logs", 1) != DataVersionRegistry(window_seconds=0).etag("logs", 1)
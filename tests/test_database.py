@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.database import (
+    configure_engine, database_settings_report, engine_options, to_read_only_url, write_transaction, SQLITE_PRAGMAS
+)
+
+
+def test_sqlite_profile_is_applied_on_every_connection(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    engine = configure_engine(create_engine(url, connect_args={"check_same_thread": False}, **engine_options(url)))
+
+    report = database_settings_report(engine)
+    assert report["journal_mode"] == "wal"
+    assert report["synchronous"] == 1
+    assert report["busy_timeout"] == SQLITE_PRAGMAS["busy_timeout"]
+    assert report["cache_size"] == SQLITE_PRAGMAS["cache_size"]
+    assert report["temp_store"] == 2
+    assert report["pool"] == "QueuePool"
+    assert report["pool_pre_ping"] is True
+    engine.dispose()
+
+
+def test_in_memory_sqlite_keeps_default_pool():
+    assert engine_options("sqlite://") == {}
+    assert engine_options("sqlite+aiosqlite:///:memory:") == {}
+    assert "pool_size" in engine_options("sqlite:///gymguider.db")
+
+
+def test_read_only_engine_sees_commits_and_rejects_writes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    assert to_read_only_url(url).endswith("replica.db?mode=ro&uri=true")
+    assert to_read_only_url("sqlite://") == "sqlite://"
+    assert to_read_only_url("postgresql://db/gym") == "postgresql://db/gym"
+
+    writer = configure_engine(create_engine(url, **engine_options(url)))
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+    reader = configure_engine(create_engine(to_read_only_url(url)), read_only=True)
+
+    with reader.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO t VALUES (2)"))
+    reader.dispose()
+    writer.dispose()
+
+
+def test_parallel_read_then_write_transactions_wait_instead_of_failing(tmp_path):
+    url = f"sqlite:///{tmp_path / 'writers.db'}"
+    engine = configure_engine(create_engine(url, connect_args={"check_same_thread": False}, **engine_options(url)))
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE counter (n INTEGER)"))
+    factory = sessionmaker(bind=engine)
+
+    def read_then_write(_):
+        with factory() as db:
+            write_transaction(db)
+            seen = db.execute(text("SELECT count(*) FROM counter")).scalar()
+            db.execute(text("INSERT INTO counter VALUES (:n)"), {"n": seen})
+            db.commit()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(read_then_write, range(200)))
+
+    with engine.connect() as connection:
+        counts = connection.execute(text("SELECT n FROM counter ORDER BY n")).scalars().all()
+    # Each writer held the write lock from its first read, so no two saw the same count.
+    assert counts == list(range(200))
+    engine.dispose()
+
+
+def test_only_write_transactions_take_the_write_lock(tmp_path):
+    url = f"sqlite:///{tmp_path / 'locks.db'}"
+    engine = configure_engine(create_engine(url, connect_args={"check_same_thread": False}, **engine_options(url)))
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+    factory = sessionmaker(bind=engine)
+
+    with factory() as reader, factory() as writer:
+        reader.execute(text("SELECT count(*) FROM t"))
+        assert reader.in_transaction()
+        write_transaction(writer)
+        writer.execute(text("INSERT INTO t VALUES (1)"))
+        writer.commit()  # would wait out busy_timeout and fail if the reader held the lock
+
+        reader.execute(text("SELECT count(*) FROM t"))
+        write_transaction(reader)  # ends the read-only transaction and starts a locked one
+        assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        reader.execute(text("INSERT INTO t VALUES (2)"))
+        reader.commit()
+    engine.dispose()
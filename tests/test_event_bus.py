@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from app.patterns.event_bus import AsyncEventBus, DROP_NEWEST
+from app.patterns.observers import Observer
+
+
+class RecordingObserver(Observer):
+    def __init__(self, block: threading.Event = None):
+        self.events = []
+        self.batch_sizes = []
+        self.block = block
+
+    def update(self, event, data):
+        self.events.append((event, data))
+
+    def update_batch(self, events):
+        if self.block is not None:
+            self.block.wait(timeout=5)
+        self.batch_sizes.append(len(events))
+        super().update_batch(events)
+
+
+class FailingObserver(Observer):
+    def update(self, event, data):
+        raise RuntimeError("boom")
+
+
+def test_publish_before_start_delivers_inline():
+    bus = AsyncEventBus()
+    observer = RecordingObserver()
+    bus.subscribe(observer)
+    bus.notify("user_created", {"email": "a@example.com"})
+    assert observer.events == [("user_created", {"email": "a@example.com"})]
+
+
+def test_started_bus_delivers_in_batches_off_the_caller():
+    bus = AsyncEventBus(max_batch=50)
+    observer = RecordingObserver()
+    bus.subscribe(observer)
+
+    async def run():
+        await bus.start()
+        for i in range(120):
+            bus.publish("log_created", {"log_id": i})
+        assert observer.events == []
+        await bus.stop()
+
+    asyncio.run(run())
+    assert [data["log_id"] for _, data in observer.events] == list(range(120))
+    assert max(observer.batch_sizes) <= 50
+    assert len(observer.batch_sizes) < 120
+    assert bus.stats()["observers"][0]["delivered"] == 120
+
+
+def test_slow_observer_drops_and_counts_without_blocking_others():
+    bus = AsyncEventBus(delay_threshold_ms=0)
+    release = threading.Event()
+    slow, fast = RecordingObserver(block=release), RecordingObserver()
+    bus.subscribe(slow, max_batch=1, max_queue=2, policy=DROP_NEWEST)
+    bus.subscribe(fast)
+
+    async def run():
+        await bus.start()
+        bus.publish("log_created", {"log_id": 0})
+        await asyncio.sleep(0.05)
+        for i in range(1, 10):
+            bus.publish("log_created", {"log_id": i})
+        await asyncio.sleep(0.05)
+        release.set()
+        await bus.stop()
+
+    asyncio.run(run())
+    slow_stats, fast_stats = bus.stats()["observers"]
+    assert len(fast.events) == 10
+    assert [data["log_id"] for _, data in slow.events] == [0, 1, 2]
+    assert slow_stats["dropped"] == 7
+    assert slow_stats["delayed"] == 3
+
+
+def test_full_bus_drops_oldest_and_failures_are_counted():
+    bus = AsyncEventBus(max_queue=3)
+    failing = FailingObserver()
+    bus.subscribe(failing)
+
+    async def run():
+        await bus.start()
+        for i in range(5):
+            bus.publish("log_created", {"log_id": i})
+        await bus.stop()
+
+    asyncio.run(run())
+    stats = bus.stats()
+    assert stats["published"] == 5 and stats["dropped"] == 2
+    assert stats["observers"][0]["failed"] == 3
+
+
+def test_publish_is_cheap_while_observer_blocks():
+    bus = AsyncEventBus(max_queue=100000)
+    release = threading.Event()
+    bus.subscribe(RecordingObserver(block=release))
+
+    async def run():
+        await bus.start()
+        started = time.perf_counter()
+        for i in range(10000):
+            bus.publish("log_created", {"log_id": i})
+        elapsed = time.perf_counter() - started
+        release.set()
+        await bus.stop()
+        return elapsed
+
+    assert asyncio.run(run()) < 1.0
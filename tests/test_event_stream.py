@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.services.event_stream import EventStreamHub
+
+
+def test_events_fan_out_once_encoded_and_filtered_per_connection():
+    hub = EventStreamHub()
+
+    async def run():
+        trainer = hub.connect(None)
+        owner = hub.connect(1)
+        other = hub.connect(2)
+        plans_only = hub.connect(None, frozenset({"plan_created"}))
+        hub.update_batch([
+            ("log_created", {"log_id": 7, "user_id": 1}),
+            ("plan_created", {"plan_id": 3, "user_id": 1}),
+            ("user_created", {"user_id": 1, "email": "a@example.com"}),
+        ])
+        chunks = [await connection.next_chunk(0.1) for connection in (trainer, owner, other, plans_only)]
+        return chunks, trainer, owner
+
+    (trainer_chunk, owner_chunk, other_chunk, plans_chunk), trainer, owner = asyncio.run(run())
+    assert trainer_chunk == owner_chunk
+    assert trainer_chunk.startswith('id: 1\nevent: log_created\ndata: {"log_id": 7, "user_id": 1}\n\n')
+    assert "user_created" not in trainer_chunk
+    assert other_chunk is None
+    assert plans_chunk == 'id: 2\nevent: plan_created\ndata: {"plan_id": 3, "user_id": 1}\n\n'
+    assert hub.stats() == {"connections": 4, "events": 2}
+
+
+def test_slow_connection_keeps_only_the_newest_frames():
+    hub = EventStreamHub(buffer_size=2)
+
+    async def run():
+        connection = hub.connect(None)
+        for log_id in range(5):
+            hub.update("log_created", {"log_id": log_id, "user_id": 1})
+        return connection, await connection.next_chunk(0.1)
+
+    connection, chunk = asyncio.run(run())
+    assert chunk.count("event: log_created") == 2 and '"log_id": 4' in chunk
+    assert connection.dropped == 3
+    hub.disconnect(connection)
+    assert hub.stats()["connections"] == 0
+
+
+def test_connection_limit_answers_503():
+    hub = EventStreamHub(max_connections=1)
+
+    async def run():
+        hub.connect(None)
+        with pytest.raises(HTTPException) as exc:
+            hub.connect(None)
+        return exc.value
+
+    assert asyncio.run(run()).status_code == 503
@@ -0,0 +1,51 @@
+import json
+from sqlalchemy import event
+from app.models.exercise import Exercise
+from app.services.exercise_catalog import ExerciseCatalogCache
+from app.services.etag import etag_matches
+from app.services.exercise_service import ExerciseService
+
+
+def test_catalog_is_cached_until_a_write_invalidates_it(empty_db, sqlite_engine, monkeypatch):
+    catalog = ExerciseCatalogCache(ttl_seconds=300)
+    monkeypatch.setattr("app.services.exercise_service.exercise_catalog", catalog)
+    db = empty_db
+    service = ExerciseService()
+    service.create_exercise(Exercise(exercise_id=0, name="Squat", description="d", muscle_group="legs", exercise_type="strength"), db)
+
+    statements = []
+    event.listen(sqlite_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    first = service.get_catalog(db)
+    second = service.get_catalog(db)
+    assert second is first
+    assert len(statements) == 1
+    assert [exercise["name"] for exercise in json.loads(first.body)] == ["Squat"]
+
+    service.create_exercise(Exercise(exercise_id=0, name="Row", description="d", muscle_group="back", exercise_type="strength"), db)
+    third = service.get_catalog(db)
+    assert third.version > first.version
+    assert third.etag != first.etag
+    assert third.count == 2
+
+
+def test_load_racing_with_a_write_is_not_cached(empty_db):
+    catalog = ExerciseCatalogCache(ttl_seconds=300)
+    db = empty_db
+    original_query = db.query
+
+    def query_then_write(*args, **kwargs):
+        catalog.invalidate()
+        return original_query(*args, **kwargs)
+
+    db.query = query_then_write
+    catalog.load(db)
+    assert catalog.current() is None
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"x"', '"abc"')
+    assert not etag_matches(None, '"abc"')
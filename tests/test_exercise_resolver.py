@@ -0,0 +1,41 @@
+from sqlalchemy import event
+from app.services.exercise_resolver import ExerciseResolver
+
+
+def record_statements(engine) -> list:
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def exercise_selects(statements: list) -> int:
+    return sum(1 for statement in statements if statement.startswith("SELECT") and "FROM exercises" in statement)
+
+
+def test_load_batches_and_serves_repeats_from_memory(db):
+    statements = record_statements(db.get_bind())
+    resolver = ExerciseResolver()
+
+    exercises = resolver.load([1, 2, 99], db)
+    assert sorted(exercises) == [1, 2]
+    assert resolver.get(1, db).name == "Squat"
+    assert resolver.get(99, db) is None
+    assert resolver.load([2, 1], db).keys() == {1, 2}
+    assert exercise_selects(statements) == 1
+
+    resolver.get(3, db)
+    assert exercise_selects(statements) == 2
+
+
+def test_one_request_shares_the_resolver_between_controller_and_services(api, user_headers, async_session_factory):
+    statements = record_statements(async_session_factory.kw["bind"].sync_engine)
+
+    response = api.post("/workout/plans", headers=user_headers, json={
+        "title": "Push", "level": "beginner", "start_date": "2025-01-01", "end_date": "2025-01-08",
+        "exercises": [{"exercise_id": 1, "sets": 3, "reps": 10}, {"exercise_id": 2, "sets": 3, "reps": 8}],
+    })
+
+    assert response.status_code == 200
+    assert [exercise["name"] for exercise in response.json()["exercises"]] == ["Squat", "Row"]
+    # The controller validates the exercises; the plan service and its auto-logs reuse that lookup.
+    assert exercise_selects(statements) == 1
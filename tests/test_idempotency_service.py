@@ -0,0 +1,115 @@
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from app.database import IdempotencyKeyDB
+from app.services.idempotency_service import IdempotencyService
+from app.services.workout_log_service import AsyncWorkoutLogService
+
+
+def test_completed_response_is_replayed_from_cache_then_table(db):
+    service = IdempotencyService(ttl_seconds=3600)
+    assert service.reserve(db, 1, "POST /workout/logs", "k", "hash") is None
+    service.complete(db, 1, "POST /workout/logs", "k", 200, '{"log_id": 7}')
+
+    assert service.reserve(db, 1, "POST /workout/logs", "k", "hash").body == '{"log_id": 7}'
+    service.cache.clear()
+    assert service.reserve(db, 1, "POST /workout/logs", "k", "hash").status_code == 200
+    assert service.reserve(db, 2, "POST /workout/logs", "k", "hash") is None
+
+    with pytest.raises(HTTPException) as exc_info:
+        service.reserve(db, 1, "POST /workout/logs", "k", "other-hash")
+    assert exc_info.value.status_code == 422
+
+
+def test_pending_key_conflicts_until_released_or_abandoned(db):
+    service = IdempotencyService(ttl_seconds=3600, lock_seconds=60)
+    assert service.reserve(db, 1, "POST /workout/plans", "k", "hash") is None
+    with pytest.raises(HTTPException) as exc_info:
+        service.reserve(db, 1, "POST /workout/plans", "k", "hash")
+    assert exc_info.value.status_code == 409
+
+    service.release(db, 1, "POST /workout/plans", "k")
+    assert service.reserve(db, 1, "POST /workout/plans", "k", "hash") is None
+
+    row = db.query(IdempotencyKeyDB).one()
+    row.created_at -= timedelta(seconds=120)
+    db.commit()
+    assert service.reserve(db, 1, "POST /workout/plans", "k", "hash") is None
+
+
+def test_expired_keys_are_reusable_and_purged(db):
+    service = IdempotencyService(ttl_seconds=3600)
+    service.reserve(db, 1, "POST /workout/logs", "old", "hash")
+    service.complete(db, 1, "POST /workout/logs", "old", 200, "{}")
+    service.reserve(db, 1, "POST /workout/logs", "fresh", "hash")
+    db.query(IdempotencyKeyDB).filter(IdempotencyKeyDB.key == "old").update(
+        {IdempotencyKeyDB.expires_at: IdempotencyKeyDB.created_at}
+    )
+    db.commit()
+    service.cache.clear()
+
+    assert service.reserve(db, 1, "POST /workout/logs", "old", "new-hash") is None
+    db.query(IdempotencyKeyDB).filter(IdempotencyKeyDB.key == "old").update(
+        {IdempotencyKeyDB.expires_at: IdempotencyKeyDB.created_at}
+    )
+    db.commit()
+    assert service.purge_expired(db) == 1
+    assert [row.key for row in db.query(IdempotencyKeyDB)] == ["fresh"]
+
+
+LOG_BODY = {"exercise_id": 1, "exercise_name": "Squat", "sets": 3, "reps": 10, "date": "2025-01-01", "duration": 30}
+
+
+def test_post_response_is_stored_and_replayed(api, user_headers, monkeypatch):
+    service = IdempotencyService(ttl_seconds=3600)
+    monkeypatch.setattr("app.services.idempotency_service.idempotency_service", service)
+    headers = {**user_headers, "Idempotency-Key": "k"}
+
+    first = api.post("/workout/logs", headers=headers, json=LOG_BODY)
+    service.cache.clear()
+    retry = api.post("/workout/logs", headers=headers, json=LOG_BODY)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(api.get("/workout/logs", headers=user_headers).json()) == 1
+
+
+def test_rejected_request_is_replayed_but_conflicts_are_released(api, user_headers, monkeypatch):
+    service = IdempotencyService(ttl_seconds=3600)
+    monkeypatch.setattr("app.services.idempotency_service.idempotency_service", service)
+    headers = {**user_headers, "Idempotency-Key": "bad"}
+    bad_log = {**LOG_BODY, "exercise_id": 99}
+
+    first = api.post("/workout/logs", headers=headers, json=bad_log)
+    retry = api.post("/workout/logs", headers=headers, json=bad_log)
+    assert first.status_code == retry.status_code == 400
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    create_log = AsyncWorkoutLogService.create_log
+    conflicts = [HTTPException(status_code=409, detail="Conflict")]
+
+    async def conflict_once(self, *args, **kwargs):
+        if conflicts:
+            raise conflicts.pop()
+        return await create_log(self, *args, **kwargs)
+
+    monkeypatch.setattr(AsyncWorkoutLogService, "create_log", conflict_once)
+    headers["Idempotency-Key"] = "conflict"
+    assert api.post("/workout/logs", headers=headers, json=LOG_BODY).status_code == 409
+    assert api.post("/workout/logs", headers=headers, json=LOG_BODY).status_code == 200
+
+
+def test_key_purged_between_insert_and_lookup_is_reserved_again(db, monkeypatch):
+    service = IdempotencyService(ttl_seconds=3600)
+    service.reserve(db, 1, "POST /workout/logs", "k", "hash")
+
+    def purged(db, user_id, endpoint, key):
+        db.query(IdempotencyKeyDB).delete()
+        db.commit()
+        return None
+
+    monkeypatch.setattr(service, "_find", purged)
+    assert service.reserve(db, 1, "POST /workout/logs", "k", "hash") is None
+    assert db.query(IdempotencyKeyDB).count() == 1
@@ -0,0 +1,84 @@
+from datetime import date
+from app.database import WorkoutLogDailyDB, WorkoutLogDB, migrate_log_rollup
+from app.models.workout_plan import WorkoutPlanCreate
+from app.services import log_rollup_service
+from app.services.log_rollup_service import log_rollup
+from app.services.workout_log_service import WorkoutLogService
+from app.services.workout_plan_service import WorkoutPlanService
+from tests.conftest import make_log
+
+
+def rollup_rows(db):
+    return [
+        (row.exercise_id, row.date.day, row.log_count, row.total_sets, row.total_reps, row.total_volume, row.total_duration)
+        for row in db.query(WorkoutLogDailyDB).order_by(WorkoutLogDailyDB.exercise_id, WorkoutLogDailyDB.date)
+    ]
+
+
+def test_create_update_and_delete_keep_the_rollup_in_step(db):
+    service = WorkoutLogService()
+    first = service.create_log(make_log(day=1), db)
+    second = service.create_log(make_log(day=1, sets=2, reps=5), db)
+    assert rollup_rows(db) == [(1, 1, 2, 5, 15, 40, 60)]
+
+    service.update_log(second.model_copy(update={"date": date(2025, 1, 2)}), db)
+    assert rollup_rows(db) == [(1, 1, 1, 3, 10, 30, 30), (1, 2, 1, 2, 5, 10, 30)]
+
+    service.update_log(first.model_copy(update={"sets": 4}), db)
+    service.delete_log(second.log_id, db)
+    assert rollup_rows(db) == [(1, 1, 1, 4, 10, 40, 30)]
+    assert log_rollup.verify(db) == []
+
+
+def test_plan_auto_logs_and_bulk_inserts_are_rolled_up(db):
+    WorkoutPlanService().create_plan(WorkoutPlanCreate(
+        title="Plan", level="beginner", start_date=date(2025, 1, 5), end_date=date(2025, 2, 5),
+        exercises=[{"exercise_id": 1, "sets": 3, "reps": 8}, {"exercise_id": 2, "sets": 4, "reps": 6}]
+    ), 1, db)
+    WorkoutLogService().create_logs_bulk([make_log(day=5), make_log(day=6)], db)
+
+    assert rollup_rows(db) == [(1, 5, 2, 6, 18, 54, 60), (1, 6, 1, 3, 10, 30, 30), (2, 5, 1, 4, 6, 24, 30)]
+    assert log_rollup.verify(db) == []
+
+
+def test_rolled_back_writes_leave_the_rollup_untouched(db):
+    WorkoutLogService().add_logs([make_log(day=1)], db)
+    db.rollback()
+    assert rollup_rows(db) == []
+
+
+def test_verify_reports_drift_and_rebuild_repairs_it(db):
+    WorkoutLogService().create_logs_bulk([make_log(day=1), make_log(day=2), make_log(day=3, exercise_id=2)], db)
+    db.query(WorkoutLogDailyDB).filter(WorkoutLogDailyDB.date == date(2025, 1, 1)).update({"total_sets": 99})
+    db.query(WorkoutLogDailyDB).filter(WorkoutLogDailyDB.date == date(2025, 1, 3)).delete()
+    db.commit()
+
+    drift = log_rollup.verify(db)
+    assert [(key[2].day, stored, expected) for key, stored, expected in drift] == [
+        (1, (1, 99, 10, 30, 30), (1, 3, 10, 30, 30)),
+        (3, None, (1, 3, 10, 30, 30)),
+    ]
+    assert log_rollup.rebuild(db) == 3
+    assert log_rollup.verify(db) == []
+
+
+def test_startup_migration_backfills_an_empty_rollup(db):
+    db.execute(WorkoutLogDB.__table__.insert(), [
+        {"user_id": 1, "exercise_id": 1, "exercise_name": "Squat", "sets": 3, "reps": 10, "date": date(2025, 1, 1), "duration": 30}
+    ])
+    db.commit()
+    migrate_log_rollup(db.get_bind())
+    migrate_log_rollup(db.get_bind())
+    assert rollup_rows(db) == [(1, 1, 1, 3, 10, 30, 30)]
+
+
+def test_dialects_without_upsert_fall_back_to_update_or_insert(db, monkeypatch):
+    monkeypatch.setattr(log_rollup_service, "UPSERT_DIALECTS", {})
+    service = WorkoutLogService()
+    first = service.create_log(make_log(day=1), db)
+    service.create_logs_bulk([make_log(day=1, sets=2, reps=5), make_log(day=2)], db)
+    assert rollup_rows(db) == [(1, 1, 2, 5, 15, 40, 60), (1, 2, 1, 3, 10, 30, 30)]
+
+    service.delete_log(first.log_id, db)
+    assert rollup_rows(db) == [(1, 1, 1, 2, 5, 10, 30), (1, 2, 1, 3, 10, 30, 30)]
+    assert log_rollup.verify(db) == []
@@ -0,0 +1,80 @@
+from app.database import OutboxEventDB
+from app.patterns.observers import Observer
+from app.services.outbox_service import OutboxRelay, OutboxService
+from app.services.workout_log_service import WorkoutLogService
+from tests.conftest import make_log
+
+
+class RecordingObserver(Observer):
+    def __init__(self, fail_times: int = 0):
+        self.events = []
+        self.fail_times = fail_times
+
+    def update(self, event, data):
+        self.events.append((event, data))
+
+    def update_batch(self, events):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("unavailable")
+        super().update_batch(events)
+
+
+def test_events_commit_and_roll_back_with_the_rows(seeded, session_factory):
+    with session_factory() as db:
+        WorkoutLogService().create_log(make_log(day=1), db)
+        WorkoutLogService().add_logs([make_log(day=2)], db)
+        db.rollback()
+        events = db.query(OutboxEventDB.event).all()
+    assert events == [("log_created",)]
+
+
+def test_relay_delivers_in_batches_and_deletes(seeded, session_factory):
+    with session_factory() as db:
+        WorkoutLogService().create_logs_bulk([make_log(day=day) for day in range(1, 6)], db)
+    observer = RecordingObserver()
+    relay = OutboxRelay(session_factory, batch_size=2)
+    relay.subscribe(observer)
+
+    claimed = [relay.relay_once() for _ in range(4)]
+
+    assert claimed == [2, 2, 1, 0]
+    assert [data["log_id"] for _, data in observer.events] == [1, 2, 3, 4, 5]
+    assert observer.events[0][1]["date"] == "2025-01-01"
+    with session_factory() as db:
+        assert db.query(OutboxEventDB).count() == 0
+
+
+def test_failed_delivery_is_retried_after_the_lease(seeded, session_factory):
+    with session_factory() as db:
+        WorkoutLogService().create_log(make_log(day=1), db)
+    observer, flaky = RecordingObserver(), RecordingObserver(fail_times=1)
+    relay = OutboxRelay(session_factory, lease_seconds=0)
+    relay.subscribe(observer)
+    relay.subscribe(flaky)
+
+    assert relay.relay_once() == 1
+    with session_factory() as db:
+        assert db.query(OutboxEventDB.attempts).scalar() == 1
+    assert relay.relay_once() == 1
+
+    assert len(observer.events) == 2  # at-least-once: the healthy observer sees it again
+    assert len(flaky.events) == 1
+    assert relay.stats() == {"delivered": 1, "failed": 1, "dead": 0}
+    with session_factory() as db:
+        assert db.query(OutboxEventDB).count() == 0
+
+
+def test_event_out_of_attempts_is_logged_and_purged(seeded, session_factory, caplog):
+    with session_factory() as db:
+        WorkoutLogService().create_log(make_log(day=1), db)
+    relay = OutboxRelay(session_factory, lease_seconds=0, max_attempts=2)
+    relay.subscribe(RecordingObserver(fail_times=5))
+
+    assert [relay.relay_once() for _ in range(3)] == [1, 1, 0]
+
+    assert relay.stats() == {"delivered": 0, "failed": 2, "dead": 1}
+    assert "Giving up on outbox event 1 (log_created) after 2 attempts" in caplog.text
+    with session_factory() as db:
+        assert OutboxService().purge_dead(db, relay.max_attempts) == 1
+        assert db.query(OutboxEventDB).count() == 0
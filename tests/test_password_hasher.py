@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from app.services.password_hasher import PasswordHasher
+
+
+class BlockingContext:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def hash(self, password):
+        self.release.wait(timeout=5)
+        return f"hashed-{password}"
+
+    def verify(self, password, hashed_password):
+        return hashed_password == f"hashed-{password}"
+
+
+def test_hash_and_verify_run_on_executor():
+    context = BlockingContext()
+    context.release.set()
+    hasher = PasswordHasher(context, max_workers=1, max_queue=1)
+
+    async def run():
+        hashed = await hasher.hash("secret")
+        return hashed, await hasher.verify("secret", hashed)
+
+    hashed, verified = asyncio.run(run())
+    assert hashed == "hashed-secret"
+    assert verified is True
+    assert hasher.stats()["completed"] == 2
+
+
+def test_saturated_hasher_sheds_with_503():
+    context = BlockingContext()
+    hasher = PasswordHasher(context, max_workers=1, max_queue=1)
+
+    async def run():
+        first = asyncio.ensure_future(hasher.hash("a"))
+        second = asyncio.ensure_future(hasher.hash("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc:
+            await hasher.hash("c")
+        context.release.set()
+        await asyncio.gather(first, second)
+        return exc.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 503
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_cancelled_queued_request_releases_its_slot():
+    context = BlockingContext()
+    hasher = PasswordHasher(context, max_workers=1, max_queue=1)
+
+    async def run():
+        running = asyncio.ensure_future(hasher.hash("a"))
+        queued = asyncio.ensure_future(hasher.hash("b"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        context.release.set()
+        await running
+        return await hasher.hash("c")
+
+    assert asyncio.run(run()) == "hashed-c"
+    stats = hasher.stats()
+    assert stats["pending"] == 0
+    assert stats["cancelled"] == 1
+    assert stats["completed"] == 2
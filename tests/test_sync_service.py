@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from app.database import WorkoutLogDB
+from app.services.pagination import encode_cursor
+from app.services.sync_service import SyncService
+from app.services.workout_log_service import WorkoutLogService
+from tests.conftest import make_log
+
+
+def test_delta_contains_only_changes_and_deletions(db, monkeypatch):
+    monkeypatch.setattr("app.services.sync_service.SYNC_OVERLAP_SECONDS", 0)
+    log_service, sync_service = WorkoutLogService(), SyncService()
+    kept, changed, removed = [log_service.create_log(make_log(1, day), db) for day in (1, 2, 3)]
+    log_service.create_log(make_log(2, 1), db)
+    db.query(WorkoutLogDB).update({WorkoutLogDB.updated_at: datetime(2025, 1, 1)})
+    db.commit()
+
+    snapshot = sync_service.get_changes(db, user_id=1)
+    assert snapshot.full
+    assert [log.log_id for log in snapshot.logs] == [kept.log_id, changed.log_id, removed.log_id]
+
+    log_service.update_log(changed.model_copy(update={"sets": 5}), db)
+    log_service.delete_log(removed.log_id, db)
+    delta = sync_service.get_changes(db, snapshot.next_token, user_id=1)
+    assert not delta.full
+    assert [(log.log_id, log.sets) for log in delta.logs] == [(changed.log_id, 5)]
+    assert delta.deleted_log_ids == [removed.log_id]
+
+    assert sync_service.get_changes(db, snapshot.next_token, user_id=2).deleted_log_ids == []
+    assert sync_service.get_changes(db, delta.next_token, user_id=1).logs == []
+
+
+def test_token_past_retention_gets_a_full_snapshot(db):
+    WorkoutLogService().create_log(make_log(1, 1), db)
+    ancient = encode_cursor(datetime.now() - timedelta(days=3650))
+    response = SyncService().get_changes(db, ancient, user_id=1)
+    assert response.full
+    assert len(response.logs) == 1
+
+
+def test_invalid_token_is_rejected(db):
+    with pytest.raises(HTTPException) as exc_info:
+        SyncService().get_changes(db, "not-a-token")
+    assert exc_info.value.status_code == 400
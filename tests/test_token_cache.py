@@ -0,0 +1,44 @@
+import time
+from app.models.user import UserPublic
+from app.services.cache import TTLCache
+from app.services.token_cache import TokenCache
+
+
+def test_token_cache_hit_and_miss_counters():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    user = UserPublic(user_id=1, name="User", email="user@example.com", role="user")
+    assert cache.get("token") is None
+    cache.set("token", user, time.time() + 600)
+    assert cache.get("token") == user
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_token_cache_invalidate_user():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("a", UserPublic(user_id=1, name="A", email="a@example.com", role="user"))
+    cache.set("b", UserPublic(user_id=2, name="B", email="b@example.com", role="user"))
+    cache.invalidate_user(1)
+    assert cache.get("a") is None
+    assert cache.get("b").user_id == 2
+
+
+def test_token_cache_skips_expired_tokens():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("token", UserPublic(user_id=1, name="A", email="a@example.com", role="user"), time.time() - 1)
+    assert cache.get("token") is None
+
+
+def test_ttl_cache_expiry_and_lru_eviction():
+    now = [0.0]
+    cache = TTLCache(max_size=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
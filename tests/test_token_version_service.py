@@ -0,0 +1,36 @@
+from unittest.mock import Mock
+from app.models.user import UserPublic
+from app.services.token_cache import token_cache
+from app.services.token_version_service import TokenVersionRegistry
+
+
+def test_check_known_and_unknown_users():
+    registry = TokenVersionRegistry(refresh_seconds=30)
+    registry.set(1, 2)
+    assert registry.check(1, 2) is True
+    assert registry.check(1, 1) is False
+    assert registry.check(99, 0) is None
+
+
+def test_refresh_replaces_table_and_drops_changed_tokens():
+    registry = TokenVersionRegistry(refresh_seconds=30)
+    registry.set(1, 0)
+    token_cache.set("refresh-token", UserPublic(user_id=1, name="A", email="a@example.com", role="user"))
+    db = Mock()
+    db.query.return_value.all.return_value = [(1, 1), (2, 0)]
+    registry.refresh(db)
+    assert registry.check(1, 1) is True
+    assert registry.check(2, 0) is True
+    assert token_cache.get("refresh-token") is None
+
+
+def test_needs_refresh_is_claimed_once_per_window():
+    registry = TokenVersionRegistry(refresh_seconds=30)
+    assert registry.needs_refresh() is True
+    assert registry.needs_refresh() is False
+
+
+def test_check_defers_tokens_newer_than_the_table_to_the_database():
+    registry = TokenVersionRegistry(refresh_seconds=30)
+    registry.set(1, 2)
+    assert registry.check(1, 3) is None
@@ -17,4 +17,12 @@ def test_update_user_unauthorized(db_session):
             "/user/1?name=Updated%20User&email=updated%40example.com",
             headers={"Authorization": "Bearer dummy_token"}
         )
-        assert response.status_code == 422
\ No newline at end of file
+        assert response.status_code == 422
+
+def test_me_shows_a_rename_made_with_the_same_token(api, user_headers):
+    response = api.put("/user/1?name=Renamed", headers=user_headers)
+    assert response.status_code == 200
+
+    response = api.get("/user/me", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
@@ -1,3 +1,4 @@
+from types import SimpleNamespace
 from app.services.user_service import UserService
 from app.models.user import UserInDB, UserPublic
 from unittest.mock import Mock, patch
@@ -16,15 +17,28 @@ def test_create_user_success():
     db_mock.commit.return_value = None
     db_mock.refresh.return_value = None
 
-    with patch.object(user_service, "event_manager") as mock_event_manager:
+    with patch.object(user_service, "outbox") as mock_outbox:
         created_user = user_service.create_user(user_data, db_mock)
         assert isinstance(created_user, UserPublic)
         assert created_user.email == "test@example.com"
-        mock_event_manager.notify.assert_called_with("user_created", {"email": "test@example.com"})
+        mock_outbox.add.assert_called_with(db_mock, "user_created", [{"user_id": None, "email": "test@example.com"}])
 
 def test_get_user_by_email_not_found():
     db_mock = Mock()
     db_mock.query.return_value.filter.return_value.first.return_value = None
     user_service = UserService()
     result = user_service.get_user_by_email("nonexistent@example.com", db_mock)
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_update_user_keeps_tokens_valid_unless_email_changes():
+    db_user = SimpleNamespace(user_id=7, name="Old", email="old@example.com", role="user", token_version=3)
+    db_mock = Mock()
+    db_mock.query.return_value.filter.return_value.first.return_value = db_user
+    user_service = UserService()
+
+    user_service.update_user(7, db_mock, name="New")
+    assert db_user.token_version == 3
+
+    updated = user_service.update_user(7, db_mock, email="new@example.com")
+    assert updated.email == "new@example.com"
+    assert db_user.token_version == 4
@@ -0,0 +1,89 @@
+from datetime import date
+import pytest
+from fastapi import HTTPException
+from app.services.workout_log_service import WorkoutLogService
+from tests.conftest import make_log
+
+
+def test_get_logs_page_walks_keyset_newest_first(db):
+    service = WorkoutLogService()
+    service.add_logs([make_log(1, day % 3 + 1) for day in range(7)] + [make_log(2, 1)], db)
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        logs, cursor = service.get_logs_page(db, limit=3, cursor=cursor, user_id=1)
+        seen.extend((log.date, log.log_id) for log in logs)
+        if not cursor:
+            break
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+
+    logs, _ = service.get_logs_page(db, limit=10, date_from=date(2025, 1, 2), date_to=date(2025, 1, 2))
+    assert {log.date for log in logs} == {date(2025, 1, 2)}
+
+    logs, cursor = service.get_logs_page(db, limit=None, user_id=1)
+    assert [(log.date, log.log_id) for log in logs] == seen
+    assert cursor is None
+
+
+def test_get_logs_page_rejects_bad_cursor(db):
+    with pytest.raises(HTTPException) as exc:
+        WorkoutLogService().get_logs_page(db, limit=10, cursor="not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_iter_log_batches_streams_filtered_rows_in_batches(db):
+    service = WorkoutLogService()
+    service.add_logs([make_log(1, day % 3 + 1) for day in range(7)] + [make_log(2, 1)], db)
+    db.commit()
+
+    batches = list(service.iter_log_batches(db, batch_size=3, user_id=1))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert all(row["user_id"] == 1 for batch in batches for row in batch)
+
+
+def test_log_mutations_bump_the_owner_version(db):
+    from app.services.data_version_service import data_versions
+
+    service = WorkoutLogService()
+    before = data_versions.version(2), data_versions.version(1)
+    created = service.create_log(make_log(2, 1), db)
+    assert data_versions.version(2) != before[0]
+    assert data_versions.version(1) == before[1]
+
+    after_create = data_versions.version(2)
+    service.delete_log(created.log_id, db)
+    assert data_versions.version(2) != after_create
+
+
+def test_create_logs_bulk_uses_one_lookup_and_one_insert(db):
+    from sqlalchemy import event
+    from app.database import WorkoutLogDB
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    logs = [make_log(1, day % 28 + 1).model_copy(update={"exercise_name": "typo"}) for day in range(40)]
+
+    result = WorkoutLogService().create_logs_bulk(logs, db)
+
+    assert result.created == 40 and result.failed == 0
+    assert [item.log_id for item in result.results] == list(range(1, 41))
+    assert len(statements) == 4  # exercise lookup, log insert, daily rollup upsert, outbox insert
+    assert {name for (name,) in db.query(WorkoutLogDB.exercise_name)} == {"Squat"}
+
+
+def test_create_logs_bulk_failure_modes(db):
+    from app.database import WorkoutLogDB
+
+    logs = [make_log(1, 1), make_log(1, 2).model_copy(update={"exercise_id": 99}), make_log(1, 3)]
+    service = WorkoutLogService()
+
+    rejected = service.create_logs_bulk(logs, db, all_or_nothing=True)
+    assert [item.status for item in rejected.results] == ["skipped", "failed", "skipped"]
+    assert db.query(WorkoutLogDB).count() == 0
+
+    partial = service.create_logs_bulk(logs, db, all_or_nothing=False)
+    assert [item.status for item in partial.results] == ["created", "failed", "created"]
+    assert partial.results[1].error == "Exercise ID 99 not found"
+    assert db.query(WorkoutLogDB).count() == 2
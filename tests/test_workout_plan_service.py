@@ -1,6 +1,16 @@
+import json
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, text
+from app.database import (
+    ExerciseDB, PlanExerciseDB, SyncTombstoneDB, UserDB, WorkoutLogDB, WorkoutLogDailyDB, WorkoutPlanDB, migrate_plan_exercises
+)
+from app.models.exercise import Exercise
 from app.models.workout_log import WorkoutLog
+from app.services.exercise_service import ExerciseService
+from app.services.user_service import UserService
 from app.services.workout_plan_service import WorkoutPlanService
-from app.models.workout_plan import WorkoutPlan
+from app.models.workout_plan import WorkoutPlan, WorkoutPlanCreate
 from unittest.mock import Mock, patch
 from datetime import date
 
@@ -50,4 +60,194 @@ def test_create_plan_success(db_session):
             )
             created_plan = plan_service.create_plan(plan_data, db_session)
             assert created_plan.title == "Beginner Plan"
-            mock_event_manager.notify.assert_called()
\ No newline at end of file
+            mock_event_manager.notify.assert_called()
+
+def test_create_plan_uses_batched_queries_and_one_commit(empty_db, sqlite_engine):
+    db, engine = empty_db, sqlite_engine
+    db.add(UserDB(user_id=1, name="Owner", email="owner@example.com", password_hash="x", role="user"))
+    db.add_all([
+        ExerciseDB(exercise_id=i, name=f"Exercise {i}", description="d", muscle_group="legs", exercise_type="strength")
+        for i in range(1, 13)
+    ])
+    db.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+
+    plan_data = WorkoutPlanCreate(
+        title="Full Body",
+        level="beginner",
+        start_date=date(2025, 10, 1),
+        end_date=date(2025, 11, 1),
+        exercises=[{"exercise_id": i, "sets": 3, "reps": 10} for i in range(1, 13)]
+    )
+    created_plan = WorkoutPlanService().create_plan(plan_data, 1, db)
+
+    assert created_plan.owner_name == "Owner"
+    assert [ex.name for ex in created_plan.exercises] == [f"Exercise {i}" for i in range(1, 13)]
+    assert db.query(WorkoutLogDB).count() == 12
+    assert len(statements) <= 8
+    assert len(commits) == 1
+
+
+def test_get_plans_page_filters_and_paginates(empty_db):
+    db = empty_db
+    db.add(UserDB(user_id=1, name="Owner", email="owner@example.com", password_hash="x", role="user"))
+    db.add_all([
+        WorkoutPlanDB(
+            user_id=1, title=f"Plan {month}", level="advanced" if month % 2 else "beginner", exercises="[]",
+            start_date=date(2025, month, 1), end_date=date(2025, month, 20)
+        ) for month in range(1, 6)
+    ])
+    db.commit()
+    plan_service = WorkoutPlanService()
+
+    seen, cursor = [], None
+    while True:
+        plans, cursor = plan_service.get_plans_page(db, limit=2, cursor=cursor)
+        seen.extend(plan.plan_id for plan in plans)
+        if not cursor:
+            break
+    assert seen == [5, 4, 3, 2, 1]
+    plans, cursor = plan_service.get_plans_page(db, limit=None)
+    assert [plan.plan_id for plan in plans] == seen and cursor is None
+
+    plans, _ = plan_service.get_plans_page(db, limit=10, level="advanced", active_from=date(2025, 2, 10), active_to=date(2025, 3, 5))
+    assert [plan.title for plan in plans] == ["Plan 3"]
+    assert plans[0].owner_name == "Owner"
+
+
+def test_plan_exercises_round_trip_and_legacy_migration(empty_db, sqlite_engine):
+    db, engine = empty_db, sqlite_engine
+    db.add(UserDB(user_id=1, name="Owner", email="owner@example.com", password_hash="x", role="user"))
+    db.add_all([
+        ExerciseDB(exercise_id=i, name=f"Exercise {i}", description="d", muscle_group="legs", exercise_type="strength")
+        for i in range(1, 4)
+    ])
+    db.add(WorkoutPlanDB(
+        plan_id=1, user_id=1, title="Legacy", level="beginner",
+        exercises=json.dumps([
+            {"exercise_id": 3, "name": "Exercise 3", "sets": 5, "reps": 5, "rest_seconds": 90},
+            {"exercise_id": 1, "name": "Exercise 1", "sets": 3, "reps": 12},
+        ]),
+        start_date=date(2025, 1, 1), end_date=date(2025, 2, 1)
+    ))
+    db.commit()
+
+    migrate_plan_exercises(engine)
+    migrate_plan_exercises(engine)
+    db.expire_all()
+
+    plan_service = WorkoutPlanService()
+    legacy_plan = plan_service.get_plan_by_id(1, db)
+    assert [(ex.exercise_id, ex.sets, ex.rest_seconds) for ex in legacy_plan.exercises] == [(3, 5, 90), (1, 3, 30)]
+    assert db.query(WorkoutPlanDB.exercises).filter(WorkoutPlanDB.plan_id == 1).scalar() is None
+
+    created_plan = plan_service.create_plan(WorkoutPlanCreate(
+        title="New", level="beginner", start_date=date(2025, 3, 1), end_date=date(2025, 4, 1),
+        exercises=[{"exercise_id": 2, "sets": 4, "reps": 8}]
+    ), 1, db)
+    plans, _ = plan_service.get_plans_page(db, limit=10, exercise_id=1)
+    assert [plan.plan_id for plan in plans] == [1]
+
+    created_plan.exercises = [{"exercise_id": 1, "sets": 2, "reps": 20}, {"exercise_id": 2, "sets": 3, "reps": 10}]
+    plan_service.update_plan(WorkoutPlan(**created_plan.model_dump()), db)
+    plans, _ = plan_service.get_plans_page(db, limit=10, exercise_id=1)
+    assert [plan.plan_id for plan in plans] == [created_plan.plan_id, 1]
+    assert [ex.name for ex in plans[0].exercises] == ["Exercise 1", "Exercise 2"]
+    assert db.query(PlanExerciseDB).count() == 4
+
+    assert plan_service.delete_plan(created_plan.plan_id, db)
+    assert db.query(PlanExerciseDB).count() == 2
+
+
+def test_assign_plan_bulk_uses_one_query_per_kind_and_one_commit(empty_db, sqlite_engine):
+    db, engine = empty_db, sqlite_engine
+    db.add_all([
+        UserDB(user_id=i, name=f"Client {i}", email=f"client{i}@example.com", password_hash="x", role="user")
+        for i in range(1, 21)
+    ])
+    db.add_all([
+        ExerciseDB(exercise_id=i, name=f"Exercise {i}", description="d", muscle_group="legs", exercise_type="strength")
+        for i in range(1, 4)
+    ])
+    db.commit()
+    plan_data = WorkoutPlanCreate(
+        title="Class", level="beginner", start_date=date(2025, 6, 1), end_date=date(2025, 7, 1),
+        exercises=[{"exercise_id": i, "sets": 3, "reps": 8} for i in range(1, 4)]
+    )
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(session))
+    result = WorkoutPlanService().assign_plan_bulk(plan_data, list(range(1, 21)) + [5], db)
+
+    assert (result.plans_created, result.logs_created) == (20, 60)
+    assert [assignment.user_id for assignment in result.assignments] == list(range(1, 21))
+    assert len(statements) == 7
+    assert len(commits) == 1
+    assert db.query(PlanExerciseDB).count() == 60
+    assert db.query(WorkoutLogDB).filter(WorkoutLogDB.user_id == 7).count() == 3
+
+    with pytest.raises(HTTPException) as exc_info:
+        WorkoutPlanService().assign_plan_bulk(plan_data, [1, 99], db)
+    assert exc_info.value.status_code == 404
+
+
+def test_plans_keep_exercise_names_and_in_use_exercises_cannot_be_deleted(configured_db):
+    db = configured_db
+    plan_service, exercise_service = WorkoutPlanService(), ExerciseService()
+    plan = plan_service.create_plan(WorkoutPlanCreate(
+        title="Legs", level="beginner", start_date=date(2025, 1, 1), end_date=date(2025, 2, 1),
+        exercises=[{"exercise_id": 1, "sets": 3, "reps": 10}]
+    ), 1, db)
+
+    exercise_service.update_exercise(
+        Exercise(exercise_id=1, name="Back Squat", description="d", muscle_group="legs", exercise_type="strength"), db
+    )
+    assert [ex.name for ex in plan_service.get_plan_by_id(plan.plan_id, db).exercises] == ["Squat"]
+
+    with pytest.raises(HTTPException) as error:
+        exercise_service.delete_exercise(1, db)
+    assert error.value.status_code == 409
+    assert db.query(PlanExerciseDB.exercise_name).scalar() == "Squat"
+    assert exercise_service.delete_exercise(2, db)
+
+    with pytest.raises(HTTPException) as error:
+        plan_service.create_plan(WorkoutPlanCreate(
+            title="Orphan", level="beginner", start_date=date(2025, 1, 1), end_date=date(2025, 2, 1),
+            exercises=[{"exercise_id": 1, "sets": 3, "reps": 10}], user_id=99
+        ), 1, db)
+    assert error.value.status_code == 404
+
+
+def test_deleting_a_user_deletes_their_plans_and_logs(configured_db):
+    db = configured_db
+    plan = WorkoutPlanService().create_plan(WorkoutPlanCreate(
+        title="Legs", level="beginner", start_date=date(2025, 1, 1), end_date=date(2025, 2, 1),
+        exercises=[{"exercise_id": 1, "sets": 3, "reps": 10}]
+    ), 1, db)
+
+    assert UserService().delete_user(1, db)
+
+    assert db.query(WorkoutPlanDB).count() == db.query(PlanExerciseDB).count() == 0
+    assert db.query(WorkoutLogDB).count() == db.query(WorkoutLogDailyDB).count() == 0
+    assert sorted(db.query(SyncTombstoneDB.entity, SyncTombstoneDB.entity_id)) == [("log", 1), ("plan", plan.plan_id)]
+
+
+def test_legacy_plans_keep_exercises_deleted_before_foreign_keys(configured_db):
+    db = configured_db
+    db.add(WorkoutPlanDB(
+        plan_id=1, user_id=1, title="Legacy", level="beginner",
+        exercises=json.dumps([{"exercise_id": 7, "name": "Lunge", "sets": 3, "reps": 12}]),
+        start_date=date(2025, 1, 1), end_date=date(2025, 2, 1)
+    ))
+    db.commit()
+
+    migrate_plan_exercises(db.get_bind())
+
+    assert [ex.name for ex in WorkoutPlanService().get_plan_by_id(1, db).exercises] == ["Lunge"]
+    assert db.execute(text("PRAGMA foreign_keys")).scalar() == 1
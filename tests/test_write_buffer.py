@@ -0,0 +1,88 @@
+import asyncio
+from fastapi import HTTPException
+from sqlalchemy import text
+from app.database import WorkoutLogDB, write_transaction
+from app.services import workout_log_service
+from app.services.workout_log_service import AsyncWorkoutLogService, WorkoutLogService
+from app.services.exercise_resolver import ExerciseResolver
+from app.services.write_buffer import GroupCommitBuffer
+from tests.conftest import make_log
+
+
+def test_concurrent_submits_share_one_commit(async_session_factory):
+    async def run():
+        buffer = GroupCommitBuffer(
+            lambda logs, db: WorkoutLogService().create_logs_grouped(logs, db), async_session_factory, max_batch=64, max_delay_ms=20
+        )
+        created = await asyncio.gather(*(buffer.submit(make_log(sets=sets)) for sets in range(1, 11)))
+        async with async_session_factory() as db:
+            stored = await db.run_sync(lambda session: session.query(WorkoutLogDB).count())
+        return buffer, created, stored
+
+    buffer, created, stored = asyncio.run(run())
+    assert stored == 10
+    assert [log.sets for log in created] == list(range(1, 11))
+    assert len({log.log_id for log in created}) == 10
+    assert buffer.stats()["batches"] == 1
+
+
+def test_invalid_item_fails_only_its_caller(async_session_factory):
+    async def run():
+        buffer = GroupCommitBuffer(
+            lambda logs, db: WorkoutLogService().create_logs_grouped(logs, db), async_session_factory, max_delay_ms=20
+        )
+        return await asyncio.gather(
+            buffer.submit(make_log()), buffer.submit(make_log(exercise_id=99)), buffer.submit(make_log()),
+            return_exceptions=True,
+        )
+
+    first, bad, last = asyncio.run(run())
+    assert isinstance(bad, HTTPException) and bad.status_code == 400
+    assert first.log_id and last.log_id and first.log_id != last.log_id
+
+
+def test_full_batch_is_written_without_waiting_for_delay(async_session_factory):
+    async def run():
+        buffer = GroupCommitBuffer(
+            lambda logs, db: WorkoutLogService().create_logs_grouped(logs, db), async_session_factory, max_batch=2, max_delay_ms=10000
+        )
+        await asyncio.wait_for(asyncio.gather(buffer.submit(make_log()), buffer.submit(make_log())), timeout=5)
+        await buffer.flush()
+        return buffer.stats()
+
+    stats = asyncio.run(run())
+    assert stats["items"] == 2 and stats["pending"] == 0
+
+
+def make_buffer(session_factory) -> GroupCommitBuffer:
+    return GroupCommitBuffer(
+        lambda logs, db: WorkoutLogService().create_logs_grouped(logs, db), session_factory, max_delay_ms=1
+    )
+
+
+def test_request_session_is_committed_before_the_buffer_writes(async_session_factory, monkeypatch):
+    monkeypatch.setattr(workout_log_service, "log_write_buffer", make_buffer(async_session_factory))
+
+    async def run():
+        async with async_session_factory() as db:
+            await db.run_sync(write_transaction)
+            await db.execute(text("UPDATE users SET name = 'Renamed' WHERE user_id = 1"))
+            # Without the commit, the buffer's session would wait for this one's write lock.
+            created = await AsyncWorkoutLogService(ExerciseResolver()).create_log(make_log(), db)
+            assert not db.in_transaction()
+            return created
+
+    assert asyncio.run(run()).log_id == 1
+
+
+def test_post_log_goes_through_the_buffer(api, user_headers, async_session_factory, monkeypatch):
+    buffer = make_buffer(async_session_factory)
+    monkeypatch.setattr(workout_log_service, "log_write_buffer", buffer)
+
+    response = api.post("/workout/logs", headers=user_headers, json={
+        "exercise_id": 1, "exercise_name": "Squat", "sets": 3, "reps": 10, "date": "2025-01-01", "duration": 30
+    })
+
+    assert response.status_code == 200
+    assert response.json()["log_id"] == 1
+    assert buffer.stats()["items"] == 1